@@ -25,6 +25,38 @@ environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
 UPBIT_ACCESS_KEY = env("UPBIT_API_KEY")
 UPBIT_SECRET_KEY = env("UPBIT_SECRET_KEY")
 
+# 시장 스냅샷 캐시 유효 시간 (초) - 한 틱 동안 전체 시세를 한 번만 조회
+MARKET_SNAPSHOT_TTL = env.float("MARKET_SNAPSHOT_TTL", default=1.0)
+# 원화 마켓 목록 캐시 갱신 주기 (초)
+MARKET_LIST_REFRESH_INTERVAL = env.int("MARKET_LIST_REFRESH_INTERVAL", default=3600)
+# 웹소켓 실시간 시세 스트림 사용 여부 (websocket-client 패키지 필요)
+USE_TICKER_STREAM = env.bool("USE_TICKER_STREAM", default=False)
+UPBIT_WS_URL = env("UPBIT_WS_URL", default="wss://api.upbit.com/websocket/v1")
+TICKER_STREAM_MAX_AGE = env.float("TICKER_STREAM_MAX_AGE", default=5.0)
+# 호가 데이터 캐시 유효 시간 (초) - 요청 간격은 trading.rate_limiter 가 조절
+ORDERBOOK_CACHE_TTL = env.float("ORDERBOOK_CACHE_TTL", default=1.0)
+# 주문 상태 일괄 조회 결과 캐시 유효 시간 (초)
+ORDER_STATE_TTL = env.float("ORDER_STATE_TTL", default=1.0)
+# 개인 웹소켓(myOrder/myAsset)으로 체결·잔고를 실시간 수신 (websocket-client 패키지 필요)
+USE_ORDER_STREAM = env.bool("USE_ORDER_STREAM", default=False)
+UPBIT_PRIVATE_WS_URL = env("UPBIT_PRIVATE_WS_URL", default="wss://api.upbit.com/websocket/v1/private")
+# 자동매매 루프 방식: "poll" (고정 주기) / "event" (시세 변경 시 보유 종목 즉시 재평가 + 고정 주기 전체 점검)
+# event 는 USE_TICKER_STREAM=True 와 함께 사용 (스트림이 없으면 틱 사이 가격 이벤트가 없어 poll 과 같음)
+TRADING_ENGINE_MODE = env("TRADING_ENGINE_MODE", default="poll")
+TRADING_TICK_INTERVAL = env.float("TRADING_TICK_INTERVAL", default=1.0)
+# 매수 후보를 전체 종목 지표(RSI/MACD) 점수로 선정 (꺼져 있거나 이력이 부족하면 상승률 상위 10개 사용)
+INDICATOR_RANKING = env.bool("INDICATOR_RANKING", default=False)
+# 종목별 1초봉 링 버퍼 크기 (새 캔들만 증분 조회)
+CANDLE_BUFFER_SIZE = env.int("CANDLE_BUFFER_SIZE", default=200)
+# 매수 후보를 LSTM 상승 확률로 한 번 더 거름 (dayTrading 으로 학습한 모델/scaler 필요, tensorflow 패키지 필요)
+LSTM_SCORING = env.bool("LSTM_SCORING", default=False)
+# 모델 경로가 .tflite 이면 tflite_runtime 으로 추론 (tensorflow 불필요, LSTM_INFERENCE_THREADS 쓰레드 사용)
+LSTM_MODEL_PATH = env("LSTM_MODEL_PATH", default=str(BASE_DIR / "lstm_model.h5"))
+LSTM_INFERENCE_THREADS = env.int("LSTM_INFERENCE_THREADS", default=1)
+LSTM_SCALER_PATH = env("LSTM_SCALER_PATH", default=str(BASE_DIR / "lstm_scaler.json"))
+# scaler 가 있는 종목은 점수가 계산될 때까지 후보에서 제외, scaler 가 없는 종목(학습하지 않은 종목)은 거르지 않음
+LSTM_MIN_PROBABILITY = env.float("LSTM_MIN_PROBABILITY", default=0.5)
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 
 
@@ -1,28 +1,61 @@
 import pandas as pd
 import requests
 import numpy as np
-import time
-from datetime import datetime, timedelta
-from itertools import product
-import os
+from datetime import datetime
 import shutil
-
-def mainAI():
-    """ ✅ 다중 종목에 대해 AI 기반 최적 매매 전략 탐색 """
-    coins = get_top_trade_coins()  # ✅ 상위 거래량 10개 코인 가져오기
+from functools import partial
+
+from ..upbit_client import upbit_get
+from ..rate_limiter import PRIORITY_BACKFILL
+from .backtest import run_backtest
+from .optimizer import sweep, best_result
+from .search import search_strategy
+from .walk_forward import walk_forward
+from .pipeline import run_pipeline
+from .downloader import CANDLES_PER_PAGE, download, export_csv
+from .history_store import import_downloaded
+from .resample import history_store
+
+DEFAULT_HISTORY_PAGES = 10  # ✅ 종목별 과거 캔들 요청 횟수 (200개 × 10 = 2000개)
+
+def mainAI(markets=None, walk_forward_options=None, interval="1", pages=DEFAULT_HISTORY_PAGES,
+           download_workers=4, workers=None):
+    """
+    ✅ 다중 종목에 대해 AI 기반 최적 매매 전략 탐색
+    (다음 종목 다운로드와 앞 종목 최적화를 동시에 진행, 종목별 결과는 끝나는 대로 출력)
+    :param markets: 대상 종목 목록 (None 이면 원화 마켓 전체)
+    :param walk_forward_options: None 이면 전체 기간으로 최적화,
+                                 dict 이면 워크 포워드 모드 (train_size, test_size, step, mode, budget, ...)
+                                 → 테스트 구간 누적 수익률로 평가하고 마지막 구간의 설정을 사용
+    :param download_workers: 동시 다운로드 쓰레드 수 (요청 간격은 rate_limiter 가 조절)
+    :param workers: 최적화 프로세스 수 (None 이면 CPU 수)
+    """
+    if markets is None:
+        markets = get_krw_markets()
     best_results = []
 
-    for coin in coins:
-        market = coin["market"]
-        print(f"🔍 {market} 백테스트 시작...")
-        df = get_historical_data(market)
-        df = apply_technical_indicators(df)
-
-        # ✅ 개별 종목 최적 매매 전략 찾기
-        best_config, best_profit = optimize_strategy(df)
+    results = run_pipeline(
+        markets,
+        partial(download_market, interval=interval, pages=pages),
+        partial(optimize_market, interval=interval, walk_forward_options=walk_forward_options),
+        download_workers=download_workers,
+        process_workers=workers,
+    )
+    for market, result, error in results:
+        if error is not None:
+            print(f"❌ {market} 처리 실패: {error}")
+            continue
+        if result is None or result[0] is None:
+            print(f"⚠️ {market} 캔들 데이터 없음 → 건너뜀")
+            continue
+        best_config, best_profit = result
         print(f"🔥 {market} 최적 전략: {best_config} | 예상 수익률: {best_profit:.2f}%")
         best_results.append((market, best_config, best_profit))
 
+    if not best_results:
+        print("⚠️ 최적화 결과가 없습니다.")
+        return best_results
+
     # ✅ 수익률이 가장 높은 코인 찾기
     best_results.sort(key=lambda x: x[2], reverse=True)  # 수익률 기준 정렬
     best_coin = best_results[0]
@@ -30,18 +63,74 @@ def mainAI():
 
     return best_results  # ✅ 최적의 종목 및 전략 반환
 
+def download_market(market, interval="1", pages=DEFAULT_HISTORY_PAGES):
+    """
+    ✅ 파이프라인 다운로드 단계: 최근 pages × 200 개 캔들 → DataFrame (데이터 없으면 None)
+    저장소(fetch_all_data 로 갱신)에 캔들이 있으면 저장소에서 로드, 없으면 REST 로 조회
+    """
+    store = history_store(market, interval)
+    if len(store):
+        df = pd.DataFrame(store.tail(pages * CANDLES_PER_PAGE))
+        print(f"📂 {market} 저장소 캔들 {len(df)}개 로드 (마지막 캔들: {store.last_time()})")
+        return None if df.empty else df
+
+    print(f"🔍 {market} 캔들 다운로드...")
+    df = candles_to_frame(get_candle_history(market, interval=interval, pages=pages))
+    return None if df.empty else df
+
+def optimize_market(market, df, interval="1", walk_forward_options=None):
+    """ ✅ 파이프라인 최적화 단계 (프로세스 풀에서 실행, 종목 하나는 단일 프로세스로 계산) → (best_config, best_profit) """
+    if walk_forward_options is None:
+        df = apply_technical_indicators(df)
+        return optimize_strategy(df, workers=1)
+
+    report = walk_forward(df, market, interval, **dict(walk_forward_options, workers=1))
+    print(f"🧮 {market} 워크 포워드: {len(report['folds'])}개 구간 (캐시 {report['cached']}개, 신규 {report['computed']}개)")
+    return report["latest_config"], report["test_profit"]
+
+def get_krw_markets():
+    """ ✅ 원화(KRW) 마켓 전체 목록 """
+    try:
+        response = upbit_get("/v1/market/all", priority=PRIORITY_BACKFILL)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ 마켓 목록 요청 실패: {e}")
+        return []
+    if response.status_code != 200:
+        print(f"❌ 마켓 목록 요청 실패 (응답 코드: {response.status_code})")
+        return []
+    return [m["market"] for m in response.json() if m["market"].startswith("KRW-")]
+
+def get_candle_history(market, interval="1", pages=DEFAULT_HISTORY_PAGES):
+    """ ✅ 최신 캔들부터 pages 번 과거로 이어서 조회 (to 는 미포함이므로 마지막 캔들 시각 그대로 사용) """
+    all_data = []
+    to_time = None
+    for _ in range(pages):
+        data = get_historical_data(market, interval=interval, to=to_time)
+        if not data:
+            break
+        all_data.extend(data)
+        to_time = datetime.strptime(data[-1]["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S")
+        if len(data) < 200:
+            break  # ✅ 상장 시점까지 모두 조회
+    return all_data
+
+def candles_to_frame(data):
+    """ ✅ 업비트 캔들 응답(최신 캔들 먼저) → 과거 → 최신 순서 DataFrame (time, trade_price 등) """
+    if not data:
+        return pd.DataFrame(columns=["time", "opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume"])
+    df = pd.DataFrame(data)
+    df["time"] = pd.to_datetime(df["candle_date_time_kst"])  # KST 기준 시간 변환
+    df = df[["time", "opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume"]]
+    return df.sort_values("time").drop_duplicates("time").reset_index(drop=True)
+
 def get_top_trade_coins():
     """ ✅ 업비트 API에서 거래량 상위 10개 코인 가져오기 """
-    server_url = "https://api.upbit.com"
-
     params = {
         "markets": "KRW-BTC,KRW-ETH"
     }
 
-    res = requests.get(server_url + "/v1/ticker", params=params)
-
     try:
-        rres = requests.get(server_url + "/v1/ticker", params=params)
+        rres = upbit_get("/v1/ticker", params=params, priority=PRIORITY_BACKFILL)
         data = rres.json()
 
         # ✅ 디버깅: 응답 데이터 확인
@@ -63,58 +152,40 @@ def get_top_trade_coins():
         print(f"❌ 데이터 파싱 오류: {e}")
         return []
 
-def optimize_strategy(df):
-    """ ✅ 여러 RSI, MACD 조합을 테스트하고 최적의 조합을 찾는 함수 """
-    best_config = None
-    best_profit = -9999
-
-    rsi_ranges = [(25, 70), (28, 72), (30, 75)]
-    macd_ranges = [(12, 26, 9), (10, 24, 8), (14, 30, 10)]
-    stop_loss_levels = [0.98, 0.97]
-    take_profit_levels = [1.02, 1.03]
-
-    for rsi_range, macd_setting, stop_loss, take_profit in product(rsi_ranges, macd_ranges, stop_loss_levels, take_profit_levels):
-        df = apply_technical_indicators(df, macd_setting, rsi_range)
-        profit = backtest_strategy(df, rsi_range, macd_setting, stop_loss, take_profit)
-
-        if profit > best_profit:
-            best_profit = profit
-            best_config = (rsi_range, macd_setting, stop_loss, take_profit)
-
-    return best_config, best_profit
-
-def backtest_strategy(df, rsi_range, macd_setting, stop_loss, take_profit):
-    """ ✅ RSI + MACD + 손절/익절 기반 백테스트 실행 """
-    initial_balance = 1000000  # 100만원
-    balance = initial_balance
-    position = 0
-    buy_price = 0
-
-    for i in range(len(df)):
-        if df["rsi"].iloc[i] < rsi_range[0] and df["macd"].iloc[i] > df["macd_signal"].iloc[i]:
-            if position == 0:
-                buy_price = df["trade_price"].iloc[i]
-                position = balance / buy_price
-                balance = 0
-
-        elif df["rsi"].iloc[i] > rsi_range[1] and df["macd"].iloc[i] < df["macd_signal"].iloc[i]:
-            if position > 0:
-                sell_price = df["trade_price"].iloc[i]
-                balance = position * sell_price
-                position = 0
-
-        if position > 0 and df["trade_price"].iloc[i] < buy_price * stop_loss:
-            sell_price = df["trade_price"].iloc[i]
-            balance = position * sell_price
-            position = 0
-
-        if position > 0 and df["trade_price"].iloc[i] > buy_price * take_profit:
-            sell_price = df["trade_price"].iloc[i]
-            balance = position * sell_price
-            position = 0
-
-    final_balance = balance if position == 0 else position * df["trade_price"].iloc[-1]
-    return (final_balance / initial_balance - 1) * 100  # 최종 수익률
+def optimize_strategy(df, rsi_ranges=None, macd_ranges=None, stop_loss_levels=None, take_profit_levels=None, workers=None,
+                      mode="grid", budget=None, patience=None, space=None, seed=None):
+    """
+    ✅ 여러 RSI, MACD 조합을 테스트하고 최적의 조합을 찾는 함수
+    :param mode: "grid" (전체 조합, optimizer.sweep 이 프로세스 풀로 분산 실행)
+                 / "random" / "halving" / "bayes" (search.py 의 적응형 탐색, space 범위에서 budget 만큼 평가)
+    :param workers: grid 모드 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스에서 실행)
+    :param budget: 적응형 탐색 평가 예산 (None 이면 모드별 기본값)
+    :param patience: 이 횟수 동안 최고 수익률이 갱신되지 않으면 조기 종료
+    """
+    if mode == "grid":
+        results = sweep(df, rsi_ranges, macd_ranges, stop_loss_levels, take_profit_levels, workers=workers)
+        return best_result(results)
+
+    options = {"space": space, "patience": patience, "seed": seed}
+    if budget is not None:
+        options["budget"] = budget
+    result = search_strategy(df, mode, **options)
+    print(f"🔎 {mode} 탐색: {result['evaluations']}회 평가 (전체 데이터 기준 {result['cost']:.1f}회)")
+    return result["best_config"], result["best_profit"]
+
+def backtest_strategy(df, rsi_range, macd_setting, stop_loss, take_profit, detail=False):
+    """
+    ✅ RSI + MACD + 손절/익절 기반 백테스트 실행 (컬럼을 NumPy 배열로 한 번만 꺼내서 backtest.run_backtest 로 계산)
+    :param detail: True 이면 수익률 대신 거래 목록 / 평가금액 곡선 / 요약 통계까지 반환
+    """
+    result = run_backtest(
+        df["trade_price"].to_numpy(dtype=float),
+        df["rsi"].to_numpy(dtype=float),
+        df["macd"].to_numpy(dtype=float),
+        df["macd_signal"].to_numpy(dtype=float),
+        rsi_range, stop_loss, take_profit,
+    )
+    return result if detail else result["profit"]  # 최종 수익률
 
 def apply_technical_indicators(df, macd_setting=(12, 26, 9), rsi_range=(30, 70)):
     """ ✅ 기술적 지표 추가 """
@@ -177,77 +248,36 @@ def get_historical_data(market, interval="15", count=200, max_requests=10):
     return df
 """
 def get_historical_data(market, interval="1", count=200, to=None):
-    """ 업비트에서 특정 마켓의 과거 데이터를 가져오는 함수 """
-    url = f"https://api.upbit.com/v1/candles/minutes/{interval}"
-    headers = {"Accept": "application/json"}
-
+    """ 업비트에서 특정 마켓의 과거 데이터를 가져오는 함수 (요청 간격/재시도는 rate_limiter 와 공유 세션이 처리) """
     params = {"market": market, "count": count}
     if to:
         params["to"] = to.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
 
-    for _ in range(3):  # ✅ 최대 3번까지 재시도
-        response = requests.get(url, params=params, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        print(f"⚠️ API 요청 실패, 재시도 중... (응답 코드: {response.status_code})")
-        time.sleep(2)  # 2초 대기 후 재시도
-
-    return []  # 3번 시도 후에도 실패하면 빈 리스트 반환
-
-def fetch_all_data(market, save_path="data/"):
-    """ 15분봉 데이터를 가능한 한 오래 수집하여 CSV로 저장 """
-    all_data = []
-    to_time = datetime.utcnow()  # 최신 데이터부터 시작
-    max_no_data_count = 5  # ✅ 연속 5번 데이터가 없으면 종료
-    no_data_count = 0
-    data_count = 0
-
-    while data_count < 5000:
-
-        data = get_historical_data(market, to=to_time)
-        data_count += 1
-
-        if not data:
-            no_data_count += 1
-            print(f"⚠️ {market} 데이터 없음 ({no_data_count}/{max_no_data_count})")
-            if no_data_count >= max_no_data_count:
-                print(f"🛑 {market} 데이터 수집 중단 (연속 {max_no_data_count}회 데이터 없음)")
-                break
-            time.sleep(1)
-            continue
-
-        no_data_count = 0  # 데이터가 들어오면 카운트 초기화
-
-        df = pd.DataFrame(data)
-        df["time"] = pd.to_datetime(df["candle_date_time_kst"])  # KST 기준 시간 변환
-        df = df[["time", "opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume"]]
-
-        all_data.append(df)
-
-        try:
-            to_time = datetime.strptime(data[-1]["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S") - timedelta(minutes=15)
-        except Exception as e:
-            print(f"❌ to_time 업데이트 오류: {e}")
-            break  # 오류 발생 시 루프 종료
-
-        print(f"📊 {market} - {len(all_data) * 200}개 데이터 수집 중...")
-
-        time.sleep(0.3)  # ✅ API 요청 제한 준수
-
-    # 저장할 폴더 경로
-    save_path = "/Users/hongbookpro/Downloads/"
-
-    # 디렉토리 없으면 생성
-    if not os.path.exists(save_path):
-        os.makedirs(save_path)
-
-    # 데이터 합치기 및 저장
-    final_df = pd.concat(all_data, ignore_index=True)
-    final_df.to_csv(f"{save_path}{market}_1m_data.csv", index=False)
+    try:
+        response = upbit_get(f"/v1/candles/minutes/{interval}", params=params, priority=PRIORITY_BACKFILL)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ API 요청 실패: {e}")
+        return []
 
-    print(f"✅ {market} 데이터 저장 완료! ({len(final_df)}개 캔들)")
+    if response.status_code == 200:
+        return response.json()
+    print(f"⚠️ API 요청 실패 (응답 코드: {response.status_code})")
+    return []
+
+def fetch_all_data(market, save_path=None, interval="1", max_pages=5000):
+    """
+    ✅ 과거 캔들 데이터를 가능한 한 오래 수집하여 컬럼 저장소(history_store)에 저장 (downloader 로 동시 수집 / 중간 저장 / 이어받기)
+    :param save_path: CSV 도 함께 저장할 폴더 (None 이면 CSV 저장 안 함)
+    :return: HistoryStore
+    """
+    downloader = download(market, interval=interval, max_pages=max_pages)
+    store = import_downloaded(downloader)
+    if save_path:
+        export_csv(market, interval=interval, save_path=save_path)
+    return store
 
 if __name__ == "__main__":
+    # ✅ 실행: python -m trading.aiTrade.aiTrading (패키지 상대 import 사용 → 파일 경로로 직접 실행 불가)
     fetch_all_data("KRW-BTC")
 
 
@@ -0,0 +1,123 @@
+import numpy as np
+
+# ✅ 배열 기반 백테스트 엔진 (aiTrading.backtest_strategy 와 같은 규칙 / 같은 결과)
+#   - 매 행마다 조건을 확인하는 대신, 다음 진입 / 청산 시점을 배열 검색으로 바로 찾음
+#   - 규칙: 매수 신호(RSI < 하단 & MACD > 시그널) → 진입
+#           매도 신호(RSI > 상단 & MACD < 시그널) / 손절 / 익절 → 청산 (같은 캔들에서는 신호 → 손절 → 익절 순으로 확인)
+
+INITIAL_BALANCE = 1000000  # 100만원
+SEARCH_CHUNK = 256  # ✅ 손절/익절 가격 검색 시작 구간 (보유 기간이 길면 2배씩 늘림)
+
+EXIT_SIGNAL = "signal"
+EXIT_STOP_LOSS = "stop_loss"
+EXIT_TAKE_PROFIT = "take_profit"
+EXIT_OPEN = "open"  # ✅ 마지막 캔들까지 보유 중 (종가로 평가)
+
+
+def signal_arrays(rsi, macd, macd_signal, rsi_range):
+    """ ✅ 매수 / 매도 신호 배열 (NaN 은 조건 불충족) """
+    buy = (rsi < rsi_range[0]) & (macd > macd_signal)
+    sell = (rsi > rsi_range[1]) & (macd < macd_signal) & ~buy  # ✅ 같은 캔들에서는 매수 조건이 우선 (elif)
+    return buy, sell
+
+
+def _first_price_exit(prices, start, end, stop_price, take_price):
+    """ ✅ [start, end) 구간에서 처음으로 손절/익절 가격을 벗어나는 위치 → (index, reason), 없으면 (None, None) """
+    chunk = SEARCH_CHUNK
+    while start < end:
+        stop = min(start + chunk, end)
+        window = prices[start:stop]
+        hit = (window < stop_price) | (window > take_price)
+        if hit.any():
+            i = start + int(hit.argmax())
+            return i, EXIT_STOP_LOSS if prices[i] < stop_price else EXIT_TAKE_PROFIT
+        start = stop
+        chunk *= 2
+    return None, None
+
+
+def _trade(entry, exit_index, entry_price, exit_price, reason):
+    return {
+        "entry_index": entry,
+        "exit_index": exit_index,
+        "entry_price": float(entry_price),
+        "exit_price": float(exit_price),
+        "return": float(exit_price / entry_price - 1),
+        "reason": reason,
+    }
+
+
+def run_backtest(prices, rsi, macd, macd_signal, rsi_range, stop_loss, take_profit, initial_balance=INITIAL_BALANCE):
+    """
+    ✅ RSI + MACD + 손절/익절 백테스트
+    :param prices: 종가 배열 (rsi, macd, macd_signal 과 같은 길이)
+    :return: {"profit": 최종 수익률(%), "trades": 거래 목록, "equity": 캔들별 평가금액 배열, "stats": 요약 통계}
+    """
+    prices = np.ascontiguousarray(prices, dtype=float)
+    buy, sell = signal_arrays(np.asarray(rsi, dtype=float), np.asarray(macd, dtype=float),
+                              np.asarray(macd_signal, dtype=float), rsi_range)
+    buy_index = np.flatnonzero(buy)
+    sell_index = np.flatnonzero(sell)
+    n = len(prices)
+
+    balance = initial_balance
+    trades = []
+    equity = np.full(n, float(initial_balance))
+    i = 0
+    while i < n:
+        k = np.searchsorted(buy_index, i)
+        if k == len(buy_index):
+            break
+        entry = int(buy_index[k])
+        equity[i:entry] = balance
+
+        buy_price = prices[entry]
+        position = balance / buy_price
+        stop_price = buy_price * stop_loss
+        take_price = buy_price * take_profit
+
+        # ✅ 진입 캔들은 손절/익절만 확인, 다음 캔들부터 매도 신호도 확인
+        k = np.searchsorted(sell_index, entry + 1)
+        next_signal = int(sell_index[k]) if k < len(sell_index) else n
+        exit_index, reason = _first_price_exit(prices, entry, next_signal, stop_price, take_price)
+        if exit_index is None and next_signal < n:
+            exit_index, reason = next_signal, EXIT_SIGNAL
+
+        if exit_index is None:
+            # ✅ 마지막 캔들까지 보유 → 마지막 종가로 평가
+            equity[entry:] = position * prices[entry:]
+            balance = position * prices[-1]
+            trades.append(_trade(entry, n - 1, buy_price, prices[-1], EXIT_OPEN))
+            i = n
+            break
+
+        exit_price = prices[exit_index]
+        equity[entry:exit_index] = position * prices[entry:exit_index]
+        balance = position * exit_price
+        equity[exit_index] = balance
+        trades.append(_trade(entry, exit_index, buy_price, exit_price, reason))
+        i = exit_index + 1
+    equity[i:] = balance
+
+    return {
+        "profit": (balance / initial_balance - 1) * 100,  # 최종 수익률
+        "trades": trades,
+        "equity": equity,
+        "stats": summarize(trades, equity, initial_balance),
+    }
+
+
+def summarize(trades, equity, initial_balance=INITIAL_BALANCE):
+    """ ✅ 거래 수 / 승률 / 평균 수익률 / 최대 낙폭(MDD) 요약 """
+    closed = [trade for trade in trades if trade["reason"] != EXIT_OPEN]
+    returns = np.array([trade["return"] for trade in closed])
+    curve = np.concatenate([[initial_balance], equity])
+    drawdown = curve / np.maximum.accumulate(curve) - 1
+    return {
+        "trades": len(closed),
+        "win_rate": float((returns > 0).mean()) if len(returns) else 0.0,
+        "avg_return": float(returns.mean()) if len(returns) else 0.0,
+        "max_drawdown": float(-drawdown.min()),
+        "exit_reasons": {reason: sum(1 for trade in closed if trade["reason"] == reason)
+                         for reason in (EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT)},
+    }
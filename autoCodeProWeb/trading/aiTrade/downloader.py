@@ -0,0 +1,265 @@
+import glob
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import requests
+
+from ..upbit_client import upbit_get
+from ..rate_limiter import PRIORITY_BACKFILL
+
+# ✅ 과거 캔들 다운로더 (여러 종목/캔들 단위 동시 수집, 중간 저장, 이어받기)
+#   - 시간 구간 분할: 요청 1회(200개)가 덮는 구간을 미리 계산해 여러 구간을 동시에 요청
+#     (거래가 없는 시간은 캔들이 없어 응답이 더 과거까지 내려가므로 구간 사이가 비지 않음, 겹친 캔들은 중복 제거)
+#   - 묶음(batch) 단위로 part 파일 + 체크포인트 저장 → 중단돼도 마지막 묶음만 다시 받음
+#   - 다음 실행 시: 최신 캔들 이후 것만 추가 + 과거 방향 수집이 덜 끝났으면 이어서 진행
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CANDLES_PER_PAGE = 200  # ✅ 업비트 캔들 API 한 번에 조회 가능한 최대 개수
+CANDLE_COLUMNS = ["time", "candle_date_time_utc", "opening_price", "high_price", "low_price", "trade_price",
+                  "candle_acc_trade_volume"]
+UTC_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+print_lock = threading.Lock()
+
+
+def utc_now():
+    """ ✅ 현재 UTC 시각 (체크포인트 시간 문자열과 비교하도록 시간대 정보 없는 datetime) """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def candle_path(interval):
+    """ ✅ 캔들 단위 → API 경로 ("1", "15" 분봉 / "days" 일봉) """
+    if str(interval) in ("days", "weeks", "months"):
+        return f"/v1/candles/{interval}"
+    return f"/v1/candles/minutes/{interval}"
+
+
+def interval_delta(interval):
+    """ ✅ 캔들 1개의 길이 (이전 버전은 1분봉도 15분씩 건너뛰어 데이터가 빠졌음) """
+    if str(interval) == "days":
+        return timedelta(days=1)
+    if str(interval) == "weeks":
+        return timedelta(weeks=1)
+    if str(interval) == "months":
+        return timedelta(days=31)
+    return timedelta(minutes=int(interval))
+
+
+def fetch_page(market, interval, to_time):
+    """ ✅ to_time(UTC, 미포함) 이전 캔들 최대 200개 (최신 캔들 먼저, 실패 시 None) """
+    params = {"market": market, "count": CANDLES_PER_PAGE}
+    if to_time is not None:
+        params["to"] = to_time.strftime(UTC_FORMAT) + "Z"
+    try:
+        response = upbit_get(candle_path(interval), params=params, priority=PRIORITY_BACKFILL)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ {market} 캔들 요청 실패: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"⚠️ {market} 캔들 요청 실패 (응답 코드: {response.status_code})")
+        return None
+    return response.json()
+
+
+def _to_frame(data):
+    df = pd.DataFrame(data)
+    if df.empty:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+    df["time"] = pd.to_datetime(df["candle_date_time_kst"])  # KST 기준 시간 변환
+    return df[CANDLE_COLUMNS]
+
+
+class CandleDownloader:
+    """ ✅ 종목 1개 / 캔들 단위 1개 다운로드 상태 (part 파일 + checkpoint.json) """
+
+    def __init__(self, market, interval="1", save_dir=DATA_DIR, page_workers=4, batch_pages=20):
+        """
+        :param page_workers: 동시에 요청할 구간 수 (실제 요청 간격은 rate_limiter 가 조절)
+        :param batch_pages: 한 번에 저장하는 구간 수 (중단 시 최대 손실 범위)
+        """
+        self.market = market
+        self.interval = str(interval)
+        self.directory = os.path.join(save_dir, market, f"{self.interval}m" if self.interval.isdigit() else self.interval)
+        self.page_workers = page_workers
+        self.batch_pages = batch_pages
+        self.page_span = interval_delta(interval) * CANDLES_PER_PAGE
+        self.checkpoint = self._load_checkpoint()
+
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.directory, "checkpoint.json")
+
+    def _load_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                print(f"⚠️ {self.market} 체크포인트 파일 손상 → part 파일로 다시 계산")
+                return self._rescan_checkpoint()
+        return {"oldest": None, "newest": None, "backfill_done": False, "pages": 0}
+
+    def _rescan_checkpoint(self):
+        """ ✅ 저장된 part 파일로 체크포인트 복구 (받은 구간 수는 back-* 파일 × batch_pages 로 추정) """
+        checkpoint = {"oldest": None, "newest": None, "backfill_done": False, "pages": 0}
+        for part in glob.glob(os.path.join(self.directory, "*.csv")):
+            times = pd.read_csv(part, usecols=["candle_date_time_utc"])["candle_date_time_utc"]
+            if times.empty:
+                continue
+            if checkpoint["oldest"] is None or times.min() < checkpoint["oldest"]:
+                checkpoint["oldest"] = times.min()
+            if checkpoint["newest"] is None or times.max() > checkpoint["newest"]:
+                checkpoint["newest"] = times.max()
+            if os.path.basename(part).startswith("back-"):
+                checkpoint["pages"] += self.batch_pages
+        return checkpoint
+
+    def _save_part(self, df, prefix):
+        """ ✅ part 파일 저장 후 체크포인트 갱신 (둘 다 임시 파일 → os.replace 로 교체) """
+        os.makedirs(self.directory, exist_ok=True)
+        if not df.empty:
+            name = f"{prefix}-{df['candle_date_time_utc'].min().replace(':', '')}.csv"
+            part_path = os.path.join(self.directory, name)
+            df.to_csv(part_path + ".tmp", index=False)
+            os.replace(part_path + ".tmp", part_path)
+
+            oldest, newest = df["candle_date_time_utc"].min(), df["candle_date_time_utc"].max()
+            if self.checkpoint["oldest"] is None or oldest < self.checkpoint["oldest"]:
+                self.checkpoint["oldest"] = oldest
+            if self.checkpoint["newest"] is None or newest > self.checkpoint["newest"]:
+                self.checkpoint["newest"] = newest
+
+        with open(self.checkpoint_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f)
+        os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+    def _fetch_windows(self, executor, ends):
+        """ ✅ 여러 구간 동시 요청 → (중복 제거한 DataFrame, 빈 응답 구간 수), 실패한 구간이 있으면 (None, 0) """
+        pages = list(executor.map(lambda end: fetch_page(self.market, self.interval, end), ends))
+        if any(page is None for page in pages):
+            return None, 0  # ✅ 일부 구간만 저장하면 중간이 비므로 묶음 전체를 다시 요청
+        frames = [_to_frame(page) for page in pages if page]
+        empty = len(pages) - len(frames)
+        if not frames:
+            return pd.DataFrame(columns=CANDLE_COLUMNS), empty
+        df = pd.concat(frames, ignore_index=True).drop_duplicates("candle_date_time_utc")
+        return df.sort_values("candle_date_time_utc").reset_index(drop=True), empty
+
+    def update_newest(self, executor):
+        """ ✅ 마지막 저장 캔들 이후의 최신 캔들만 추가 → 추가된 캔들 수 (실패 시 None) """
+        newest = self.checkpoint["newest"]
+        if newest is None:
+            return 0
+        newest_time = datetime.strptime(newest, UTC_FORMAT)
+        end = utc_now() + interval_delta(self.interval)
+        frames = []
+        while end > newest_time:
+            ends = [end - self.page_span * i for i in range(self.batch_pages)]
+            ends = [e for e in ends if e > newest_time]
+            df, _ = self._fetch_windows(executor, ends)
+            if df is None:
+                print(f"⚠️ {self.market} 최신 캔들 수집 실패 → 다음 실행 때 다시 시도")
+                return None
+            frames.append(df)
+            end = ends[-1] - self.page_span
+
+        # ✅ 구간 사이가 비지 않도록 한 번에 저장 (마지막으로 저장한 캔들은 진행 중이었을 수 있으므로 다시 저장)
+        df = pd.concat(frames, ignore_index=True).drop_duplicates("candle_date_time_utc")
+        df = df[df["candle_date_time_utc"] >= newest].sort_values("candle_date_time_utc")
+        self._save_part(df, "new")
+        return max(len(df) - 1, 0)
+
+    def backfill(self, executor, max_pages, max_failures=3):
+        """ ✅ 저장된 가장 오래된 캔들보다 과거 방향으로 수집 (max_pages 구간까지, 상장 시점에 도달하면 종료) """
+        added = 0
+        failures = 0
+        while not self.checkpoint["backfill_done"] and self.checkpoint["pages"] < max_pages:
+            oldest = self.checkpoint["oldest"]
+            end = datetime.strptime(oldest, UTC_FORMAT) if oldest else utc_now() + interval_delta(self.interval)
+            count = min(self.batch_pages, max_pages - self.checkpoint["pages"])
+            ends = [end - self.page_span * i for i in range(count)]
+            df, empty = self._fetch_windows(executor, ends)
+            if df is None:
+                failures += 1
+                if failures >= max_failures:
+                    print(f"🛑 {self.market} 과거 캔들 수집 중단 (연속 {max_failures}회 실패) → 다음 실행 때 이어받기")
+                    break
+                continue
+            failures = 0
+            if oldest:
+                df = df[df["candle_date_time_utc"] < oldest]
+
+            self.checkpoint["pages"] += count
+            if df.empty or empty == count:
+                self.checkpoint["backfill_done"] = True  # ✅ 더 과거 데이터 없음
+            self._save_part(df, "back")
+            added += len(df)
+            with print_lock:
+                print(f"📊 {self.market} {self.interval} - {added}개 수집 (가장 오래된 캔들: {self.checkpoint['oldest']})")
+        return added
+
+    def run(self, max_pages=5000):
+        """ ✅ 최신 캔들 추가 → 과거 방향 이어받기 → (추가된 최신 캔들 수, 추가된 과거 캔들 수) """
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            newest_added = self.update_newest(executor)
+            backfill_added = self.backfill(executor, max_pages)
+        return newest_added, backfill_added
+
+    @staticmethod
+    def _part_selected(path, before, since):
+        """ ✅ part 파일 이름({prefix}-{시작 캔들 UTC}.csv) 의 시작 시각으로 선택 여부 판단 """
+        start = datetime.strptime(os.path.basename(path).split("-", 1)[1][:-len(".csv")], UTC_FORMAT.replace(":", ""))
+        return (before is not None and start < before) or (since is not None and start >= since)
+
+    def load(self, before=None, since=None):
+        """
+        ✅ 저장된 part 파일 → 과거 → 최신 순서 DataFrame
+        :param before, since: UTC 시각 (None 이 아니면 시작 캔들이 before 이전이거나 since 이후인 part 만 읽음)
+        """
+        parts = sorted(glob.glob(os.path.join(self.directory, "*.csv")))
+        if before is not None or since is not None:
+            parts = [part for part in parts if self._part_selected(part, before, since)]
+        if not parts:
+            return pd.DataFrame(columns=CANDLE_COLUMNS)
+        df = pd.concat((pd.read_csv(part) for part in parts), ignore_index=True)
+        # ✅ 같은 캔들이 여러 part 에 있으면 나중에 받은 값 사용 (new-* 파일이 뒤에 정렬됨)
+        df = df.drop_duplicates("candle_date_time_utc", keep="last").sort_values("candle_date_time_utc").reset_index(drop=True)
+        df["time"] = pd.to_datetime(df["time"])
+        return df
+
+
+def download(market, interval="1", max_pages=5000, save_dir=DATA_DIR, page_workers=4, batch_pages=20):
+    """ ✅ 종목 1개 다운로드 (이어받기 포함) → CandleDownloader """
+    downloader = CandleDownloader(market, interval, save_dir, page_workers, batch_pages)
+    newest_added, backfill_added = downloader.run(max_pages)
+    print(f"✅ {market} {interval} 다운로드 완료 (최신 {newest_added or 0}개, 과거 {backfill_added}개 추가)")
+    return downloader
+
+
+def download_many(markets, intervals=("1",), max_pages=5000, save_dir=DATA_DIR, market_workers=4, page_workers=4,
+                  batch_pages=20):
+    """ ✅ 여러 종목 × 캔들 단위 동시 다운로드 → {(market, interval): CandleDownloader} """
+    jobs = [(market, str(interval)) for market in markets for interval in intervals]
+    with ThreadPoolExecutor(max_workers=market_workers) as executor:
+        futures = {
+            job: executor.submit(download, job[0], job[1], max_pages, save_dir, page_workers, batch_pages)
+            for job in jobs
+        }
+    return {job: future.result() for job, future in futures.items()}
+
+
+def export_csv(market, interval="1", save_path=None, save_dir=DATA_DIR):
+    """ ✅ 다운로드한 데이터를 기존 형식의 CSV 한 개로 저장 (과거 → 최신 순서) → 파일 경로 """
+    downloader = CandleDownloader(market, interval, save_dir)
+    df = downloader.load()
+    suffix = f"{interval}m" if str(interval).isdigit() else str(interval)
+    save_path = save_path or save_dir
+    os.makedirs(save_path, exist_ok=True)
+    path = os.path.join(save_path, f"{market}_{suffix}_data.csv")
+    df.drop(columns=["candle_date_time_utc"]).to_csv(path, index=False)
+    print(f"✅ {market} 데이터 저장 완료! ({len(df)}개 캔들) → {path}")
+    return path
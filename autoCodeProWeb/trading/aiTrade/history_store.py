@@ -0,0 +1,273 @@
+import glob
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# ✅ 과거 캔들 컬럼 저장소 (CSV 대신 컬럼별 .npy 파일, 메모리 맵으로 로드)
+#   - 폴더 구조: store/{market}/{interval}/{YYYY-MM}/{column}.npy + meta.json (dtype, 월 목록)
+#   - 로드: np.load(mmap_mode="r") → 파싱 없이 필요한 구간만 디스크에서 읽음
+#   - 한 달 안의 구간은 복사 없는 view, 여러 달에 걸친 구간은 해당 구간만 이어 붙임
+#   - 저장: 새 캔들이 속한 달만 다시 기록 (임시 폴더 → os.replace 로 교체)
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "store")
+TIME_COLUMN = "time"
+PRICE_COLUMNS = ["opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume"]
+DTYPES = {"float64": np.float64, "float32": np.float32}
+KST_OFFSET = pd.Timedelta(hours=9)  # ✅ 저장된 time(KST) - 9시간 = 업비트 UTC 시각
+
+
+def interval_name(interval):
+    """ ✅ "15" → "15m", "days" → "days" (downloader 폴더 이름과 동일) """
+    interval = str(interval)
+    return f"{interval}m" if interval.isdigit() else interval
+
+
+def to_time64(values):
+    """ ✅ 시간 값(문자열 / Timestamp / datetime64) → datetime64[ms] 배열 """
+    return pd.to_datetime(np.asarray(values)).to_numpy().astype("datetime64[ms]")
+
+
+class HistoryStore:
+    """ ✅ 종목 1개 / 캔들 단위 1개의 컬럼 저장소 """
+
+    def __init__(self, market, interval="1", store_dir=STORE_DIR):
+        self.market = market
+        self.interval = str(interval)
+        self.directory = os.path.join(store_dir, market, interval_name(interval))
+        self.meta = self._load_meta()
+        self._months = {}  # ✅ 월 → {컬럼: 메모리 맵 배열} (파일이 바뀌면 다시 열기)
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.directory, "meta.json")
+
+    def _load_meta(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {"dtype": None, "months": {}, "version": 0}
+
+    def _save_meta(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, sort_keys=True)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+
+    @property
+    def months(self):
+        """ ✅ 저장된 월 목록 (과거 → 최신) """
+        return sorted(self.meta["months"])
+
+    def __len__(self):
+        return sum(self.meta["months"].values())
+
+    def _open_month(self, month):
+        if month not in self._months:
+            folder = os.path.join(self.directory, month)
+            self._months[month] = {
+                column: np.load(os.path.join(folder, f"{column}.npy"), mmap_mode="r")
+                for column in [TIME_COLUMN] + PRICE_COLUMNS
+            }
+        return self._months[month]
+
+    def _write_month(self, month, columns):
+        """ ✅ 한 달 치 컬럼 저장 (임시 폴더에 모두 쓴 뒤 기존 폴더와 교체 → 반쯤 쓴 달이 남지 않음) """
+        folder = os.path.join(self.directory, month)
+        temp_folder = folder + ".tmp"
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        os.makedirs(temp_folder)
+        for column, values in columns.items():
+            np.save(os.path.join(temp_folder, f"{column}.npy"), values)
+
+        self._months.pop(month, None)
+        if os.path.exists(folder):
+            old_folder = folder + ".old"
+            shutil.rmtree(old_folder, ignore_errors=True)
+            os.replace(folder, old_folder)
+            os.replace(temp_folder, folder)
+            shutil.rmtree(old_folder, ignore_errors=True)
+        else:
+            os.replace(temp_folder, folder)
+
+    def write(self, df, dtype=None):
+        """
+        ✅ 캔들 추가/갱신 (순서 무관, 같은 시각 캔들은 새 값으로 덮어씀)
+        :param df: time + PRICE_COLUMNS 컬럼 DataFrame
+        :param dtype: "float64" / "float32" (처음 저장할 때만 적용, 이후에는 저장된 dtype 유지)
+        :return: 저장 후 전체 캔들 수
+        """
+        if df.empty:
+            return len(self)
+        self.meta["dtype"] = self.meta["dtype"] or dtype or "float64"
+        value_dtype = DTYPES[self.meta["dtype"]]
+
+        times = to_time64(df[TIME_COLUMN])
+        month_keys = np.datetime_as_string(times, unit="M")
+        for month in np.unique(month_keys):
+            mask = month_keys == month
+            new = {TIME_COLUMN: times[mask]}
+            new.update({column: df[column].to_numpy(dtype=value_dtype)[mask] for column in PRICE_COLUMNS})
+
+            if month in self.meta["months"]:
+                old = self._open_month(month)
+                merged = {column: np.concatenate([old[column], new[column]]) for column in new}
+            else:
+                merged = new
+
+            # ✅ 시각 정렬 + 중복 제거 (뒤에 붙은 새 값 우선)
+            reverse_times = merged[TIME_COLUMN][::-1]
+            _, first = np.unique(reverse_times, return_index=True)
+            keep = len(reverse_times) - 1 - first
+            columns = {column: np.ascontiguousarray(values[keep]) for column, values in merged.items()}
+            self._write_month(month, columns)
+            self.meta["months"][month] = int(len(keep))
+
+        self.meta["version"] = self.meta.get("version", 0) + 1  # ✅ 저장할 때마다 증가 (파생 데이터 캐시 무효화용)
+        self._save_meta()
+        return len(self)
+
+    def clear(self):
+        """ ✅ 저장된 캔들 전체 삭제 (dtype 포함) """
+        self._months = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.meta = {"dtype": None, "months": {}, "version": 0}
+
+    def _bounds(self, month, start, end):
+        times = self._open_month(month)[TIME_COLUMN]
+        first = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        last = len(times) if end is None else int(np.searchsorted(times, end, side="left"))
+        return first, last
+
+    def columns(self, start=None, end=None, columns=None):
+        """
+        ✅ [start, end) 구간 컬럼 배열 {컬럼: 배열}
+        한 달 안의 구간은 메모리 맵 view (복사 없음, 읽기 전용), 여러 달이면 구간만 복사해 이어 붙임
+        """
+        start = None if start is None else np.datetime64(pd.Timestamp(start), "ms")
+        end = None if end is None else np.datetime64(pd.Timestamp(end), "ms")
+        columns = columns or [TIME_COLUMN] + PRICE_COLUMNS
+
+        pieces = []
+        for month in self.months:
+            month_start = np.datetime64(month, "ms")
+            month_end = np.datetime64(np.datetime64(month, "M") + 1, "ms")
+            if (end is not None and month_start >= end) or (start is not None and month_end <= start):
+                continue  # ✅ 겹치지 않는 달은 파일도 열지 않음
+            first, last = self._bounds(month, start, end)
+            if last > first:
+                data = self._open_month(month)
+                pieces.append({column: data[column][first:last] for column in columns})
+
+        if not pieces:
+            dtype = DTYPES[self.meta["dtype"] or "float64"]
+            return {column: np.empty(0, dtype="datetime64[ms]" if column == TIME_COLUMN else dtype)
+                    for column in columns}
+        if len(pieces) == 1:
+            return pieces[0]
+        return {column: np.concatenate([piece[column] for piece in pieces]) for column in columns}
+
+    def iter_months(self, start=None, columns=None):
+        """ ✅ 월 단위 컬럼 view 생성기 (start 이후, 과거 → 최신, 전체를 메모리에 올리지 않고 순회) """
+        start = None if start is None else np.datetime64(pd.Timestamp(start), "ms")
+        columns = columns or [TIME_COLUMN] + PRICE_COLUMNS
+        for month in self.months:
+            if start is not None and np.datetime64(np.datetime64(month, "M") + 1, "ms") <= start:
+                continue
+            first, last = self._bounds(month, start, None)
+            if last > first:
+                data = self._open_month(month)
+                yield {column: data[column][first:last] for column in columns}
+
+    def tail(self, count, end=None, columns=None):
+        """ ✅ end 이전 최근 count 개 캔들 {컬럼: 배열} (뒤쪽 달부터 필요한 만큼만 읽음) """
+        end = None if end is None else np.datetime64(pd.Timestamp(end), "ms")
+        columns = columns or [TIME_COLUMN] + PRICE_COLUMNS
+        pieces, remaining = [], count
+        for month in reversed(self.months):
+            if remaining <= 0:
+                break
+            if end is not None and np.datetime64(month, "ms") >= end:
+                continue
+            first, last = self._bounds(month, None, end)
+            first = max(first, last - remaining)
+            if last > first:
+                data = self._open_month(month)
+                pieces.insert(0, {column: data[column][first:last] for column in columns})
+                remaining -= last - first
+        if not pieces:
+            return self.columns(end=np.datetime64(0, "ms"), columns=columns)
+        return {column: np.concatenate([piece[column] for piece in pieces]) for column in columns}
+
+    def frame(self, start=None, end=None, columns=None):
+        """ ✅ [start, end) 구간 DataFrame (과거 → 최신 순서, 기존 CSV 와 같은 컬럼 이름) """
+        return pd.DataFrame(self.columns(start, end, columns), copy=False)
+
+    def first_time(self):
+        """ ✅ 가장 오래된 캔들 시각 (비어 있으면 None) """
+        if not self.months:
+            return None
+        return pd.Timestamp(self._open_month(self.months[0])[TIME_COLUMN][0])
+
+    def last_time(self):
+        """ ✅ 가장 최근 캔들 시각 (비어 있으면 None) """
+        if not self.months:
+            return None
+        return pd.Timestamp(self._open_month(self.months[-1])[TIME_COLUMN][-1])
+
+
+def write_candles(market, interval, df, dtype=None, store_dir=STORE_DIR):
+    """ ✅ 캔들 DataFrame 저장 → HistoryStore """
+    store = HistoryStore(market, interval, store_dir)
+    count = store.write(df, dtype)
+    print(f"✅ {market} {interval_name(interval)} 저장소 갱신 완료 ({count}개 캔들) → {store.directory}")
+    return store
+
+
+def load_candles(market, interval="1", start=None, end=None, columns=None, store_dir=STORE_DIR):
+    """ ✅ 저장소에서 [start, end) 구간 DataFrame 로드 (메모리 맵) """
+    return HistoryStore(market, interval, store_dir).frame(start, end, columns)
+
+
+def import_csv(path, market=None, interval=None, dtype=None, chunk_size=500_000, store_dir=STORE_DIR):
+    """
+    ✅ 기존 CSV (fetch_all_data / to_csv 결과) → 저장소로 변환
+    최신 → 과거 순서로 저장된 예전 CSV 도 시각 기준으로 정렬해 저장, 큰 파일은 chunk_size 줄씩 나눠 읽음
+    :param market, interval: None 이면 파일 이름({market}_{interval}m_data.csv) 에서 추출
+    """
+    if market is None or interval is None:
+        name_market, name_interval = os.path.basename(path).split("_")[:2]
+        market = market or name_market
+        interval = interval or name_interval.rstrip("m")
+
+    store = HistoryStore(market, interval, store_dir)
+    usecols = [TIME_COLUMN] + PRICE_COLUMNS
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+        store.write(chunk.dropna(subset=[TIME_COLUMN]), dtype)
+    print(f"✅ {path} → {market} {interval_name(interval)} 저장소 변환 완료 ({len(store)}개 캔들)")
+    return store
+
+
+def import_downloaded(downloader, dtype=None, store_dir=STORE_DIR):
+    """
+    ✅ downloader(CandleDownloader) 로 받은 캔들 → 저장소
+    저장소보다 과거 캔들과 마지막 캔들 이후(진행 중이던 마지막 캔들 포함)만 기록 → 바뀐 달만 다시 저장
+    (해당 캔들이 들어 있을 수 있는 part 파일만 읽음, 저장소 시각은 KST / part 파일 이름은 UTC)
+    """
+    store = HistoryStore(downloader.market, downloader.interval, store_dir)
+    first, last = store.first_time(), store.last_time()
+    if first is None:
+        df = downloader.load()
+    else:
+        df = downloader.load(before=first - KST_OFFSET, since=last - KST_OFFSET)
+        df = df[(df[TIME_COLUMN] < first) | (df[TIME_COLUMN] >= last)]
+    count = store.write(df, dtype)
+    print(f"✅ {store.market} {interval_name(store.interval)} 저장소 갱신 완료 ({len(df)}개 기록, 전체 {count}개 캔들)")
+    return store
+
+
+def import_csv_dir(directory, pattern="*_data.csv", dtype=None, store_dir=STORE_DIR):
+    """ ✅ 폴더 안의 CSV 전부 변환 → [HistoryStore] """
+    return [import_csv(path, dtype=dtype, store_dir=store_dir) for path in sorted(glob.glob(os.path.join(directory, pattern)))]
@@ -0,0 +1,143 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ✅ LSTM 학습용 시계열 윈도우 데이터셋
+#   - 특성 배열(N × F)을 float32 로 한 번만 준비하고, 윈도우(N × time_steps × F)는 strided view 로만 표현 (복사 없음)
+#   - 배치를 꺼낼 때만 batch_size × time_steps × F 크기로 복사 → 메모리 사용량이 데이터 길이와 거의 무관
+#   - 메모리 맵(history_store) 배열도 그대로 사용 가능, tf.data 변환은 to_tf() 에서만 tensorflow 를 불러옴
+#   - 시계열 교차 검증 구간/샘플 분할(purged_folds, fold_samples)도 여기 둠 (tensorflow 없이 사용/테스트)
+
+
+def window_view(features, time_steps):
+    """ ✅ (N, F) 배열 → (N - time_steps + 1, time_steps, F) 읽기 전용 view (i 번째 = features[i:i + time_steps]) """
+    return sliding_window_view(features, time_steps, axis=0).transpose(0, 2, 1)
+
+
+def purged_folds(first, last, n_splits=4, embargo=0):
+    """
+    ✅ 행 구간 [first, last) → 시계열 교차 검증 구간 [(학습 시작, 학습 끝, 검증 시작, 검증 끝)] (끝은 미포함)
+    n_splits + 1 개 블록으로 나누고 k 번째 구간은 블록 0~k 학습, 블록 k+1 검증
+    :param embargo: 학습 끝과 검증 시작 사이에 비워둘 행 수
+    """
+    block = (last - first) // (n_splits + 1)
+    return [
+        (first, first + k * block, first + k * block + embargo, first + (k + 1) * block)
+        for k in range(1, n_splits + 1)
+    ]
+
+
+def fold_samples(fold, time_steps):
+    """
+    ✅ (학습 샘플 번호, 검증 샘플 번호) - 입력과 정답 캔들이 모두 각 구간 안에 있는 샘플만
+    샘플 i 의 정답 target[i + time_steps] 는 다음 캔들(i + time_steps + 1) 종가로 계산 → 그 캔들까지 구간 안에 있어야 함
+    """
+    train_start, train_end, validation_start, validation_end = fold
+    return (np.arange(train_start, max(train_start, train_end - time_steps - 1)),
+            np.arange(validation_start, max(validation_start, validation_end - time_steps - 1)))
+
+
+class WindowDataset:
+    """
+    ✅ 샘플 i: 입력 features[i:i + time_steps], 정답 target[i + time_steps]
+    indices 로 사용할 샘플만 지정 (학습/검증 분할은 인덱스만 나눔)
+    scaler(MinMaxScaler) 를 주면 배치를 꺼낼 때 정규화 (원본 배열은 그대로)
+    """
+
+    def __init__(self, features, target, time_steps=60, indices=None, batch_size=128, shuffle=False, seed=None,
+                 scaler=None):
+        self.features = np.asarray(features, dtype=np.float32)  # ✅ 이미 float32 면 복사하지 않음
+        self.target = np.asarray(target, dtype=np.float32)
+        self.time_steps = time_steps
+        self.windows = window_view(self.features, time_steps)
+        self.indices = np.arange(len(self.features) - time_steps) if indices is None else np.asarray(indices)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.scaler = scaler
+        if scaler is not None:
+            self.scale = scaler.scale_.astype(np.float32)
+            self.offset = scaler.min_.astype(np.float32)
+
+    @property
+    def input_shape(self):
+        return self.time_steps, self.features.shape[1]
+
+    def __len__(self):
+        """ ✅ 에폭당 배치 수 """
+        return -(-len(self.indices) // self.batch_size)
+
+    def subset(self, indices, shuffle=None):
+        """ ✅ 같은 배열을 공유하는 부분 데이터셋 (indices: 샘플 번호) """
+        return WindowDataset(self.features, self.target, self.time_steps, indices, self.batch_size,
+                             self.shuffle if shuffle is None else shuffle, self.rng.integers(1 << 31), self.scaler)
+
+    def labels(self):
+        """ ✅ 전체 정답 배열 (indices 순서) """
+        return self.target[self.indices + self.time_steps]
+
+    def batch(self, position):
+        """ ✅ position 번째 배치 (입력, 정답) - 이 배치만 복사 """
+        return self._take(self.indices[position * self.batch_size:(position + 1) * self.batch_size])
+
+    def _take(self, idx):
+        windows = self.windows[idx]
+        if self.scaler is not None:
+            windows *= self.scale
+            windows += self.offset
+        return windows, self.target[idx + self.time_steps]
+
+    def batches(self):
+        """ ✅ 에폭 1회 배치 생성기 (shuffle=True 면 에폭마다 순서 섞음) """
+        indices = self.indices
+        if self.shuffle:
+            indices = self.rng.permutation(indices)
+        for start in range(0, len(indices), self.batch_size):
+            yield self._take(indices[start:start + self.batch_size])
+
+    def to_tf(self, prefetch=None):
+        return to_tf_dataset(self, prefetch)
+
+
+class MultiWindowDataset:
+    """ ✅ 여러 종목 WindowDataset 묶음 (종목 경계를 넘는 윈도우 없음, shuffle=True 면 종목 간 배치 순서도 섞음) """
+
+    def __init__(self, datasets, shuffle=False, seed=None):
+        self.datasets = list(datasets)
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def input_shape(self):
+        return self.datasets[0].input_shape
+
+    def __len__(self):
+        return sum(len(dataset) for dataset in self.datasets)
+
+    def labels(self):
+        return np.concatenate([dataset.labels() for dataset in self.datasets])
+
+    def batches(self):
+        generators = [dataset.batches() for dataset in self.datasets]
+        order = np.repeat(np.arange(len(self.datasets)), [len(dataset) for dataset in self.datasets])
+        if self.shuffle:
+            order = self.rng.permutation(order)
+        for position in order:
+            yield next(generators[position])
+
+    def to_tf(self, prefetch=None):
+        return to_tf_dataset(self, prefetch)
+
+
+def to_tf_dataset(dataset, prefetch=None):
+    """ ✅ tf.data.Dataset (생성기 기반, 배치 단위로 지연 생성 + 학습과 겹쳐서 미리 준비) """
+    import tensorflow as tf
+
+    time_steps, feature_count = dataset.input_shape
+    tf_dataset = tf.data.Dataset.from_generator(
+        dataset.batches,
+        output_signature=(
+            tf.TensorSpec(shape=(None, time_steps, feature_count), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    )
+    return tf_dataset.prefetch(prefetch or tf.data.AUTOTUNE)
@@ -0,0 +1,147 @@
+import os
+import time
+
+import numpy as np
+
+# ✅ LSTM 모델 경량 추론 변환 (Keras .h5 → TFLite)
+#   - 변환: tensorflow 필요 (학습 환경), 추론: tflite_runtime 만 있으면 됨 (없으면 tensorflow 의 tf.lite 사용)
+#   - 양자화: None (float32) / "float16" (모델 크기 1/2) / "int8" (가중치·연산 int8, 대표 데이터 필요)
+#   - 변환 직후 같은 입력으로 Keras 출력과 비교 (check_parity) → 허용 오차를 넘으면 저장하지 않음
+
+QUANTIZATIONS = (None, "float16", "int8")
+PARITY_TOLERANCE = {None: 1e-4, "float16": 1e-2, "int8": 5e-2}  # ✅ 확률(0~1) 최대 절대 오차
+REPRESENTATIVE_BATCHES = 100
+
+
+def _interpreter_class():
+    """ ✅ tflite_runtime 우선 (tensorflow 전체를 불러오지 않음) """
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        from tensorflow.lite import Interpreter
+    return Interpreter
+
+
+class LiteModel:
+    """ ✅ TFLite 추론 래퍼 (Keras 모델처럼 model(batch) → numpy 확률 배열) """
+
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = int(self.input["shape"][0])
+
+    @property
+    def input_shape(self):
+        return tuple(int(size) for size in self.input["shape"][1:])
+
+    def __call__(self, batch, training=False):
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        if len(batch) != self.batch_size:
+            # ✅ 배치 크기가 바뀔 때만 텐서 재할당
+            self.interpreter.resize_tensor_input(self.input["index"], [len(batch), *self.input_shape])
+            self.interpreter.allocate_tensors()
+            self.input = self.interpreter.get_input_details()[0]
+            self.output = self.interpreter.get_output_details()[0]
+            self.batch_size = len(batch)
+        self.interpreter.set_tensor(self.input["index"], batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output["index"]).copy()
+
+
+def load_model(path, num_threads=None):
+    """ ✅ .tflite 이면 LiteModel, 그 외(.h5 / .keras)는 Keras 모델 → model(batch) 결과는 numpy 배열 """
+    if str(path).endswith(".tflite"):
+        return LiteModel(path, num_threads)
+
+    import tensorflow as tf
+
+    keras_model = tf.keras.models.load_model(path, compile=False)
+    return lambda batch, training=False: keras_model(batch, training=training).numpy()
+
+
+def convert(model, quantize=None, representative=None):
+    """
+    ✅ Keras 모델 → TFLite 바이트
+    :param quantize: None / "float16" / "int8"
+    :param representative: int8 양자화용 대표 데이터 (batches() 가 있는 WindowDataset)
+    """
+    import tensorflow as tf
+
+    if quantize not in QUANTIZATIONS:
+        raise ValueError(f"❌ 지원하지 않는 양자화: {quantize} (사용 가능: {QUANTIZATIONS})")
+
+    # ✅ 배치 1 고정 입력으로 변환 (LSTM 이 TFLite 기본 연산으로 변환됨, 추론 시 배치 크기 변경 가능)
+    input_spec = tf.TensorSpec([1, *model.input_shape[1:]], tf.float32)
+    function = tf.function(lambda x: model(x, training=False)).get_concrete_function(input_spec)
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([function], model)
+
+    if quantize == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == "int8":
+        if representative is None:
+            raise ValueError("❌ int8 양자화에는 대표 데이터(representative)가 필요합니다")
+
+        def representative_dataset():
+            for count, (windows, _) in enumerate(representative.batches()):
+                if count >= REPRESENTATIVE_BATCHES:
+                    break
+                for window in windows:
+                    yield [window[None, ...]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        # ✅ int8 로 변환되지 않는 연산은 float 로 유지 (입출력은 float32 그대로)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8, tf.lite.OpsSet.TFLITE_BUILTINS]
+    return converter.convert()
+
+
+def check_parity(reference, lite_model, windows, tolerance):
+    """
+    ✅ 같은 입력에 대한 Keras / TFLite 출력 비교
+    :return: {"max_error": 최대 절대 오차, "passed": 허용 오차 이내 여부, "reference_ms"/"lite_ms": 배치 1회 시간}
+    """
+    windows = np.ascontiguousarray(windows, dtype=np.float32)
+    started = time.perf_counter()
+    expected = np.asarray(reference(windows, training=False)).ravel()
+    reference_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    actual = lite_model(windows).ravel()
+    lite_ms = (time.perf_counter() - started) * 1000
+    max_error = float(np.max(np.abs(expected - actual)))
+    return {"max_error": max_error, "passed": max_error <= tolerance, "reference_ms": reference_ms, "lite_ms": lite_ms}
+
+
+def export_lite(model, output_path, quantize=None, samples=None, representative=None, tolerance=None):
+    """
+    ✅ Keras 모델 → .tflite 저장 (samples 가 있으면 출력 비교 후 통과할 때만 저장)
+    :param model: Keras 모델 또는 .h5 경로
+    :param samples: 비교용 입력 (N × time_steps × features)
+    :return: check_parity 결과 (samples 가 없으면 None), 통과하지 못하면 ValueError
+    """
+    import tensorflow as tf
+
+    if isinstance(model, str):
+        model = tf.keras.models.load_model(model, compile=False)
+    content = convert(model, quantize, representative)
+
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+
+    parity = None
+    if samples is not None:
+        tolerance = PARITY_TOLERANCE[quantize] if tolerance is None else tolerance
+        parity = check_parity(model, LiteModel(temp_path), samples, tolerance)
+        print(f"🔍 TFLite({quantize or 'float32'}) 출력 비교: 최대 오차 {parity['max_error']:.6f} "
+              f"(Keras {parity['reference_ms']:.1f}ms / TFLite {parity['lite_ms']:.1f}ms)")
+        if not parity["passed"]:
+            os.remove(temp_path)
+            raise ValueError(f"❌ TFLite 출력 오차가 허용 범위({tolerance})를 넘었습니다: {parity['max_error']:.6f}")
+
+    os.replace(temp_path, output_path)
+    print(f"✅ TFLite 모델 저장 완료 ({len(content) / 1024:.1f}KB) → {output_path}")
+    return parity
@@ -0,0 +1,184 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from .history_store import PRICE_COLUMNS, TIME_COLUMN, interval_name
+from .lstm_dataset import WindowDataset
+from .optimizer import price_macd
+
+# ✅ LSTM 학습용 특성 파일 (디스크, 메모리 맵)
+#   - 캔들 저장소를 월 단위로 읽어 특성(OHLCV + RSI + MACD + 시그널)을 계산 → float32 파일에 이어 씀
+#   - 월 경계에서는 앞 WARMUP_ROWS 개 캔들을 붙여 계산 (RSI 는 정확히 같고, EMA 는 float 정밀도 안에서 같음)
+#   - 저장소에 최신 캔들이 추가되면 마지막 행(진행 중이었을 수 있음)부터 이어서 계산, 과거가 바뀌면 전체 재계산
+#   - 특성은 정규화하지 않은 값으로 저장 → 정규화는 배치마다 적용 (학습 구간에 맞춘 scaler 사용)
+
+FEATURE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "lstm_features")
+FEATURES = ["opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume", "rsi", "macd",
+            "macd_signal"]
+CLOSE_INDEX = FEATURES.index("trade_price")
+WARMUP_ROWS = 1000  # ✅ EMA(26) 오차가 (25/27)^1000 ≈ 1e-34 배로 줄어드는 길이
+SCALER_CHUNK_ROWS = 200_000
+
+
+def candle_features(df, rsi_period=14, macd_setting=(12, 26, 9)):
+    """ ✅ 캔들 DataFrame → FEATURES 행렬 (dayTrading.calculate_rsi / calculate_macd 와 같은 계산, float64) """
+    close = df["trade_price"]
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=rsi_period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+    macd, macd_signal = price_macd(close.to_numpy(dtype=float), macd_setting)
+    return np.column_stack([df[PRICE_COLUMNS].to_numpy(dtype=float), rsi, macd, macd_signal])
+
+
+def clean_candles(columns):
+    """ ✅ 결측값 / 이상치(고가 < 저가, 종가 <= 0) 제거 """
+    df = pd.DataFrame(columns, copy=False).dropna()
+    return df[(df["high_price"] >= df["low_price"]) & (df["trade_price"] > 0)]
+
+
+class FeatureFile:
+    """ ✅ 종목 1개 / 캔들 단위 1개의 특성 파일 (features.f32: rows × FEATURES, times.i64, target.f32) """
+
+    def __init__(self, market, interval="15", cache_dir=FEATURE_CACHE_DIR):
+        self.market = market
+        self.interval = str(interval)
+        self.directory = os.path.join(cache_dir, market, interval_name(interval))
+        self.meta = self._load_meta()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_meta(self):
+        if os.path.exists(self._path("meta.json")):
+            with open(self._path("meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        return {"source": None, "rows": 0, "features": FEATURES}
+
+    def _save_meta(self):
+        with open(self._path("meta.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, sort_keys=True)
+        os.replace(self._path("meta.json.tmp"), self._path("meta.json"))
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    @property
+    def features(self):
+        """ ✅ (rows, len(FEATURES)) float32 메모리 맵 (정규화 전 값) """
+        return self._memmap("features.f32", np.float32, (len(self), len(FEATURES)))
+
+    @property
+    def times(self):
+        return self._memmap("times.i64", "datetime64[ms]", (len(self),))
+
+    @property
+    def target(self):
+        """ ✅ 다음 캔들 종가 상승 여부 (마지막 행은 다음 캔들이 없으므로 0, 학습에 쓰지 않음) """
+        return self._memmap("target.f32", np.float32, (len(self),))
+
+    def _memmap(self, name, dtype, shape):
+        if not len(self):
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode="r", shape=shape)
+
+    def _truncate(self, rows):
+        for name, row_bytes in (("features.f32", len(FEATURES) * 4), ("times.i64", 8), ("target.f32", 4)):
+            with open(self._path(name), "ab") as f:
+                f.truncate(rows * row_bytes)
+
+    def update(self, store):
+        """
+        ✅ 캔들 저장소(HistoryStore) 기준으로 특성 파일 갱신 → self
+        저장소 버전이 같으면 그대로, 최신 캔들만 늘었으면 이어서 계산, 그 외에는 전체 재계산
+        """
+        first, last = store.first_time(), store.last_time()
+        source = {"version": store.meta.get("version", 0), "first": str(first), "last": str(last)}
+        cached = self.meta["source"]
+        if cached == source or first is None:
+            return self
+
+        os.makedirs(self.directory, exist_ok=True)
+        keep, since, warm = 0, None, None
+        if cached and cached["first"] == source["first"] and pd.Timestamp(cached["last"]) <= last and len(self) > 1:
+            keep = len(self) - 1  # ✅ 마지막 행은 진행 중이던 캔들일 수 있으므로 다시 계산
+            since = pd.Timestamp(self.times[keep])
+            warm = clean_candles(store.tail(WARMUP_ROWS, end=since))[PRICE_COLUMNS]
+        self._truncate(keep)
+        self.meta["rows"] = keep
+
+        with open(self._path("features.f32"), "ab") as feature_file, open(self._path("times.i64"), "ab") as time_file:
+            for columns in store.iter_months(since):
+                chunk = clean_candles(columns)
+                frame = pd.concat([warm, chunk[PRICE_COLUMNS]], ignore_index=True) if warm is not None else chunk
+                values = candle_features(frame.reset_index(drop=True))[len(frame) - len(chunk):]
+                valid = ~np.isnan(values).any(axis=1)
+                feature_file.write(values[valid].astype(np.float32).tobytes())
+                time_file.write(chunk[TIME_COLUMN].to_numpy().astype("datetime64[ms]")[valid].tobytes())
+                self.meta["rows"] += int(valid.sum())
+                warm = frame[PRICE_COLUMNS].iloc[-WARMUP_ROWS:]
+
+        # ✅ 정답은 바뀐 구간만 다시 계산 (keep - 1 행의 다음 캔들이 바뀌었을 수 있음)
+        start = max(keep - 1, 0)
+        close = self.features[start:, CLOSE_INDEX]
+        target = np.zeros(len(close), dtype=np.float32)
+        target[:-1] = close[1:] > close[:-1]
+        with open(self._path("target.f32"), "r+b" if os.path.exists(self._path("target.f32")) else "wb") as f:
+            f.truncate(start * 4)
+            f.seek(start * 4)
+            f.write(target.tobytes())
+
+        self.meta["source"] = source
+        self._save_meta()
+        print(f"🧮 {self.market} {interval_name(self.interval)} 특성 파일 갱신 "
+              f"({'전체' if since is None else f'{since} 이후'}, {len(self)}행)")
+        return self
+
+    def sample_indices(self, time_steps, start=None, end=None):
+        """ ✅ 입력 구간이 [start, end) 안에 있고 정답(다음 캔들)이 있는 샘플 번호 """
+        times = self.times
+        first = 0 if start is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(start), "ms")))
+        last = len(self) if end is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(end), "ms")))
+        return np.arange(first, max(first, last - time_steps - 1))
+
+
+def fit_scaler(features, rows, chunk_rows=SCALER_CHUNK_ROWS):
+    """ ✅ features[:rows] 로 MinMaxScaler 를 한 번 순회하며 학습 (partial_fit, 전체를 메모리에 올리지 않음) """
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    for start in range(0, max(rows, 1), chunk_rows):
+        scaler.partial_fit(features[start:min(start + chunk_rows, rows)])
+    return scaler
+
+
+def time_split(feature_file, time_steps=60, validation_split=0.2, start=None, end=None, batch_size=128):
+    """
+    ✅ 시간 순서 학습/검증 분할 (앞 1 - validation_split 학습, 뒤 validation_split 검증)
+    검증 구간 바로 앞 time_steps + 1 개 학습 샘플은 버림 (입력/정답 캔들이 검증 구간에 걸침, lstm_dataset.fold_samples 와 같은 기준)
+    scaler 는 학습 샘플이 쓰는 행으로만 학습 (검증 구간 정보가 학습에 섞이지 않음)
+    :return: (학습 WindowDataset, 검증 WindowDataset, scaler)
+    """
+    indices = feature_file.sample_indices(time_steps, start, end)
+    split = int(len(indices) * (1 - validation_split))
+    train_indices, validation_indices = indices[:max(split - time_steps - 1, 0)], indices[split:]
+    if not len(train_indices) or not len(validation_indices):
+        raise ValueError(f"❌ {feature_file.market} 학습 데이터 부족 ({len(indices)}개 샘플)")
+
+    scaler = fit_scaler(feature_file.features, int(train_indices[-1]) + time_steps)
+    dataset = WindowDataset(feature_file.features, feature_file.target, time_steps, batch_size=batch_size,
+                            scaler=scaler)
+    return dataset.subset(train_indices, shuffle=True), dataset.subset(validation_indices, shuffle=False), scaler
+
+
+def scaler_to_dict(scaler):
+    """ ✅ MinMaxScaler → JSON 저장용 dict """
+    return {"data_min": scaler.data_min_.tolist(), "data_max": scaler.data_max_.tolist(), "features": FEATURES}
+
+
+def scaler_from_dict(data):
+    """ ✅ scaler_to_dict 결과 → MinMaxScaler """
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaler.fit(np.array([data["data_min"], data["data_max"]]))
+    return scaler
@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+from datetime import datetime
+
+# ✅ LSTM 모델 버전 저장소
+#   - models/lstm/{버전}/ : model.h5, model.tflite(선택), scaler.json, meta.json (학습/검증 데이터 구간, 지표, 부모 버전)
+#   - current.json : 현재 배포 중인 버전 (os.replace 로 교체)
+#   - 배포: 버전 폴더의 파일을 임시 파일로 복사한 뒤 os.replace → 추론 프로세스는 반쯤 쓴 파일을 읽지 않음
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "lstm")
+
+
+def _write_json(path, data):
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, default=str)
+    os.replace(f"{path}.tmp", path)
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def new_version():
+    """ ✅ 버전 이름 (생성 시각, 정렬하면 오래된 순서) """
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def version_dir(version, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, version)
+
+
+def save_version(model, scaler_meta, meta, lite_path=None, model_dir=MODEL_DIR):
+    """
+    ✅ 모델 버전 저장 (배포하지 않음)
+    :param scaler_meta: {"interval", "time_steps", "markets": {market: scaler_to_dict}} (dayTrading 의 lstm_scaler.json 형식)
+    :param meta: 데이터 구간 / 지표 등 기록할 정보 (version, created 는 자동 추가)
+    :param lite_path: 함께 보관할 .tflite 파일 (선택)
+    :return: 버전 이름
+    """
+    version = meta.get("version") or new_version()
+    directory = version_dir(version, model_dir)
+    os.makedirs(directory, exist_ok=True)
+    model.save(os.path.join(directory, "model.h5"))
+    if lite_path:
+        shutil.copyfile(lite_path, os.path.join(directory, "model.tflite"))
+    _write_json(os.path.join(directory, "scaler.json"), dict(scaler_meta, version=version))
+    _write_json(os.path.join(directory, "meta.json"), dict(meta, version=version, created=datetime.now().isoformat()))
+    return version
+
+
+def load_meta(version, model_dir=MODEL_DIR):
+    return _read_json(os.path.join(version_dir(version, model_dir), "meta.json"))
+
+
+def load_scaler_meta(version, model_dir=MODEL_DIR):
+    """ ✅ 버전의 scaler.json (save_version 의 scaler_meta + version, 없으면 None) """
+    return _read_json(os.path.join(version_dir(version, model_dir), "scaler.json"))
+
+
+def current_version(model_dir=MODEL_DIR):
+    """ ✅ 현재 배포 중인 버전 (없으면 None) """
+    current = _read_json(os.path.join(model_dir, "current.json"))
+    return current["version"] if current else None
+
+
+def _replace_file(source, target):
+    temp_path = f"{target}.tmp"
+    shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+
+
+def promote(version, model_path, scaler_path, lite_model_path=None, model_dir=MODEL_DIR):
+    """
+    ✅ 버전 배포 (scaler → 모델 → current.json 순서로 교체)
+    추론 쪽은 모델 파일 변경 시각으로 다시 로드하므로 모델보다 scaler 를 먼저 교체
+    """
+    directory = version_dir(version, model_dir)
+    _replace_file(os.path.join(directory, "scaler.json"), scaler_path)
+    lite_source = os.path.join(directory, "model.tflite")
+    if lite_model_path and os.path.exists(lite_source):
+        _replace_file(lite_source, lite_model_path)
+    _replace_file(os.path.join(directory, "model.h5"), model_path)
+    _write_json(os.path.join(model_dir, "current.json"), {"version": version, "promoted": datetime.now().isoformat()})
+    print(f"🚀 LSTM 모델 {version} 배포 완료")
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .backtest import run_backtest
+
+# ✅ 매매 전략 파라미터 탐색 (지표는 설정별로 한 번만 계산 → 백테스트는 프로세스 풀로 분산)
+#   - 캔들/지표 배열은 공유 메모리에 한 번만 올리고 작업자는 이름으로 접근 (작업마다 pickle 하지 않음)
+#   - 결과는 product() 순서 기준, 수익률이 같으면 먼저 나온 조합 선택 (기존 optimize_strategy 와 동일)
+
+DEFAULT_RSI_RANGES = [(25, 70), (28, 72), (30, 75)]
+DEFAULT_MACD_RANGES = [(12, 26, 9), (10, 24, 8), (14, 30, 10)]
+DEFAULT_STOP_LOSS_LEVELS = [0.98, 0.97]
+DEFAULT_TAKE_PROFIT_LEVELS = [1.02, 1.03]
+
+MIN_PARALLEL_TASKS = 64  # ✅ 조합 수가 적으면 프로세스 생성 비용이 더 크므로 현재 프로세스에서 실행
+TASKS_PER_WORKER = 4  # ✅ 작업자당 작업 묶음 수 (부하 분산용)
+
+_worker_state = {}
+
+
+def price_rsi(prices, period=14):
+    """ ✅ RSI 배열 (aiTrading.calculate_rsi 와 동일: min_periods=1 단순 이동평균) """
+    delta = np.diff(prices, prepend=np.nan)
+    gain = pd.Series(np.where(delta > 0, delta, 0)).rolling(window=period, min_periods=1).mean().to_numpy()
+    loss = pd.Series(np.where(delta < 0, -delta, 0)).rolling(window=period, min_periods=1).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def price_macd(prices, macd_setting):
+    """ ✅ (MACD, 시그널) 배열 (aiTrading.calculate_macd 와 동일) """
+    short, long, signal = macd_setting
+    series = pd.Series(prices)
+    macd = series.ewm(span=short, adjust=False).mean() - series.ewm(span=long, adjust=False).mean()
+    return macd.to_numpy(), macd.ewm(span=signal, adjust=False).mean().to_numpy()
+
+
+def build_indicator_matrix(prices, macd_ranges, rsi_period=14):
+    """ ✅ [종가, RSI, MACD_0, 시그널_0, MACD_1, 시그널_1, ...] 행렬 (MACD 설정별로 한 번만 계산) """
+    prices = np.asarray(prices, dtype=float)
+    rows = [prices, price_rsi(prices, rsi_period)]
+    for macd_setting in macd_ranges:
+        rows.extend(price_macd(prices, macd_setting))
+    return np.vstack(rows)
+
+
+def _backtest_group(matrix, macd_index, params):
+    """ ✅ 같은 MACD 설정을 쓰는 조합 묶음 백테스트 → [(조합 번호, 수익률)] """
+    prices, rsi = matrix[0], matrix[1]
+    macd, macd_signal = matrix[2 + macd_index * 2], matrix[3 + macd_index * 2]
+    return [
+        (order, run_backtest(prices, rsi, macd, macd_signal, rsi_range, stop_loss, take_profit)["profit"])
+        for order, rsi_range, stop_loss, take_profit in params
+    ]
+
+
+def _init_worker(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    _worker_state["shm"] = shm  # ✅ 프로세스가 끝날 때까지 참조 유지
+    _worker_state["matrix"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _run_in_worker(macd_index, params):
+    return _backtest_group(_worker_state["matrix"], macd_index, params)
+
+
+def _split(items, parts):
+    size = max(1, -(-len(items) // parts))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def sweep(prices, rsi_ranges=None, macd_ranges=None, stop_loss_levels=None, take_profit_levels=None, workers=None):
+    """
+    ✅ 전체 조합 백테스트
+    :param prices: 종가 배열 (또는 trade_price 컬럼이 있는 DataFrame)
+    :param workers: 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스에서 실행)
+    :return: [((rsi_range, macd_setting, stop_loss, take_profit), 수익률)] - product() 순서
+    """
+    if isinstance(prices, pd.DataFrame):
+        prices = prices["trade_price"].to_numpy(dtype=float)
+    rsi_ranges = rsi_ranges or DEFAULT_RSI_RANGES
+    macd_ranges = macd_ranges or DEFAULT_MACD_RANGES
+    stop_loss_levels = stop_loss_levels or DEFAULT_STOP_LOSS_LEVELS
+    take_profit_levels = take_profit_levels or DEFAULT_TAKE_PROFIT_LEVELS
+
+    combos = list(product(rsi_ranges, macd_ranges, stop_loss_levels, take_profit_levels))
+    macd_position = {macd_setting: i for i, macd_setting in enumerate(macd_ranges)}
+    groups = {}
+    for order, (rsi_range, macd_setting, stop_loss, take_profit) in enumerate(combos):
+        groups.setdefault(macd_position[macd_setting], []).append((order, rsi_range, stop_loss, take_profit))
+
+    matrix = build_indicator_matrix(prices, macd_ranges)
+    workers = workers or os.cpu_count() or 1
+    profits = [None] * len(combos)
+
+    if workers == 1 or len(combos) < MIN_PARALLEL_TASKS:
+        for macd_index, params in groups.items():
+            for order, profit in _backtest_group(matrix, macd_index, params):
+                profits[order] = profit
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=matrix.nbytes)
+        try:
+            np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+            parts = max(1, workers * TASKS_PER_WORKER // len(groups))
+            tasks = [(macd_index, chunk) for macd_index, params in groups.items() for chunk in _split(params, parts)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shm.name, matrix.shape)) as executor:
+                futures = [executor.submit(_run_in_worker, macd_index, chunk) for macd_index, chunk in tasks]
+                for future in futures:
+                    for order, profit in future.result():
+                        profits[order] = profit
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return list(zip(combos, profits))
+
+
+def best_result(results):
+    """ ✅ 수익률이 가장 높은 조합 (동률이면 먼저 나온 조합) → (best_config, best_profit) """
+    best_config, best_profit = None, -9999
+    for config, profit in results:
+        if profit > best_profit:
+            best_config, best_profit = config, profit
+    return best_config, best_profit
@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ✅ 다운로드(I/O) 와 최적화(CPU) 를 겹쳐서 실행하는 종목 파이프라인
+#   - 다운로드: 쓰레드 풀 (요청 간격은 rate_limiter 가 조절)
+#   - 최적화: 프로세스 풀 (다운로드가 끝난 종목부터 바로 투입)
+#   - 결과: 종목별로 끝나는 즉시 yield
+
+
+def run_pipeline(items, download, process, download_workers=4, process_workers=None, max_prefetch=None):
+    """
+    ✅ 종목 파이프라인 실행
+    :param items: 처리할 종목 목록
+    :param download: item → 데이터 (쓰레드에서 실행, None 이면 해당 종목 건너뜀)
+    :param process: (item, 데이터) → 결과 (프로세스에서 실행되므로 모듈 최상위 함수여야 함)
+    :param max_prefetch: 최적화 대기 중인 다운로드 결과 최대 개수 (메모리 제한, None 이면 프로세스 수 × 2)
+    :return: (item, 결과, 오류) 를 끝나는 순서대로 yield (오류가 없으면 None)
+    """
+    items = list(items)
+    process_workers = process_workers or os.cpu_count() or 1
+    max_prefetch = max_prefetch or process_workers * 2
+
+    with ThreadPoolExecutor(max_workers=download_workers) as downloader, \
+            ProcessPoolExecutor(max_workers=process_workers) as optimizer:
+        next_item = 0
+        downloads = {}
+        optimizations = {}
+
+        def fill_downloads():
+            nonlocal next_item
+            # ✅ 최적화 대기열이 가득 차면 다운로드를 멈춰 메모리 사용량 제한
+            while next_item < len(items) and len(downloads) < download_workers \
+                    and len(downloads) + len(optimizations) < max_prefetch + process_workers:
+                item = items[next_item]
+                downloads[downloader.submit(download, item)] = item
+                next_item += 1
+
+        fill_downloads()
+        while downloads or optimizations:
+            done, _ = wait(list(downloads) + list(optimizations), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in downloads:
+                    item = downloads.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        yield item, None, e
+                        continue
+                    if data is None:
+                        yield item, None, None
+                        continue
+                    optimizations[optimizer.submit(process, item, data)] = item
+                else:
+                    item = optimizations.pop(future)
+                    try:
+                        yield item, future.result(), None
+                    except Exception as e:
+                        yield item, None, e
+            fill_downloads()
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .history_store import HistoryStore, STORE_DIR, TIME_COLUMN, interval_name
+
+# ✅ 1분봉 저장소 → 상위 분봉(3, 5, 15, 60, 240분 ...) 변환 (네트워크 요청 없음)
+#   - 구간 경계는 업비트와 같은 UTC 기준 (저장된 time 은 KST 이므로 9시간 빼고 계산)
+#   - 시가: 첫 캔들 시가, 고가/저가: 최대/최소, 종가: 마지막 캔들 종가, 거래량: 합계 (np.*.reduceat)
+#   - 변환 결과는 {저장소}/_resampled 에 저장, 1분봉이 늘어나면 마지막 구간부터 다시 계산
+
+RESAMPLED_DIR = "_resampled"  # ✅ 저장소 폴더 안의 변환 결과 폴더 이름
+KST_OFFSET = np.timedelta64(9, "h")
+
+
+def bucket_starts(times, minutes):
+    """ ✅ 각 캔들이 속한 상위 분봉 시작 시각 (KST, UTC 기준 경계) """
+    step = np.timedelta64(int(minutes), "m").astype("timedelta64[ms]").astype(np.int64)
+    utc = (times - KST_OFFSET).astype("datetime64[ms]").astype(np.int64)
+    return ((utc // step) * step).astype("datetime64[ms]") + KST_OFFSET
+
+
+def resample_columns(columns, minutes):
+    """
+    ✅ 캔들 컬럼 {time, opening_price, high_price, low_price, trade_price, candle_acc_trade_volume} → 상위 분봉
+    :param columns: 시각 오름차순 정렬된 배열 (HistoryStore.columns 결과)
+    """
+    times = np.asarray(columns[TIME_COLUMN])
+    if not len(times):
+        return {column: np.asarray(values)[:0] for column, values in columns.items()}
+    buckets = bucket_starts(times, minutes)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+    return {
+        TIME_COLUMN: buckets[starts],
+        "opening_price": np.asarray(columns["opening_price"])[starts],
+        "high_price": np.maximum.reduceat(columns["high_price"], starts),
+        "low_price": np.minimum.reduceat(columns["low_price"], starts),
+        "trade_price": np.asarray(columns["trade_price"])[ends],
+        "candle_acc_trade_volume": np.add.reduceat(columns["candle_acc_trade_volume"], starts),
+    }
+
+
+def resample_frame(df, minutes):
+    """ ✅ DataFrame 버전 (time 컬럼 기준 오름차순) """
+    columns = {column: df[column].to_numpy() for column in df.columns}
+    columns[TIME_COLUMN] = df[TIME_COLUMN].to_numpy().astype("datetime64[ms]")
+    return pd.DataFrame(resample_columns(columns, minutes))
+
+
+def resampled(market, minutes, base_interval="1", store_dir=STORE_DIR):
+    """
+    ✅ 상위 분봉 저장소 (캐시) → HistoryStore
+    1분봉 저장소의 저장 버전이 캐시 때와 같으면 그대로 사용
+    - 최신 캔들만 늘어났으면 캐시의 마지막 구간(진행 중이었을 수 있음)부터 다시 계산
+    - 과거 캔들이 추가됐으면 전체 다시 계산
+    """
+    base = HistoryStore(market, base_interval, store_dir)
+    cache = HistoryStore(market, str(minutes), os.path.join(store_dir, RESAMPLED_DIR))
+    first, last = base.first_time(), base.last_time()
+    if first is None:
+        return cache
+
+    source = {"interval": str(base_interval), "version": base.meta.get("version", 0),
+              "first": str(first), "last": str(last), "rows": len(base)}
+    cached = cache.meta.get("source")
+    if cached == source:
+        return cache
+
+    start = None
+    if cached and cached["interval"] == source["interval"] and cached["first"] == source["first"] \
+            and pd.Timestamp(cached["last"]) <= last and cache.last_time() is not None:
+        start = cache.last_time()  # ✅ 최신 캔들만 추가된 경우
+    else:
+        cache.clear()
+
+    cache.meta["source"] = source
+    cache.write(pd.DataFrame(resample_columns(base.columns(start), minutes)), base.meta["dtype"])
+    print(f"🔄 {market} {interval_name(base_interval)} → {interval_name(minutes)} 변환 "
+          f"({'전체' if start is None else f'{start} 이후'}, {len(cache)}개 캔들)")
+    return cache
+
+
+def history_store(market, interval="1", base_interval="1", store_dir=STORE_DIR):
+    """
+    ✅ 캔들 저장소 (저장된 단위가 없으면 1분봉에서 변환한 저장소) → HistoryStore
+    분 단위가 아니거나 1분봉이 없으면 해당 단위 저장소를 그대로 사용
+    """
+    interval = str(interval)
+    if interval.isdigit() and interval != str(base_interval) and len(HistoryStore(market, base_interval, store_dir)):
+        return resampled(market, int(interval), base_interval, store_dir)
+    return HistoryStore(market, interval, store_dir)
+
+
+def history_frame(market, interval="1", start=None, end=None, base_interval="1", store_dir=STORE_DIR):
+    """ ✅ 캔들 DataFrame 로드 (history_store 참고) """
+    return history_store(market, interval, base_interval, store_dir).frame(start, end)
@@ -0,0 +1,254 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .backtest import run_backtest
+from .optimizer import price_rsi, price_macd
+
+# ✅ 적응형 전략 탐색 (전체 조합 대신 예산 안에서 유망한 조합 위주로 평가)
+#   - random  : 무작위 샘플링
+#   - halving : 연속 절반 제거 (짧은 데이터로 많이 평가 → 상위 조합만 긴 데이터로 재평가)
+#   - bayes   : 가우시안 프로세스 대리 모델 + 기대 개선량(EI) 으로 다음 조합 선택
+#   모든 모드는 budget(전체 데이터 기준 백테스트 횟수)과 patience(개선 없는 평가 횟수)로 종료
+
+# ✅ 탐색 공간: 이름 → (최솟값, 최댓값, 정수 여부)
+DEFAULT_SPACE = {
+    "rsi_low": (20, 40, True),
+    "rsi_high": (60, 85, True),
+    "macd_short": (5, 20, True),
+    "macd_long": (20, 40, True),
+    "macd_signal": (5, 15, True),
+    "stop_loss": (0.95, 0.995, False),
+    "take_profit": (1.005, 1.10, False),
+}
+INDICATOR_CACHE_SIZE = 64  # ✅ MACD 설정별 지표 캐시 개수
+
+
+def to_config(params):
+    """ ✅ 파라미터 dict → optimize_strategy 형식 (rsi_range, macd_setting, stop_loss, take_profit) """
+    return (
+        (params["rsi_low"], params["rsi_high"]),
+        (params["macd_short"], params["macd_long"], params["macd_signal"]),
+        params["stop_loss"],
+        params["take_profit"],
+    )
+
+
+class ParameterSpace:
+    """ ✅ 탐색 공간 샘플링 / [0, 1] 정규화 변환 """
+
+    def __init__(self, space=None):
+        self.space = space or DEFAULT_SPACE
+        self.names = list(self.space)
+
+    def decode(self, unit):
+        """ ✅ [0, 1]^d 벡터 → 파라미터 dict (정수 반올림, MACD 단기 < 장기 보정) """
+        params = {}
+        for name, u in zip(self.names, unit):
+            low, high, is_int = self.space[name]
+            value = low + float(u) * (high - low)
+            params[name] = int(round(value)) if is_int else round(value, 4)
+        if "macd_short" in params and "macd_long" in params and params["macd_long"] <= params["macd_short"]:
+            params["macd_long"] = params["macd_short"] + 1
+        return params
+
+    def encode(self, params):
+        return np.array([(params[name] - low) / (high - low) for name, (low, high, _) in self.space.items()])
+
+    def sample(self, rng, count):
+        return [self.decode(unit) for unit in rng.random((count, len(self.names)))]
+
+
+class Evaluator:
+    """ ✅ 백테스트 평가기 (RSI 1회 계산, MACD 는 설정별 캐시, 데이터 앞부분만 사용하는 평가 지원) """
+
+    def __init__(self, prices, rsi_period=14):
+        if isinstance(prices, pd.DataFrame):
+            prices = prices["trade_price"].to_numpy(dtype=float)
+        self.prices = np.ascontiguousarray(prices, dtype=float)
+        self.rsi = price_rsi(self.prices, rsi_period)
+        self.macd_cache = OrderedDict()
+        self.cost = 0.0  # ✅ 전체 데이터 기준 백테스트 횟수 (앞 10% 만 쓰면 0.1)
+        self.evaluations = 0
+        self.history = []  # ✅ (config, 수익률, 사용한 데이터 비율)
+
+    def _macd(self, macd_setting, end):
+        """ ✅ 앞 end 개 캔들의 MACD (캐시가 더 짧으면 필요한 길이만 다시 계산) """
+        cached = self.macd_cache.get(macd_setting)
+        if cached is None or len(cached[0]) < end:
+            cached = price_macd(self.prices[:end], macd_setting)
+            self.macd_cache[macd_setting] = cached
+            if len(self.macd_cache) > INDICATOR_CACHE_SIZE:
+                self.macd_cache.popitem(last=False)
+        else:
+            self.macd_cache.move_to_end(macd_setting)
+        return cached
+
+    def __call__(self, params, fraction=1.0):
+        """ ✅ 데이터 앞부분(fraction) 으로 백테스트 → 수익률 (지표는 과거 데이터만 쓰므로 잘라도 값이 같음) """
+        rsi_range, macd_setting, stop_loss, take_profit = to_config(params)
+        end = max(2, int(len(self.prices) * fraction))
+        macd, macd_signal = self._macd(macd_setting, end)
+        profit = run_backtest(self.prices[:end], self.rsi[:end], macd[:end], macd_signal[:end],
+                              rsi_range, stop_loss, take_profit)["profit"]
+        self.cost += end / len(self.prices)
+        self.evaluations += 1
+        self.history.append((to_config(params), profit, fraction))
+        return profit
+
+
+def _result(best_params, best_profit, evaluator, mode):
+    return {
+        "mode": mode,
+        "best_config": to_config(best_params) if best_params else None,
+        "best_profit": best_profit,
+        "evaluations": evaluator.evaluations,
+        "cost": evaluator.cost,
+        "history": evaluator.history,
+    }
+
+
+def random_search(prices, space=None, budget=200, patience=None, seed=None):
+    """
+    ✅ 무작위 탐색
+    :param budget: 최대 백테스트 횟수
+    :param patience: 이 횟수 동안 최고 수익률이 갱신되지 않으면 종료 (None 이면 예산 끝까지)
+    """
+    space = ParameterSpace(space)
+    evaluator = Evaluator(prices)
+    rng = np.random.default_rng(seed)
+    best_params, best_profit, stale = None, -math.inf, 0
+
+    for params in space.sample(rng, budget):
+        profit = evaluator(params)
+        if profit > best_profit:
+            best_params, best_profit, stale = params, profit, 0
+        else:
+            stale += 1
+            if patience and stale >= patience:
+                break
+    return _result(best_params, best_profit, evaluator, "random")
+
+
+def successive_halving(prices, space=None, budget=200, eta=3, min_fraction=None, patience=None, seed=None):
+    """
+    ✅ 연속 절반 제거 (Successive Halving)
+    짧은 데이터 구간으로 많은 조합을 평가하고, 상위 1/eta 만 eta 배 긴 구간으로 다시 평가
+    :param budget: 전체 데이터 기준 백테스트 횟수 예산 (구간 비율만큼 비용 계산)
+    :param min_fraction: 첫 단계 데이터 비율 (None 이면 단계 수에 맞춰 자동 계산)
+    :param patience: 이 단계 수 동안 1위 조합이 바뀌지 않으면 남은 단계를 건너뛰고 전체 데이터로 확정
+    """
+    space = ParameterSpace(space)
+    evaluator = Evaluator(prices)
+    rng = np.random.default_rng(seed)
+
+    rounds = max(1, int(math.log(max(budget, eta), eta)))
+    if min_fraction is None:
+        min_fraction = eta ** -(rounds - 1)
+    # ✅ 단계마다 비용이 budget / rounds 가 되도록 첫 단계 조합 수 결정
+    count = max(eta, int(budget / rounds / min_fraction))
+    candidates = space.sample(rng, count)
+    fraction = min_fraction
+    leader, unchanged = None, 0
+
+    while True:
+        round_budget = budget - evaluator.cost
+        affordable = int(round_budget / fraction) if fraction else len(candidates)
+        candidates = candidates[:max(1, affordable)]
+        scored = sorted(((evaluator(params, fraction), i, params) for i, params in enumerate(candidates)),
+                        key=lambda item: (-item[0], item[1]))
+        top = scored[0][2]
+        unchanged = unchanged + 1 if top == leader else 0
+        leader = top
+
+        if fraction >= 1.0 or len(scored) == 1:
+            return _result(top, scored[0][0], evaluator, "halving")
+        if patience and unchanged >= patience:
+            return _result(top, evaluator(top, 1.0), evaluator, "halving")
+
+        keep = max(1, len(scored) // eta)
+        candidates = [params for _, _, params in scored[:keep]]
+        fraction = min(1.0, fraction * eta)
+        if evaluator.cost + len(candidates) * fraction > budget:
+            # ✅ 예산이 부족하면 남은 1위 조합만 전체 데이터로 확정
+            return _result(top, evaluator(top, 1.0), evaluator, "halving")
+
+
+def _gp_posterior(x_train, y_train, x_query, length_scale=0.25, noise=1e-4):
+    """ ✅ RBF 커널 가우시안 프로세스 평균 / 표준편차 (입력 [0, 1] 정규화, 출력 표준화) """
+    def kernel(a, b):
+        distance = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * distance / length_scale ** 2)
+
+    k_train = kernel(x_train, x_train) + noise * np.eye(len(x_train))
+    k_query = kernel(x_query, x_train)
+    cholesky = np.linalg.cholesky(k_train)
+    alpha = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, y_train))
+    mean = k_query @ alpha
+    v = np.linalg.solve(cholesky, k_query.T)
+    variance = np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None)
+    return mean, np.sqrt(variance)
+
+
+def _expected_improvement(mean, std, best, xi=0.01):
+    z = (mean - best - xi) / std
+    cdf = 0.5 * (1 + np.vectorize(math.erf)(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return (mean - best - xi) * cdf + std * pdf
+
+
+def bayesian_search(prices, space=None, budget=60, initial_points=10, candidates=512, patience=None, seed=None):
+    """
+    ✅ 베이지안 최적화 (가우시안 프로세스 + 기대 개선량)
+    :param budget: 최대 백테스트 횟수 (초기 무작위 평가 포함)
+    :param candidates: 매 단계 EI 를 계산할 무작위 후보 수
+    :param patience: 이 횟수 동안 최고 수익률이 갱신되지 않으면 종료
+    """
+    space = ParameterSpace(space)
+    evaluator = Evaluator(prices)
+    rng = np.random.default_rng(seed)
+    x_seen, y_seen, seen = [], [], set()
+    best_params, best_profit, stale = None, -math.inf, 0
+
+    def observe(params):
+        nonlocal best_params, best_profit, stale
+        profit = evaluator(params)
+        x_seen.append(space.encode(params))
+        y_seen.append(profit)
+        seen.add(to_config(params))
+        if profit > best_profit:
+            best_params, best_profit, stale = params, profit, 0
+        else:
+            stale += 1
+
+    for params in space.sample(rng, min(initial_points, budget)):
+        observe(params)
+
+    while evaluator.evaluations < budget and not (patience and stale >= patience):
+        y = np.array(y_seen)
+        scale = y.std() or 1.0
+        pool = [params for params in space.sample(rng, candidates) if to_config(params) not in seen]
+        if not pool:
+            break
+        x_pool = np.array([space.encode(params) for params in pool])
+        mean, std = _gp_posterior(np.array(x_seen), (y - y.mean()) / scale, x_pool)
+        improvement = _expected_improvement(mean, std, (best_profit - y.mean()) / scale)
+        observe(pool[int(np.argmax(improvement))])
+
+    return _result(best_params, best_profit, evaluator, "bayes")
+
+
+SEARCH_MODES = {
+    "random": random_search,
+    "halving": successive_halving,
+    "bayes": bayesian_search,
+}
+
+
+def search_strategy(prices, mode="bayes", **kwargs):
+    """ ✅ 모드 이름으로 탐색 실행 (random / halving / bayes) """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"❌ 지원하지 않는 탐색 모드: {mode} (사용 가능: {', '.join(SEARCH_MODES)})")
+    return SEARCH_MODES[mode](prices, **kwargs)
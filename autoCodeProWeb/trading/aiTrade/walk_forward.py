@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .backtest import run_backtest
+from .history_store import to_time64
+from .optimizer import price_rsi, price_macd
+from .resample import KST_OFFSET
+
+# ✅ 워크 포워드 최적화 (학습 구간에서 최적화 → 바로 다음 테스트 구간에서 검증, 구간을 밀면서 반복)
+#   - 테스트 구간 시작은 epoch 기준 캔들 번호가 step 의 배수인 시각에 고정
+#     → 최근 N개 캔들처럼 데이터 창이 밀려도 같은 시각의 구간은 경계가 같아 캐시를 재사용
+#   - 구간 결과는 (마켓, 캔들 단위, 구간 시각, 가격 해시, 탐색 설정) 키로 디스크에 저장 → 재실행 시 새 구간만 계산
+
+WALK_FORWARD_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "walk_forward")
+INTERVAL_MINUTES = {"days": 1440, "weeks": 10080}  # ✅ 월봉은 길이가 일정하지 않아 행 번호 기준 사용
+
+
+def candle_slots(times, interval):
+    """
+    ✅ 캔들 시각(KST) → epoch 기준 캔들 번호 (UTC 기준, 업비트 캔들 경계와 동일)
+    :return: 행별 캔들 번호 배열 (캔들 길이가 일정하지 않은 단위면 None)
+    """
+    interval = str(interval)
+    minutes = int(interval) if interval.isdigit() else INTERVAL_MINUTES.get(interval)
+    if minutes is None:
+        return None
+    utc = (to_time64(times) - KST_OFFSET).astype(np.int64)
+    return utc // (minutes * 60_000)
+
+
+def make_folds(count, train_size, test_size, step=None, slots=None):
+    """
+    ✅ 학습/테스트 구간 목록 [(학습 시작, 학습 끝, 테스트 끝)] (끝은 미포함, 테스트 시작 = 학습 끝)
+    :param step: 구간 이동 간격 (None 이면 test_size, 테스트 구간이 겹치지 않음)
+    :param slots: 행별 캔들 번호 (candle_slots 결과, None 이면 행 번호) - 구간 경계는 캔들 번호 기준,
+                  빠진 캔들(거래 없음)이 있으면 구간의 행 수가 그만큼 줄어듦
+    """
+    step = step or test_size
+    slots = np.arange(count) if slots is None else np.asarray(slots)
+    if not len(slots):
+        return []
+
+    first = -(-(int(slots[0]) + train_size) // step) * step  # ✅ 학습 구간을 채울 수 있는 첫 경계 (step 배수로 올림)
+    last = int(slots[-1]) + 1 - test_size  # ✅ 테스트 구간이 끝까지 채워지는 마지막 경계
+    folds = []
+    for boundary in range(first, last + 1, step):
+        start, train_end, end = np.searchsorted(slots, [boundary - train_size, boundary, boundary + test_size])
+        if start < train_end < end:
+            folds.append((int(start), int(train_end), int(end)))
+    return folds
+
+
+def fold_key(market, interval, times, prices, fold, options):
+    """ ✅ 구간 결과 캐시 키 (구간 시각 + 가격 해시 + 탐색 설정) """
+    start, train_end, end = fold
+    digest = hashlib.sha1(np.ascontiguousarray(prices[start:end]).tobytes()).hexdigest()
+    payload = json.dumps({
+        "market": market,
+        "interval": str(interval),
+        "range": [str(times[start]), str(times[train_end]), str(times[end - 1])],
+        "prices": digest,
+        "options": options,
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_cached(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # ✅ 깨진 캐시 파일은 다시 계산
+
+
+def _save_cached(cache_dir, key, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(temp_path, path)  # ✅ 중간에 종료돼도 반쯤 쓴 파일이 남지 않도록 교체
+
+
+def _as_config(config):
+    """ ✅ JSON 에서 읽은 리스트를 (rsi_range, macd_setting, stop_loss, take_profit) 튜플로 변환 """
+    rsi_range, macd_setting, stop_loss, take_profit = config
+    return tuple(rsi_range), tuple(macd_setting), stop_loss, take_profit
+
+
+def run_fold(prices, train_size, options):
+    """
+    ✅ 구간 1개: 학습 구간 최적화 → 테스트 구간 백테스트 (지표는 학습 구간부터 이어서 계산)
+    :param prices: 학습 + 테스트 구간 종가
+    """
+    from .aiTrading import optimize_strategy  # ✅ aiTrading 이 이 모듈을 불러오므로 순환 import 방지
+
+    train = pd.DataFrame({"trade_price": prices[:train_size]})
+    best_config, train_profit = optimize_strategy(train, workers=1, **options)
+    if best_config is None:
+        return {"config": None, "train_profit": None, "test_profit": 0.0, "test_trades": 0}
+
+    rsi_range, macd_setting, stop_loss, take_profit = best_config
+    rsi = price_rsi(prices)
+    macd, macd_signal = price_macd(prices, macd_setting)
+    test = run_backtest(prices[train_size:], rsi[train_size:], macd[train_size:], macd_signal[train_size:],
+                        rsi_range, stop_loss, take_profit)
+    return {
+        "config": best_config,
+        "train_profit": float(train_profit),
+        "test_profit": float(test["profit"]),
+        "test_trades": test["stats"]["trades"],
+    }
+
+
+def walk_forward(df, market, interval, train_size, test_size, step=None, workers=None,
+                 cache_dir=WALK_FORWARD_CACHE_DIR, **options):
+    """
+    ✅ 워크 포워드 최적화
+    :param df: 과거 → 최신 순서 캔들 (trade_price, time 컬럼)
+    :param train_size: 학습 구간 캔들 수
+    :param test_size: 테스트 구간 캔들 수
+    :param workers: 구간 병렬 처리 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스)
+    :param cache_dir: 구간 결과 저장 폴더 (None 이면 캐시 사용 안 함)
+    :param options: optimize_strategy 옵션 (mode, budget, patience, space, seed, rsi_ranges, ...)
+    :return: {"folds": 구간별 결과, "test_profit": 테스트 구간 누적 수익률(%), "cached": 캐시 사용 구간 수, ...}
+    """
+    prices = df["trade_price"].to_numpy(dtype=float)
+    times = df["time"].to_numpy() if "time" in df else np.arange(len(prices))
+    slots = candle_slots(times, interval) if "time" in df else None
+    folds = make_folds(len(prices), train_size, test_size, step, slots)
+
+    results = [None] * len(folds)
+    keys = [fold_key(market, interval, times, prices, fold, options) for fold in folds]
+    if cache_dir:
+        for i, key in enumerate(keys):
+            results[i] = _load_cached(cache_dir, key)
+    cached = sum(result is not None for result in results)
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    def finish(i, result):
+        results[i] = result
+        if cache_dir:
+            _save_cached(cache_dir, keys[i], result)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pending) <= 1:
+        for i in pending:
+            start, train_end, end = folds[i]
+            finish(i, run_fold(prices[start:end], train_end - start, options))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {
+                executor.submit(run_fold, prices[folds[i][0]:folds[i][2]], folds[i][1] - folds[i][0], options): i
+                for i in pending
+            }
+            for future, i in futures.items():
+                finish(i, future.result())
+
+    fold_results = []
+    for (start, train_end, end), result in zip(folds, results):
+        fold_results.append(dict(
+            result,
+            config=_as_config(result["config"]) if result["config"] else None,
+            train_start=str(times[start]),
+            test_start=str(times[train_end]),
+            test_end=str(times[end - 1]),
+        ))
+
+    growth = np.prod([1 + fold["test_profit"] / 100 for fold in fold_results]) if fold_results else 1.0
+    return {
+        "market": market,
+        "folds": fold_results,
+        "test_profit": float((growth - 1) * 100),  # ✅ 테스트 구간을 이어서 운용했을 때의 누적 수익률
+        "latest_config": fold_results[-1]["config"] if fold_results else None,  # ✅ 다음 구간에 적용할 설정
+        "cached": cached,
+        "computed": len(pending),
+    }
@@ -6,6 +6,10 @@ class TradingConfig(AppConfig):
     name = 'trading'
 
     def ready(self):
-        """ ✅ Django 서버 시작 시 시장 거래량 추적 스레드 실행 """
+        """ ✅ Django 서버 시작 시 마켓 목록 갱신 및 시장 거래량 추적 스레드 실행 """
         from .views import start_market_volume_tracking  # ✅ 여기에서 import 해야 함
+        from .utils import start_market_list_refresh, start_ticker_stream, USE_TICKER_STREAM
+        threading.Thread(target=start_market_list_refresh, daemon=True).start()
+        if USE_TICKER_STREAM:
+            threading.Thread(target=start_ticker_stream, daemon=True).start()
         threading.Thread(target=start_market_volume_tracking, daemon=True).start()
@@ -2,10 +2,16 @@
 import time
 from django.utils import timezone
 import threading
+import numpy as np
 import pandas as pd
 from .models import TradeRecord
 from django.db import transaction
-from .utils import get_krw_market_coin_info, upbit_order, get_orderbook, get_account_info, check_order_filled , get_combined_market_trend , get_candle_data
+from .utils import get_market_snapshot, upbit_order, get_orderbook, get_account_info, get_order_states , get_combined_market_trend , get_candle_data
+from .utils import start_order_stream, USE_ORDER_STREAM, USE_TICKER_STREAM, add_price_listener, remove_price_listener, get_live_price
+from .tick_scheduler import TickScheduler
+from django.conf import settings
+from .indicatorTrade.streaming import IndicatorEngine
+from .lstm_scorer import LSTMScorer
 from .indicatorTrade.indicators import calculate_atr,calculate_ema,calculate_stochastic,calculate_macd,calculate_rsi,calculate_bollinger_bands
 
 trade_logs = []  # ✅ 자동매매 로그 저장 리스트
@@ -37,24 +43,69 @@ last_candle_time = {}
 # ✅ 볼린저 밴드 값을 저장하는 캐시 (각 코인별)
 bollinger_band_cache = {}
 indicators_cache = {}
+ORDERBOOK_CACHE_TTL = getattr(settings, "ORDERBOOK_CACHE_TTL", 1.0)  # ✅ 호가 캐시 유효 시간 (요청 간격은 rate_limiter 가 조절)
+# ✅ "poll" 또는 "event" - event 는 웹소켓 시세(USE_TICKER_STREAM)가 있어야 틱 사이에도 반응
+#    (스트림이 없으면 가격 이벤트는 대시보드의 시세 조회 때만 발생 → 사실상 poll 과 같음)
+TRADING_ENGINE_MODE = getattr(settings, "TRADING_ENGINE_MODE", "poll")
+TRADING_TICK_INTERVAL = getattr(settings, "TRADING_TICK_INTERVAL", 1.0)  # ✅ 전체 점검 주기 (초)
+INDICATOR_RANKING = getattr(settings, "INDICATOR_RANKING", False)
+INDICATOR_MIN_HISTORY = 35  # ✅ MACD(26) + 시그널(9) 계산에 필요한 최소 틱 수
+indicator_engine = IndicatorEngine()  # ✅ 틱마다 전체 종목 현재가를 캔들 1개로 반영 (종목당 O(1) 갱신)
+LSTM_SCORING = getattr(settings, "LSTM_SCORING", False)
+LSTM_MIN_PROBABILITY = getattr(settings, "LSTM_MIN_PROBABILITY", 0.5)
+lstm_scorer = LSTMScorer(getattr(settings, "LSTM_MODEL_PATH", "lstm_model.h5"),
+                         getattr(settings, "LSTM_SCALER_PATH", "lstm_scaler.json"),
+                         num_threads=getattr(settings, "LSTM_INFERENCE_THREADS", 1))  # ✅ 처음 사용할 때 모델 로드
+
+
+def select_candidate_coins(coin_data, limit=10):
+    """ ✅ 매수 후보 선정 (전체 종목 지표 점수 순, 이력이 부족하면 전일 대비 상승률 순) """
+    markets = [coin["market"] for coin in coin_data]
+    if INDICATOR_RANKING and any(indicator_engine.count(m) >= INDICATOR_MIN_HISTORY for m in markets):
+        scores = indicator_engine.rank(markets, min_count=INDICATOR_MIN_HISTORY)
+        ranked = [i for i in np.argsort(-scores, kind="stable") if not np.isnan(scores[i])]
+        return [coin_data[i] for i in ranked[:limit]]
 
-
-def get_best_trade_coin():
-    """ ✅ 전일 대비 상승한 10개 종목 중에서 호가 정보를 기반으로 상위 5개 선정 """
-
-    coin_data = get_krw_market_coin_info()
-    if "error" in coin_data:
+    positive_coins = [coin for coin in coin_data if coin["signed_change_rate"] > 0]
+    return sorted(positive_coins, key=lambda x: x["signed_change_rate"], reverse=True)[:limit]
+
+
+def filter_lstm_candidates(coins):
+    """
+    ✅ LSTM 상승 확률 (후보 전체 한 번에 계산, 캔들 마감 전까지 캐시) → 기준 미만 종목 제외
+    scaler 가 있는 종목은 점수가 나올 때까지 제외 (계산 중/데이터 부족), scaler 가 없는 종목(학습하지 않은 종목)은 통과
+    """
+    scores = lstm_scorer.score([coin["market"] for coin in coins])
+    candidates = []
+    for coin in coins:
+        if coin["market"] in scores:
+            coin["lstm_score"] = scores[coin["market"]]
+            if coin["lstm_score"] >= LSTM_MIN_PROBABILITY:
+                candidates.append(coin)
+        elif coin["market"] not in lstm_scorer.scalers:
+            candidates.append(coin)
+    return candidates
+
+
+def get_best_trade_coin(coin_data=None):
+    """ ✅ 지표 점수(또는 상승률) 상위 10개 종목 중에서 호가 정보를 기반으로 상위 5개 선정 """
+
+    if coin_data is None:
+        coin_data = get_market_snapshot()
+    if not isinstance(coin_data, list):
         return None, []
 
-    # ✅ 전일 대비 상승률 기준 상위 10개 선정
-    positive_coins = [coin for coin in coin_data if coin["signed_change_rate"] > 0]
-    top_10_cur_coins = sorted(positive_coins, key=lambda x: x["signed_change_rate"], reverse=True)[:10]
+    # ✅ 전체 종목 지표 점수 기준 상위 10개 선정
+    top_10_cur_coins = select_candidate_coins(coin_data)
+
+    if LSTM_SCORING:
+        top_10_cur_coins = filter_lstm_candidates(top_10_cur_coins)
 
-    # ✅ 호가 데이터 한 번에 요청 후 캐싱 (429 방지)
+    # ✅ 호가 데이터 한 번에 요청 후 캐싱
     markets = [coin["market"] for coin in top_10_cur_coins]
     now = time.time()
 
-    fresh_markets = [m for m in markets if m not in orderbook_cache or (now - orderbook_cache[m]["timestamp"] > 5)]
+    fresh_markets = [m for m in markets if m not in orderbook_cache or (now - orderbook_cache[m]["timestamp"] > ORDERBOOK_CACHE_TTL)]
     if fresh_markets:
         new_orderbook_data = get_orderbook(fresh_markets)
         for market, data in new_orderbook_data.items():
@@ -101,6 +152,16 @@ class AutoTrader:
         self.failed_markets = set()
         self.failedTrade = 0
 
+        # ✅ 자동매매 루프 상태 (고정 주기 스케줄러 + 시세 이벤트 대기열)
+        self.scheduler = TickScheduler(TRADING_TICK_INTERVAL)
+        self.wake_event = threading.Event()
+        self.pending_lock = threading.Lock()
+        self.pending_markets = {}  # ✅ market → 이벤트 수신 시각
+        self.tick_context = None  # ✅ 최근 전체 점검의 시장 상황 / 잔고 (이벤트 재평가에 사용)
+        self.sold_since_tick = set()
+        self.event_stats = {"events": 0, "total_latency": 0.0, "max_latency": 0.0}
+        self.trade_thread = None
+
         # ✅ DB에서 기존 거래 불러오기 (프로그램 재시작 시 유지)
         active_trades = TradeRecord.objects.filter(is_active=True)
         for trade in active_trades:
@@ -154,18 +215,38 @@ class AutoTrader:
             if market in self.active_trades:
                 del self.active_trades[market]  # ✅ 메모리에서도 제거
 
+    def handle_order_event(self, order):
+        """ ✅ 개인 웹소켓 주문 이벤트 처리 (매도 체결 즉시 거래 종료) """
+        if order["side"] != "ask" or order["state"] != "done":
+            return
+        for market, trade_data in list(self.active_trades.items()):
+            if market == order["market"] or trade_data.get("uuid") == order["uuid"]:
+                self.log(f"✅ 매도 체결 완료 (실시간): {market}")
+                self.clear_trade(market)
+
     def _run_trading(self):
-        """ ✅ 쓰레드에서 실행할 자동매매 루프 """
-        try:
-            while self.is_active:
-                self.execute_trade()
-                time.sleep(1)  # ✅ 1초 간격으로 거래 실행
-        except Exception as e:
-            self.log(f"⚠️ 거래 중 오류 발생: {e}")
-            self.failedTrade += 1
-            while self.is_active and self.failedTrade < 3:
-                self.execute_trade()
-                time.sleep(1)
+        """
+        ✅ 쓰레드에서 실행할 자동매매 루프
+        - poll: 고정 주기(실행 시간 보정)로 전체 점검
+        - event: 시세가 바뀐 보유 종목을 즉시 재평가하고, 전체 점검은 고정 주기로 실행
+        """
+        while self.is_active:
+            try:
+                if TRADING_ENGINE_MODE == "event":
+                    if self.wake_event.wait(timeout=self.scheduler.time_until_next()):
+                        self.evaluate_pending_markets()
+                    if self.is_active and self.scheduler.is_due():
+                        self.scheduler.run(self.execute_trade)
+                else:
+                    self.scheduler.wait()
+                    if self.is_active:
+                        self.scheduler.run(self.execute_trade)
+            except Exception as e:
+                self.log(f"⚠️ 거래 중 오류 발생: {e}")
+                self.failedTrade += 1
+                if self.failedTrade >= 3:
+                    self.log("🛑 오류가 3회 발생하여 자동매매를 중지합니다.")
+                    self.is_active = False
 
     def start_trading(self):
         """ ✅ 자동매매 시작 (쓰레드 실행) """
@@ -177,6 +258,17 @@ class AutoTrader:
         self.failedTrade = 0
         self.log("🚀 자동매매 시작됨!")
 
+        # ✅ 주문 체결/잔고 실시간 수신 (폴링 대체)
+        if USE_ORDER_STREAM:
+            start_order_stream(on_order=self.handle_order_event)  # ✅ KRW 잔고는 utils.krw_balance 로 갱신
+
+        # ✅ 이벤트 모드: 시세 변경 시 보유 종목 즉시 재평가
+        self.scheduler = TickScheduler(TRADING_TICK_INTERVAL)
+        if TRADING_ENGINE_MODE == "event":
+            add_price_listener(self.on_price_update)
+            if not USE_TICKER_STREAM:
+                self.log("⚠️ 이벤트 모드지만 USE_TICKER_STREAM 이 꺼져 있음 → 보유 종목은 전체 점검 주기로만 평가됨")
+
         # ✅ 새로운 쓰레드를 생성하여 _run_trading 실행
         self.trade_thread = threading.Thread(target=self._run_trading, daemon=True)
         self.trade_thread.start()
@@ -189,6 +281,8 @@ class AutoTrader:
 
         self.is_active = False
         self.log("🛑 자동매매 중지됨!")
+        remove_price_listener(self.on_price_update)
+        self.wake_event.set()  # ✅ 이벤트 대기 중인 루프 깨우기
 
         if self.trade_thread and self.trade_thread.is_alive():
             self.trade_thread.join()  # ✅ 쓰레드가 안전하게 종료될 때까지 기다림
@@ -196,8 +290,17 @@ class AutoTrader:
     def execute_trade(self):
         """ ✅ 자동매매 실행 (변동성 리스크 관리 추가) """
 
+        self.sold_since_tick.clear()
         account_info = get_account_info()
-        market_trend = get_combined_market_trend()
+        # ✅ 이번 틱에서 공유할 시장 스냅샷 (1회 조회) - 보유 종목은 아래에서 모두 점검하므로 가격 이벤트는 보내지 않음
+        market_data = get_market_snapshot(notify=False)
+        if not isinstance(market_data, list):
+            self.log(f"⚠️ API 데이터 오류: {market_data}")
+            return
+        if INDICATOR_RANKING:
+            for coin in market_data:
+                indicator_engine.update(coin["market"], coin["trade_price"])  # ✅ 지표 순위 계산용 (틱당 캔들 1개)
+        market_trend = get_combined_market_trend(market_data)
         user_holdings = {item["currency"]: item for item in account_info}
 
         # ✅ 안전한 KRW 잔고 변환 (없으면 0으로 처리)
@@ -221,139 +324,26 @@ class AutoTrader:
                 self.active_trades.pop(market, None)  # ✅ 안전하게 삭제
 
 
-        # ✅ 변동성 필터링을 위한 데이터 가져오기
-        market_data = get_krw_market_coin_info()
-        if not isinstance(market_data, list):
-            self.log(f"⚠️ API 데이터 오류: {market_data}")
-            return
-
         # ✅ 변동성이 너무 큰 종목 필터링 (최근 5분 변동률 확인)
         volatility_data = {coin["market"]: abs(coin["signed_change_rate"]) for coin in market_data}
+        price_by_market = {coin["market"]: coin["trade_price"] for coin in market_data}  # ✅ 종목별 현재가 조회용
         high_volatility_markets = {market for market, vol in volatility_data.items() if vol > 0.05}  # ✅ 5% 이상 변동한 종목 제외
 
-        # ✅ 현재 보유 중인 코인에 대한 처리
-        for market, trade_data in list(self.active_trades.items()):
-            currency = market.replace("KRW-", "")
-            # ✅ 매도 주문 체결 확인
-            if "uuid" in trade_data and check_order_filled(trade_data["uuid"]):
-                self.log(f"✅ 매도 체결 완료: {market}")
-                self.clear_trade(market)
-                self.active_trades.pop(market, None)  # ✅ 안전하게 삭제
-                continue
-            # ✅ 현재 가격 확인
-            current_price = next((coin["trade_price"] for coin in market_data if coin["market"] == market), None)
-            if not current_price:
-                continue
-
-            buy_price = trade_data["buy_price"]
-
-            if trade_data["highest_price"] is None:
-                trade_data["highest_price"] = buy_price  # ✅ 매수가를 초기 최고점으로 설정
-                TradeRecord.objects.filter(market=market).update(highest_price=buy_price)
-
-            if current_price > trade_data["highest_price"]:
-                trade_data["highest_price"] = current_price  # ✅ 가격 상승 시만 최고점 갱신
-                TradeRecord.objects.filter(market=market).update(highest_price=current_price)  # ✅ DB 업데이트
-                self.log(f"📊 최고점 갱신: {market}, 최고점 = {trade_data['highest_price']:.8f}원")
-
-            # ✅ 수익률 계산
-            fee_rate = 0.0005  # 업비트 수수료
-            real_buy_price = buy_price * (1 + fee_rate)
-            real_sell_price = current_price * (1 - fee_rate)
-            profit_rate = ((real_sell_price - real_buy_price) / real_buy_price) * 100
-
-            if "created_at" in trade_data and trade_data["created_at"]:
-                holding_time = (timezone.now() - trade_data["created_at"]).total_seconds()
-            else:
-                holding_time = 0  # ✅ created_at이 없을 경우 기본값 0
-
-            self.log(f"📊 거래중인 코인 = {market} 현재 가격: {current_price:.8f}원 "
-                     f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                     f"수익률: {profit_rate:.2f}%)")
-
-            # ✅ 2% 목표 수익 도달 시 매도 (상승장일 경우 트레일링 스탑 유지)
-            if current_price >= buy_price * 1.01:
-                if market_trend == "bullish":
-                    self.log(f"🚀 상승장 감지! 트레일링 스탑 유지: {market}, 최고가 = {trade_data['highest_price']:.8f}원")
-                else:
-                    self.log(f"✅ {market_trend.upper()} 시장 감지 → 목표 수익률 도달 (1% 상승) → 즉시 매도: {market}, 가격: {current_price:.8f}원")
-                    getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                            f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                            f"수익률: {profit_rate:.2f}%)")
-                    sell_order = upbit_order(market, "ask", ord_type="market",
-                                             volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                    if "error" not in sell_order:
-                        trade_data["uuid"] = sell_order["uuid"]
-                    continue  # ✅ 즉시 매도되었으므로 트레일링 스탑을 실행할 필요 없음.
-
-            # ✅ 트레일링 스탑 발동 조건: 최소 +2% 수익 이상에서만 작동
-            if current_price >= buy_price * 1.02:  # 🔹 수익이 +2%를 초과한 경우
-                trade_data["highest_price"] = max(trade_data["highest_price"], current_price)
-                self.log(f"🚀 최고점 갱신: {market}, 최고점 = {trade_data['highest_price']:.8f}원")
-
-            # ✅ 트레일링 스탑 (-1%) 적용: 최소 2% 수익 이후부터 작동
-            if trade_data["highest_price"] >= buy_price * 1.02 and current_price <= trade_data["highest_price"] * 0.99:
-                self.log(f"🚀 트레일링 스탑 매도: {market}, 가격: {current_price:.8f}원")
-                getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                        f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                        f"수익률: {profit_rate:.2f}%)")
-                sell_order = upbit_order(market, "ask", ord_type="market",
-                                         volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                if "error" not in sell_order:
-                    trade_data["uuid"] = sell_order["uuid"]
-                continue
+        # ✅ 보유 종목의 주문 상태를 한 번에 조회 (포지션 수와 무관하게 요청 1회)
+        order_states = get_order_states([trade_data.get("uuid") for trade_data in self.active_trades.values()])
 
-            # ✅ 10분 보유 후 1% 수익 도달 시 매도 (보합장/하락장)
-            if market_trend in ["neutral", "bearish"] and holding_time > 600:
-                if current_price >= buy_price * 1.01:
-                    self.log(f"✅ 보합/하락장 감지 → 10분 보유 후 1% 수익 도달! 즉시 매도: {market}, 가격: {current_price:.8f}원")
-                    getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                            f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                            f"수익률: {profit_rate:.2f}%)")
-                    sell_order = upbit_order(market, "ask", ord_type="market",
-                                             volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                    if "error" not in sell_order:
-                        trade_data["uuid"] = sell_order["uuid"]
-                    continue
-                else:
-                    self.log(f"🚨 {market} : 10분 경과 BUT 1% 수익률 미달, 현재 수익률 {profit_rate:.2f}%")
-            # ✅ 5분 보유 후 1% 수익 도달 시 매도 (상승장)
-            elif market_trend == "bullish" and holding_time > 360:
-                if current_price >= buy_price * 1.01:
-                    self.log(f"✅ 상승장 감지 → 5분 보유 후 1% 수익 도달! 즉시 매도: {market}, 가격: {current_price:.8f}원")
-                    getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                                f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                                f"수익률: {profit_rate:.2f}%)")
-                    sell_order = upbit_order(market, "ask", ord_type="market",
-                                                 volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                    if "error" not in sell_order:
-                        trade_data["uuid"] = sell_order["uuid"]
-                    continue
-                else:
-                    self.log(f"🚨 {market} : 5분 경과 BUT 1% 수익률 미달, 현재 수익률 {profit_rate:.2f}%")
-
-            # ✅ 변동성 기반 손절 설정
-            volatility_factor = 0.96 if market in high_volatility_markets else 0.98
-            if current_price <= buy_price * volatility_factor:
-                self.log(f"🛑 변동성 리스크 반영 손절 ({100 - volatility_factor * 100:.1f}% 하락): {market}, 가격: {current_price:.8f}원")
-                getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                        f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                        f"수익률: {profit_rate:.2f}%)")
-                sell_order = upbit_order(market, "ask", ord_type="market", volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                if "error" not in sell_order:
-                    trade_data["uuid"] = sell_order["uuid"]
-                continue
+        self.tick_context = {
+            "market_trend": market_trend,
+            "user_holdings": user_holdings,
+            "high_volatility_markets": high_volatility_markets,
+        }
 
-            # ✅ 추가적인 -2% 손절 로직 (변동성 손절과 별도로 적용)
-            if current_price <= buy_price * 0.98:
-                self.log(f"🛑 -2% 손절 기준 도달 → 즉시 매도: {market}, 가격: {current_price:.8f}원")
-                getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
-                                        f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
-                                        f"수익률: {profit_rate:.2f}%)")
-                sell_order = upbit_order(market, "ask", ord_type="market", volume=str(user_holdings.get(currency, {}).get("balance", 0)))
-                if "error" not in sell_order:
-                    trade_data["uuid"] = sell_order["uuid"]
-                continue
+        # ✅ 현재 보유 중인 코인에 대한 처리
+        for market, trade_data in list(self.active_trades.items()):
+            if market not in self.active_trades:
+                continue  # ✅ 실시간 체결 이벤트로 이미 정리된 거래
+            self.evaluate_position(market, trade_data, price_by_market.get(market), market_trend, user_holdings,
+                                   high_volatility_markets, order_states)
 
         # ✅ 매도 후 종목이 하나도 없을 경우 새로운 매수 진행
         if len(self.active_trades) == 0 and self.is_active:
@@ -366,7 +356,7 @@ class AutoTrader:
 
         # ✅ 새로운 매수 진행 (변동성 높은 종목 제외)
         if self.is_active:
-            best_coin, top_coins = get_best_trade_coin()
+            best_coin, top_coins = get_best_trade_coin(market_data)
             if not best_coin or best_coin["market"] in active_markets or best_coin["market"] in high_volatility_markets:
                 self.log("❌ 매수할 적절한 종목 없음 (변동성 초과 종목 제외)")
                 return
@@ -384,3 +374,145 @@ class AutoTrader:
                 self.save_trade(market, best_coin["trade_price"], buy_order["uuid"],self.budget)
             else :
                 self.log(f"❌ 매수 실패: {market}, {str(buy_order)}")
+
+    def evaluate_position(self, market, trade_data, current_price, market_trend, user_holdings,
+                          high_volatility_markets, order_states, log_status=True):
+        """ ✅ 보유 종목 1개에 대한 체결 확인 / 익절 / 트레일링 스탑 / 손절 판단 """
+        # ✅ 매도 주문 체결 확인
+        if "uuid" in trade_data and order_states.get(trade_data["uuid"], {}).get("state") == "done":
+            self.log(f"✅ 매도 체결 완료: {market}")
+            self.clear_trade(market)
+            self.active_trades.pop(market, None)  # ✅ 안전하게 삭제
+            return
+        if not current_price:
+            return
+
+        buy_price = trade_data["buy_price"]
+
+        if trade_data["highest_price"] is None:
+            trade_data["highest_price"] = buy_price  # ✅ 매수가를 초기 최고점으로 설정
+            TradeRecord.objects.filter(market=market).update(highest_price=buy_price)
+
+        if current_price > trade_data["highest_price"]:
+            trade_data["highest_price"] = current_price  # ✅ 가격 상승 시만 최고점 갱신
+            TradeRecord.objects.filter(market=market).update(highest_price=current_price)  # ✅ DB 업데이트
+            self.log(f"📊 최고점 갱신: {market}, 최고점 = {trade_data['highest_price']:.8f}원")
+
+        # ✅ 수익률 계산
+        fee_rate = 0.0005  # 업비트 수수료
+        real_buy_price = buy_price * (1 + fee_rate)
+        real_sell_price = current_price * (1 - fee_rate)
+        profit_rate = ((real_sell_price - real_buy_price) / real_buy_price) * 100
+
+        if "created_at" in trade_data and trade_data["created_at"]:
+            holding_time = (timezone.now() - trade_data["created_at"]).total_seconds()
+        else:
+            holding_time = 0  # ✅ created_at이 없을 경우 기본값 0
+
+        if log_status:
+            self.log(f"📊 거래중인 코인 = {market} 현재 가격: {current_price:.8f}원 "
+                     f"(매수가: {buy_price:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
+                     f"수익률: {profit_rate:.2f}%)")
+
+        # ✅ 2% 목표 수익 도달 시 매도 (상승장일 경우 트레일링 스탑 유지)
+        if current_price >= buy_price * 1.01:
+            if market_trend == "bullish":
+                self.log(f"🚀 상승장 감지! 트레일링 스탑 유지: {market}, 최고가 = {trade_data['highest_price']:.8f}원")
+            else:
+                self.log(f"✅ {market_trend.upper()} 시장 감지 → 목표 수익률 도달 (1% 상승) → 즉시 매도: {market}, 가격: {current_price:.8f}원")
+                self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+                return  # ✅ 즉시 매도되었으므로 트레일링 스탑을 실행할 필요 없음.
+
+        # ✅ 트레일링 스탑 발동 조건: 최소 +2% 수익 이상에서만 작동
+        if current_price >= buy_price * 1.02:  # 🔹 수익이 +2%를 초과한 경우
+            trade_data["highest_price"] = max(trade_data["highest_price"], current_price)
+            self.log(f"🚀 최고점 갱신: {market}, 최고점 = {trade_data['highest_price']:.8f}원")
+
+        # ✅ 트레일링 스탑 (-1%) 적용: 최소 2% 수익 이후부터 작동
+        if trade_data["highest_price"] >= buy_price * 1.02 and current_price <= trade_data["highest_price"] * 0.99:
+            self.log(f"🚀 트레일링 스탑 매도: {market}, 가격: {current_price:.8f}원")
+            self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+            return
+
+        # ✅ 10분 보유 후 1% 수익 도달 시 매도 (보합장/하락장)
+        if market_trend in ["neutral", "bearish"] and holding_time > 600:
+            if current_price >= buy_price * 1.01:
+                self.log(f"✅ 보합/하락장 감지 → 10분 보유 후 1% 수익 도달! 즉시 매도: {market}, 가격: {current_price:.8f}원")
+                self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+                return
+            else:
+                self.log(f"🚨 {market} : 10분 경과 BUT 1% 수익률 미달, 현재 수익률 {profit_rate:.2f}%")
+        # ✅ 5분 보유 후 1% 수익 도달 시 매도 (상승장)
+        elif market_trend == "bullish" and holding_time > 360:
+            if current_price >= buy_price * 1.01:
+                self.log(f"✅ 상승장 감지 → 5분 보유 후 1% 수익 도달! 즉시 매도: {market}, 가격: {current_price:.8f}원")
+                self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+                return
+            else:
+                self.log(f"🚨 {market} : 5분 경과 BUT 1% 수익률 미달, 현재 수익률 {profit_rate:.2f}%")
+
+        # ✅ 변동성 기반 손절 설정
+        volatility_factor = 0.96 if market in high_volatility_markets else 0.98
+        if current_price <= buy_price * volatility_factor:
+            self.log(f"🛑 변동성 리스크 반영 손절 ({100 - volatility_factor * 100:.1f}% 하락): {market}, 가격: {current_price:.8f}원")
+            self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+            return
+
+        # ✅ 추가적인 -2% 손절 로직 (변동성 손절과 별도로 적용)
+        if current_price <= buy_price * 0.98:
+            self.log(f"🛑 -2% 손절 기준 도달 → 즉시 매도: {market}, 가격: {current_price:.8f}원")
+            self._sell_position(market, trade_data, current_price, profit_rate, user_holdings)
+            return
+
+    def _sell_position(self, market, trade_data, current_price, profit_rate, user_holdings):
+        """ ✅ 보유 수량 전량 시장가 매도 """
+        currency = market.replace("KRW-", "")
+        getRecntTradeLog.append(f"📊 매도체결된 코인 = {market} 현재 가격: {current_price:.8f}원 ,"
+                                f"(매수가: {trade_data['buy_price']:.8f}원, 최고점: {trade_data['highest_price']:.8f}원, "
+                                f"수익률: {profit_rate:.2f}%)")
+        sell_order = upbit_order(market, "ask", ord_type="market",
+                                 volume=str(user_holdings.get(currency, {}).get("balance", 0)))
+        self.sold_since_tick.add(market)  # ✅ 다음 전체 점검 전까지 이벤트로 중복 매도하지 않음
+        if "error" not in sell_order:
+            trade_data["uuid"] = sell_order["uuid"]
+
+    def on_price_update(self, market):
+        """ ✅ 시세 변경 알림 (웹소켓 스트림 / REST 폴링) → 보유 종목이면 즉시 재평가 대상에 추가 """
+        if market not in self.active_trades:
+            return
+        with self.pending_lock:
+            self.pending_markets.setdefault(market, time.monotonic())
+        self.wake_event.set()
+
+    def evaluate_pending_markets(self):
+        """ ✅ 시세가 바뀐 보유 종목만 재평가 (최근 전체 점검의 시장 상황 / 잔고 재사용) """
+        self.wake_event.clear()
+        with self.pending_lock:
+            pending, self.pending_markets = self.pending_markets, {}
+
+        context = self.tick_context
+        if context is None:
+            return
+
+        for market, queued_at in pending.items():
+            trade_data = self.active_trades.get(market)
+            if trade_data is None or market in self.sold_since_tick:
+                continue
+            self.evaluate_position(market, trade_data, get_live_price(market), context["market_trend"],
+                                   context["user_holdings"], context["high_volatility_markets"], {},
+                                   log_status=False)
+            latency = time.monotonic() - queued_at
+            self.event_stats["events"] += 1
+            self.event_stats["total_latency"] += latency
+            self.event_stats["max_latency"] = max(self.event_stats["max_latency"], latency)
+
+    def get_engine_stats(self):
+        """ ✅ 자동매매 루프 통계 (틱 지연/초과 횟수, 이벤트 반응 시간) """
+        events = self.event_stats["events"]
+        return {
+            "mode": TRADING_ENGINE_MODE,
+            "tick": self.scheduler.get_stats(),
+            "events": events,
+            "event_avg_latency": round(self.event_stats["total_latency"] / events, 4) if events else 0.0,
+            "event_max_latency": round(self.event_stats["max_latency"], 4),
+        }
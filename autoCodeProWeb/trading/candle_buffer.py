@@ -0,0 +1,136 @@
+# trading/candle_buffer.py
+import math
+import threading
+import time
+
+import numpy as np
+
+CANDLE_FIELDS = ("open", "high", "low", "close", "volume")
+MAX_CANDLES_PER_REQUEST = 200  # ✅ 업비트 캔들 API 한 번에 조회 가능한 최대 개수
+
+
+def parse_candle_time(candle_date_time_utc):
+    """ ✅ 업비트 candle_date_time_utc ("2024-01-01T00:00:00") → epoch 밀리초 """
+    return int(np.datetime64(candle_date_time_utc, "ms").astype(np.int64))
+
+
+class CandleRingBuffer:
+    """
+    ✅ 고정 크기 OHLCV 링 버퍼 (NumPy 배열)
+    값을 두 번 기록(i, i + capacity)해 두어 최근 N개를 항상 연속된 구간으로 조회 → 복사 없이 view 반환
+    """
+
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.timestamps = np.zeros(capacity * 2, dtype=np.int64)
+        self.values = np.full((len(CANDLE_FIELDS), capacity * 2), np.nan)
+        self.start = 0  # ✅ 가장 오래된 캔들 위치
+        self.size = 0
+
+    @property
+    def last_timestamp(self):
+        """ ✅ 마지막 캔들 시작 시각 (epoch 밀리초, 비어 있으면 None) """
+        if not self.size:
+            return None
+        return int(self.timestamps[self.start + self.size - 1])
+
+    def _write(self, position, timestamp, row):
+        for slot in (position, position + self.capacity):
+            self.timestamps[slot] = timestamp
+            self.values[:, slot] = row
+
+    def append(self, timestamp, row):
+        """
+        ✅ 캔들 1개 반영 (오래된 캔들 → 최신 캔들 순서로 호출)
+        :param row: (open, high, low, close, volume)
+        :return: 추가/갱신 여부 (마지막보다 오래된 캔들은 무시)
+        """
+        with self.lock:
+            last = self.last_timestamp
+            if last is not None and timestamp < last:
+                return False
+            if last is not None and timestamp == last:
+                self._write((self.start + self.size - 1) % self.capacity, timestamp, row)  # ✅ 진행 중이던 캔들 갱신
+                return True
+
+            if self.size < self.capacity:
+                position = (self.start + self.size) % self.capacity
+                self.size += 1
+            else:
+                position = self.start
+                self.start = (self.start + 1) % self.capacity
+            self._write(position, timestamp, row)
+            return True
+
+    def view(self, count=None):
+        """ ✅ 최근 count 개 캔들 (timestamps, values) - 복사 없는 읽기 전용 view (다음 갱신 전까지 유효) """
+        with self.lock:
+            count = self.size if count is None else min(count, self.size)
+            end = self.start + self.size
+            timestamps = self.timestamps[end - count:end]
+            values = self.values[:, end - count:end]
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        return timestamps, values
+
+    def columns(self, count=None):
+        """ ✅ {"open": ..., "close": ...} 형태의 view """
+        _, values = self.view(count)
+        return {field: values[i] for i, field in enumerate(CANDLE_FIELDS)}
+
+
+class CandleStore:
+    """ ✅ 종목별 캔들 링 버퍼 + 증분 조회 (마지막으로 저장한 캔들 이후 것만 요청) """
+
+    def __init__(self, fetch, unit_seconds=1, capacity=200):
+        """
+        :param fetch: (market, count) → 업비트 캔들 응답 리스트 (최신 캔들 먼저)
+        :param unit_seconds: 캔들 단위 (초), 필요한 요청 개수 추정에 사용
+        """
+        self.fetch = fetch
+        self.unit_seconds = unit_seconds
+        self.capacity = capacity
+        self.buffers = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "candles_received": 0}
+
+    def buffer(self, market):
+        with self.lock:
+            buffer = self.buffers.get(market)
+            if buffer is None:
+                buffer = CandleRingBuffer(self.capacity)
+                self.buffers[market] = buffer
+            return buffer
+
+    def missing_count(self, buffer, now=None):
+        """ ✅ 마지막 캔들(진행 중이었을 수 있음)부터 현재까지 필요한 캔들 개수 """
+        last = buffer.last_timestamp
+        if last is None:
+            return min(self.capacity, MAX_CANDLES_PER_REQUEST)
+        now = time.time() if now is None else now
+        elapsed = max(now - last / 1000, 0)
+        return max(1, min(math.ceil(elapsed / self.unit_seconds) + 1, self.capacity, MAX_CANDLES_PER_REQUEST))
+
+    def update(self, market):
+        """ ✅ 새 캔들만 받아서 버퍼에 반영 → 추가/갱신된 캔들 수 (요청 실패 시 None) """
+        buffer = self.buffer(market)
+        candles = self.fetch(market, self.missing_count(buffer))
+        if candles is None:
+            return None
+
+        self.stats["requests"] += 1
+        self.stats["candles_received"] += len(candles)
+        changed = 0
+        for candle in reversed(candles):  # ✅ 응답은 최신 캔들이 먼저
+            row = (candle["opening_price"], candle["high_price"], candle["low_price"], candle["trade_price"],
+                   candle["candle_acc_trade_volume"])
+            if buffer.append(parse_candle_time(candle["candle_date_time_utc"]), row):
+                changed += 1
+        return changed
+
+    def get(self, market, count=None, refresh=True):
+        """ ✅ 최근 count 개 캔들 컬럼 view (refresh=True 이면 새 캔들 먼저 반영) """
+        if refresh:
+            self.update(market)
+        return self.buffer(market).columns(count)
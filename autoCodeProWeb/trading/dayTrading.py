@@ -1,89 +1,144 @@
-import pandas as pd
-import numpy as np
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras.layers import LSTM, Dense, Dropout
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
 import matplotlib.pyplot as plt
 from sklearn.metrics import roc_curve, auc, precision_recall_curve
+import os
 import shutil
 
-
-def dayTradingView():
-    # ✅ 데이터 불러오기
+from .aiTrade.history_store import HistoryStore, import_csv
+from .aiTrade.resample import history_store
+from .aiTrade.lstm_dataset import MultiWindowDataset
+from .aiTrade.lstm_features import FeatureFile, time_split, scaler_to_dict
+from .aiTrade.lstm_export import export_lite
+from .aiTrade.lstm_registry import save_version, version_dir, promote
+
+
+# ✅ CPU 쓰레드 설정 (0 이면 TensorFlow 기본값 = CPU 코어 수)
+LSTM_INTRA_OP_THREADS = int(os.environ.get("LSTM_INTRA_OP_THREADS", 0))  # 연산 1개 내부 병렬 쓰레드 수
+LSTM_INTER_OP_THREADS = int(os.environ.get("LSTM_INTER_OP_THREADS", 0))  # 동시에 실행할 연산 수
+MODEL_PATH = "lstm_model.h5"
+LITE_MODEL_PATH = "lstm_model.tflite"
+SCALER_PATH = "lstm_scaler.json"
+
+
+def configure_threads(intra_op_threads=LSTM_INTRA_OP_THREADS, inter_op_threads=LSTM_INTER_OP_THREADS):
+    """ ✅ TensorFlow CPU 쓰레드 수 설정 (TensorFlow 연산을 실행하기 전에 호출해야 적용됨) """
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def dayTradingView(markets="KRW-BTC", interval="15", csv_path=None, start=None, end=None, time_steps=60,
+                   validation_split=0.2, batch_size=128, epochs=10, model_params=None, lite_quantize=None,
+                   intra_op_threads=LSTM_INTRA_OP_THREADS, inter_op_threads=LSTM_INTER_OP_THREADS):
+    """
+    ✅ LSTM 학습 (디스크 특성 파일 → 배치 단위 스트리밍, 전체 데이터를 메모리에 올리지 않음)
+    :param markets: 학습할 종목 (여러 개면 종목별 특성/scaler 로 한 모델 학습)
+    :param csv_path: 예전 CSV 파일 (종목 1개이고 저장소에 아직 없으면 한 번만 변환)
+    :param start, end: 학습 구간 (None 이면 전체)
+    :param validation_split: 종목별 마지막 구간 비율 (시간 순서 분할, 검증 구간이 학습 구간보다 항상 뒤)
+    :param model_params: 모델 구조/학습률 (build_lstm_model 옵션, lstm_search 결과의 best["model_params"])
+    :param lite_quantize: 경량 추론 모델(.tflite) 양자화 (None / "float16" / "int8")
+    """
+    configure_threads(intra_op_threads, inter_op_threads)
     tf.config.optimizer.set_jit(True)  # XLA (Accelerated Linear Algebra) 활성화
-    save_path = "/Users/hongbookpro/Downloads/KRW-BTC_15m_data.csv"
-    df = pd.read_csv(save_path)
-
-    # ✅ 결측값 제거
-    df = df.dropna()
-
-    # ✅ 이상치 제거 (고가가 저가보다 낮은 경우)
-    df = df[(df["high_price"] >= df["low_price"]) & (df["trade_price"] > 0)]
-
-    # ✅ 기술적 지표 추가 (RSI, MACD 적용)
-    df = calculate_rsi(df)
-    df = calculate_macd(df)
-
-    # ✅ 데이터 정규화 (Min-Max Scaling)
-    scaler = MinMaxScaler(feature_range=(0,1))
-    scaled_features = ["opening_price", "high_price", "low_price", "trade_price", "candle_acc_trade_volume", "rsi", "macd", "macd_signal"]
-    df[scaled_features] = scaler.fit_transform(df[scaled_features])
-
-    # ✅ 타겟 변수 생성 (다음 캔들 가격 상승 여부)
-    df["target"] = (df["trade_price"].shift(-1) > df["trade_price"]).astype(int)
-    df = df.dropna()
-
-    # ✅ 데이터셋 준비 (LSTM 입력 형식 변환)
-    X, y = prepare_lstm_data(df, scaled_features, time_steps=60)
-
-    # ✅ 학습/테스트 데이터 분할
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    markets = [markets] if isinstance(markets, str) else list(markets)
+
+    train_sets, validation_sets, scalers, data_ranges = [], [], {}, {}
+    for market in markets:
+        # ✅ 데이터 불러오기 (컬럼 저장소, 1분봉이 있으면 interval 분봉으로 변환해 사용)
+        if csv_path and len(markets) == 1 and not len(HistoryStore(market, interval)) \
+                and not len(HistoryStore(market, "1")):
+            import_csv(csv_path, market, interval)
+        store = history_store(market, interval)
+        if not len(store):
+            print(f"❌ {market} {interval} 저장된 캔들 없음 (fetch_all_data 또는 import_csv 로 먼저 저장)")
+            continue
+
+        # ✅ 결측값/이상치 제거 + 기술적 지표(RSI, MACD) + 타겟(다음 캔들 상승 여부) → 특성 파일 (새 캔들만 추가 계산)
+        feature_file = FeatureFile(market, interval).update(store)
+
+        # ✅ 시간 순서 학습/검증 분할 + 정규화(Min-Max, 학습 구간만 한 번 순회해 계산, 배치마다 적용)
+        train_data, validation_data, scaler = time_split(feature_file, time_steps, validation_split, start, end,
+                                                         batch_size)
+        train_sets.append(train_data)
+        validation_sets.append(validation_data)
+        scalers[market] = scaler_to_dict(scaler)
+        data_ranges[market] = sample_range(feature_file, train_data, validation_data)
+
+    if not train_sets:
+        return None
+    train_data = train_sets[0] if len(train_sets) == 1 else MultiWindowDataset(train_sets, shuffle=True)
+    test_data = validation_sets[0] if len(validation_sets) == 1 else MultiWindowDataset(validation_sets)
 
     # ✅ LSTM 모델 학습
-    model = train_lstm_model(X_train, y_train, X_test, y_test)
+    model = train_lstm_model(train_data, test_data, epochs, **(model_params or {}))
 
     # ✅ 모델 평가 (ROC Curve & AUC)
-    RocAndAuc(model, X_test, y_test)
-
-    model.save("lstm_model.h5")
-    shutil.make_archive("lstm_model", 'zip', ".", "/Users/hongbookpro/Downloads/lstm_model.h5")
-
-def prepare_lstm_data(df, features, time_steps=60):
-    """ LSTM 모델 입력 데이터 생성 """
-    X, y = [], []
-    for i in range(len(df) - time_steps):
-        X.append(df[features].iloc[i:i+time_steps].values)  # 60개 데이터 입력
-        y.append(df["target"].iloc[i+time_steps])           # 1개 데이터 예측값
+    RocAndAuc(model, test_data)
+
+    # ✅ 버전 저장 (학습/검증 데이터 구간 기록) → 경량 추론 모델 변환 (검증 배치로 Keras 출력과 비교) → 배포
+    scaler_meta = {"interval": str(interval), "time_steps": time_steps, "markets": scalers}
+    version = save_version(model, scaler_meta, {"parent": None, "mode": "full", "markets": data_ranges,
+                                                "epochs": epochs, "model_params": model_params or {},
+                                                "lite_quantize": lite_quantize})
+    export_lite(model, os.path.join(version_dir(version), "model.tflite"), quantize=lite_quantize,
+                samples=next(test_data.batches())[0], representative=train_data)
+    promote(version, MODEL_PATH, SCALER_PATH, LITE_MODEL_PATH)
+    shutil.make_archive("lstm_model", 'zip', ".", MODEL_PATH)
+    return model
 
-    return np.array(X), np.array(y)
 
-def train_lstm_model(X_train, y_train, X_test, y_test):
-    """ LSTM 모델 학습 """
-    model = keras.Sequential([
-        LSTM(32, return_sequences=True, input_shape=(X_train.shape[1], X_train.shape[2])),
-        Dropout(0.2),
-        LSTM(32, return_sequences=False),
-        Dropout(0.2),
-        Dense(25),
-        Dense(1, activation="sigmoid")  # 0~1 확률 예측
-    ])
+def sample_range(feature_file, train_data, validation_data):
+    """ ✅ 학습/검증 샘플의 정답 캔들 시각 구간 (버전 기록 / 재학습 시작점) """
+    times = feature_file.times
+    label_time = lambda index: str(times[int(index) + train_data.time_steps])
+    return {
+        "train_start": label_time(train_data.indices[0]),
+        "train_end": label_time(train_data.indices[-1]),
+        "validation_start": label_time(validation_data.indices[0]),
+        "validation_end": label_time(validation_data.indices[-1]),
+    }
+
+def build_lstm_model(input_shape, units=32, layers=2, dropout=0.2, dense_units=25, learning_rate=None):
+    """
+    ✅ LSTM 모델 생성 (기본값 = 기존 구조: LSTM(32) ×2 + Dropout(0.2) + Dense(25))
+    :param layers: LSTM 층 수
+    :param dense_units: 출력층 앞 Dense 크기 (0 이면 없음)
+    :param learning_rate: Adam 학습률 (None 이면 Keras 기본값)
+    """
+    model = keras.Sequential([keras.Input(shape=input_shape)])
+    for layer in range(layers):
+        model.add(LSTM(units, return_sequences=layer < layers - 1))
+        model.add(Dropout(dropout))
+    if dense_units:
+        model.add(Dense(dense_units))
+    model.add(Dense(1, activation="sigmoid"))  # 0~1 확률 예측
+
+    optimizer = "adam" if learning_rate is None else keras.optimizers.Adam(learning_rate=learning_rate)
+    model.compile(optimizer=optimizer, loss="binary_crossentropy", metrics=["accuracy"])
+    return model
 
-    model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+def train_lstm_model(train_data, test_data, epochs=10, verbose=1, **model_params):
+    """
+    LSTM 모델 학습 (train_data, test_data: WindowDataset / MultiWindowDataset)
+    :param model_params: build_lstm_model 옵션 (units, layers, dropout, dense_units, learning_rate)
+    """
+    model = build_lstm_model(train_data.input_shape, **model_params)
 
-    # ✅ 모델 학습
-    model.fit(X_train, y_train, epochs=10, chch_size=128, vervose=1,validation_data=(X_test, y_test))
+    # ✅ 모델 학습 (배치 크기는 WindowDataset.batch_size)
+    model.fit(train_data.to_tf(), epochs=epochs, verbose=verbose, validation_data=test_data.to_tf())
 
     # ✅ 정확도 평가
-    loss, accuracy = model.evaluate(X_test, y_test)
+    loss, accuracy = model.evaluate(test_data.to_tf(), verbose=verbose)
     print(f"🎯 LSTM 모델 정확도: {accuracy:.2f}")
 
     return model
 
-def RocAndAuc(model, X_test, y_test):
-    """ 📌 ROC Curve & Precision-Recall Curve 분석 """
-    y_probs = model.predict(X_test)
+def RocAndAuc(model, test_data):
+    """ 📌 ROC Curve & Precision-Recall Curve 분석 (test_data: 셔플 없는 WindowDataset / MultiWindowDataset) """
+    y_probs = model.predict(test_data.to_tf()).ravel()
+    y_test = test_data.labels()
 
     # ROC Curve 계산
     fpr, tpr, _ = roc_curve(y_test, y_probs)
@@ -132,4 +187,5 @@ def calculate_macd(df, short=12, long=26, signal=9):
     return df
 
 if __name__ == "__main__":
+    # ✅ 실행: python -m trading.dayTrading (패키지 상대 import 사용 → 파일 경로로 직접 실행 불가)
     dayTradingView()
@@ -0,0 +1,335 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# 🎯 실시간 지표 엔진 (캔들/틱 1개당 O(1) 갱신, indicators.py 의 배치 계산과 같은 값)
+#   - update(): 마감된 캔들 반영 (상태 변경)
+#   - peek(): 진행 중인 캔들(틱) 가격으로 계산만 하고 상태는 그대로 유지
+
+RESYNC_INTERVAL = 1000  # 🎯 누적 합계의 부동소수점 오차를 막기 위해 주기적으로 창 전체를 다시 합산
+
+
+class RollingMean:
+    """ 🎯 고정 길이 이동평균 (pandas rolling(window).mean() 과 동일, 창이 차기 전에는 NaN) """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.nan_count = 0
+        self.updates = 0
+
+    def _value(self, total, count, nan_count):
+        if count < self.period or nan_count:
+            return math.nan
+        return total / self.period
+
+    def _without_oldest(self):
+        if len(self.window) < self.period:
+            return self.total, len(self.window), self.nan_count
+        oldest = self.window[0]
+        if math.isnan(oldest):
+            return self.total, self.period - 1, self.nan_count - 1
+        return self.total - oldest, self.period - 1, self.nan_count
+
+    def update(self, x):
+        total, count, nan_count = self._without_oldest()
+        if len(self.window) == self.period:
+            self.window.popleft()
+        self.window.append(x)
+        if math.isnan(x):
+            nan_count += 1
+        else:
+            total += x
+        self.total, self.nan_count = total, nan_count
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.total = math.fsum(v for v in self.window if not math.isnan(v))
+        return self._value(self.total, count + 1, self.nan_count)
+
+    def peek(self, x):
+        total, count, nan_count = self._without_oldest()
+        if math.isnan(x):
+            nan_count += 1
+        else:
+            total += x
+        return self._value(total, count + 1, nan_count)
+
+
+class RollingStd:
+    """ 🎯 고정 길이 이동 표준편차 (pandas rolling(window).std(), ddof=1) - 기준값을 뺀 합계로 오차 최소화 """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def _stats(self, total, total_sq, count):
+        if count < self.period:
+            return math.nan, math.nan
+        mean = total / count
+        variance = max((total_sq - total * mean) / (count - 1), 0.0)
+        return mean + self.shift, math.sqrt(variance)
+
+    def _without_oldest(self):
+        if len(self.window) < self.period:
+            return self.total, self.total_sq, len(self.window)
+        oldest = self.window[0] - self.shift
+        return self.total - oldest, self.total_sq - oldest * oldest, self.period - 1
+
+    def _resync(self):
+        self.shift = sum(self.window) / len(self.window)
+        deviations = [v - self.shift for v in self.window]
+        self.total = math.fsum(deviations)
+        self.total_sq = math.fsum(d * d for d in deviations)
+
+    def update(self, x):
+        if self.shift is None:
+            self.shift = x
+        total, total_sq, count = self._without_oldest()
+        if len(self.window) == self.period:
+            self.window.popleft()
+        self.window.append(x)
+        d = x - self.shift
+        self.total, self.total_sq = total + d, total_sq + d * d
+
+        self.updates += 1
+        if self.updates % self.period == 0 or self.updates % RESYNC_INTERVAL == 0:
+            self._resync()
+        return self._stats(self.total, self.total_sq, count + 1)
+
+    def peek(self, x):
+        if self.shift is None:
+            return math.nan, math.nan
+        total, total_sq, count = self._without_oldest()
+        d = x - self.shift
+        return self._stats(total + d, total_sq + d * d, count + 1)
+
+
+class EMA:
+    """ 🎯 지수이동평균 (pandas ewm(span, adjust=False).mean()) """
+
+    def __init__(self, span):
+        self.alpha = 2 / (span + 1)
+        self.value = None
+
+    def peek(self, x):
+        if self.value is None:
+            return x
+        return (1 - self.alpha) * self.value + self.alpha * x
+
+    def update(self, x):
+        self.value = self.peek(x)
+        return self.value
+
+
+class RollingExtreme:
+    """ 🎯 고정 길이 최솟값/최댓값 (단조 덱, 갱신 O(1) 분할상환) """
+
+    def __init__(self, period, is_max=False):
+        self.period = period
+        self.is_max = is_max
+        self.items = deque()  # (index, value) - 값이 단조 증가(최솟값) / 감소(최댓값)
+        self.index = -1
+
+    def _better(self, a, b):
+        return a >= b if self.is_max else a <= b
+
+    def _front_after_evict(self):
+        """ 🎯 다음 값이 들어올 때 창에서 빠지는 값을 제외한 현재 극값 """
+        oldest = self.index + 1 - self.period
+        for i, value in self.items:
+            if i > oldest:
+                return value
+        return None
+
+    def update(self, x):
+        self.index += 1
+        while self.items and self._better(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.index, x))
+        if self.items[0][0] <= self.index - self.period:
+            self.items.popleft()
+        if self.index + 1 < self.period:
+            return math.nan
+        return self.items[0][1]
+
+    def peek(self, x):
+        if self.index + 2 < self.period:
+            return math.nan
+        front = self._front_after_evict()
+        if front is None:
+            return x
+        return max(front, x) if self.is_max else min(front, x)
+
+
+def _rsi_from(gain, loss):
+    if math.isnan(gain) or math.isnan(loss):
+        return math.nan
+    if loss == 0:
+        return math.nan if gain == 0 else 100.0
+    return 100 - (100 / (1 + gain / loss))
+
+
+def _stochastic_k(close, lowest_low, highest_high):
+    if math.isnan(lowest_low) or math.isnan(highest_high) or highest_high == lowest_low:
+        return math.nan
+    return 100 * ((close - lowest_low) / (highest_high - lowest_low))
+
+
+class MarketIndicators:
+    """ 🎯 종목 1개의 지표 상태 (RSI, MACD, 스토캐스틱, EMA, 볼린저 밴드, ATR) """
+
+    def __init__(self, rsi_period=14, macd_setting=(12, 26, 9), stochastic_period=14,
+                 ema_periods=(20,), bollinger_period=20, atr_period=14):
+        short, long, signal = macd_setting
+        self.prev_close = None
+        self.rsi_gain = RollingMean(rsi_period)
+        self.rsi_loss = RollingMean(rsi_period)
+        self.macd_short = EMA(short)
+        self.macd_long = EMA(long)
+        self.macd_signal = EMA(signal)
+        self.lowest_low = RollingExtreme(stochastic_period)
+        self.highest_high = RollingExtreme(stochastic_period, is_max=True)
+        self.stochastic_d = RollingMean(3)
+        self.emas = {period: EMA(period) for period in ema_periods}
+        self.bollinger = RollingStd(bollinger_period)
+        self.atr = RollingMean(atr_period)
+        self.values = {}
+        self.count = 0  # 🎯 반영된 캔들 수
+
+    def _inputs(self, close, high, low):
+        high = close if high is None else high
+        low = close if low is None else low
+        if self.prev_close is None:
+            delta = math.nan
+            true_range = high - low  # 🎯 첫 캔들은 이전 종가가 없으므로 고가-저가만 사용 (pandas max(axis=1) 와 동일)
+        else:
+            delta = close - self.prev_close
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        gain = delta if delta > 0 else 0.0  # 🎯 NaN 비교는 False → 0 (pandas where 와 동일)
+        loss = -delta if delta < 0 else 0.0
+        return high, low, gain, loss, true_range
+
+    def _result(self, close, gain_mean, loss_mean, short, long, signal, lowest_low, highest_high, k, d,
+                emas, sma_std, atr):
+        sma, std = sma_std
+        macd = short - long
+        return {
+            "close": close,
+            "rsi": _rsi_from(gain_mean, loss_mean),
+            "macd": macd,
+            "macd_signal": signal,
+            "stochastic_k": k,
+            "stochastic_d": d,
+            "ema": emas,
+            "bollinger_upper": sma + std * 2,
+            "bollinger_lower": sma - std * 2,
+            "atr": atr,
+        }
+
+    def update(self, close, high=None, low=None):
+        """ 🎯 마감된 캔들 1개 반영 후 최신 지표 값 반환 """
+        high, low, gain, loss, true_range = self._inputs(close, high, low)
+        short = self.macd_short.update(close)
+        long = self.macd_long.update(close)
+        signal = self.macd_signal.update(short - long)
+        lowest_low = self.lowest_low.update(low)
+        highest_high = self.highest_high.update(high)
+        k = _stochastic_k(close, lowest_low, highest_high)
+        d = self.stochastic_d.update(k)
+
+        self.values = self._result(
+            close, self.rsi_gain.update(gain), self.rsi_loss.update(loss), short, long, signal,
+            lowest_low, highest_high, k, d,
+            {period: ema.update(close) for period, ema in self.emas.items()},
+            self.bollinger.update(close), self.atr.update(true_range),
+        )
+        self.prev_close = close
+        self.count += 1
+        return self.values
+
+    def peek(self, close, high=None, low=None):
+        """ 🎯 진행 중인 캔들(틱) 가격으로 지표 계산 (상태 변경 없음) """
+        high, low, gain, loss, true_range = self._inputs(close, high, low)
+        short = self.macd_short.peek(close)
+        long = self.macd_long.peek(close)
+        signal = self.macd_signal.peek(short - long)
+        lowest_low = self.lowest_low.peek(low)
+        highest_high = self.highest_high.peek(high)
+        k = _stochastic_k(close, lowest_low, highest_high)
+
+        return self._result(
+            close, self.rsi_gain.peek(gain), self.rsi_loss.peek(loss), short, long, signal,
+            lowest_low, highest_high, k, self.stochastic_d.peek(k),
+            {period: ema.peek(close) for period, ema in self.emas.items()},
+            self.bollinger.peek(close), self.atr.peek(true_range),
+        )
+
+
+class IndicatorEngine:
+    """ 🎯 종목별 지표 상태 관리 (market → MarketIndicators) """
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.markets = {}
+
+    def _state(self, market):
+        state = self.markets.get(market)
+        if state is None:
+            state = MarketIndicators(**self.settings)
+            self.markets[market] = state
+        return state
+
+    def warm_up(self, market, closes, highs=None, lows=None):
+        """ 🎯 과거 캔들로 상태 초기화 (오래된 캔들 → 최신 캔들 순서) """
+        state = MarketIndicators(**self.settings)
+        closes = np.asarray(closes, dtype=float)
+        highs = closes if highs is None else np.asarray(highs, dtype=float)
+        lows = closes if lows is None else np.asarray(lows, dtype=float)
+        for close, high, low in zip(closes.tolist(), highs.tolist(), lows.tolist()):
+            state.update(close, high, low)
+        self.markets[market] = state
+        return state.values
+
+    def update(self, market, close, high=None, low=None):
+        return self._state(market).update(close, high, low)
+
+    def peek(self, market, close, high=None, low=None):
+        return self._state(market).peek(close, high, low)
+
+    def get(self, market):
+        """ 🎯 마지막으로 반영된 캔들 기준 지표 값 (없으면 빈 dict) """
+        state = self.markets.get(market)
+        return state.values if state else {}
+
+    def count(self, market):
+        state = self.markets.get(market)
+        return state.count if state else 0
+
+    def rank(self, markets, min_count=35, rsi_limit=70):
+        """
+        🎯 전체 종목 지표 점수 (MACD 가 시그널 위 + RSI 과매수 아님 → 가격 대비 MACD 히스토그램)
+        :param min_count: 반영된 캔들이 이보다 적은 종목은 NaN
+        :return: markets 순서의 점수 배열 (조건 미충족 시 NaN)
+        """
+        scores = np.full(len(markets), np.nan)
+        for i, market in enumerate(markets):
+            state = self.markets.get(market)
+            if state is None or state.count < min_count:
+                continue
+            values = state.values
+            if values["macd"] > values["macd_signal"] and values["rsi"] < rsi_limit:  # 🎯 NaN 비교는 False
+                scores[i] = (values["macd"] - values["macd_signal"]) / values["close"]
+        return scores
+
+    def reset(self, market=None):
+        if market is None:
+            self.markets.clear()
+        else:
+            self.markets.pop(market, None)
@@ -0,0 +1,180 @@
+# trading/lstm_retrain.py
+import os
+import tempfile
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from .dayTrading import MODEL_PATH, SCALER_PATH, LITE_MODEL_PATH, configure_threads
+from .aiTrade.aiTrading import fetch_all_data
+from .aiTrade.resample import history_store
+from .aiTrade.lstm_dataset import WindowDataset, MultiWindowDataset
+from .aiTrade.lstm_features import FeatureFile, scaler_from_dict
+from .aiTrade.lstm_export import export_lite
+from .aiTrade.lstm_registry import MODEL_DIR, current_version, load_meta, load_scaler_meta, promote, save_version, version_dir
+
+# ✅ LSTM 증분 재학습 (별도 프로세스에서 주기 실행 → Django 프로세스는 tensorflow 를 불러오지 않음)
+#   1. 새 캔들 수집 → 특성 파일 갱신 (새 캔들만 계산)
+#   2. 현재 배포 버전에서 이어서 학습: 지난 학습 이후 새 샘플 + 예전 샘플 일부(replay, 과거 패턴 유지)
+#   3. 가장 최근 구간(validation_samples 개)으로 현재 모델과 새 모델 비교 → 좋아졌을 때만 배포 (os.replace)
+#   4. 결과와 관계없이 새 버전은 데이터 구간/지표와 함께 저장 (rejected 기록 포함)
+#   scaler 는 처음 전체 학습(dayTradingView) 때 값을 그대로 사용 (이어서 학습하는 모델의 입력 분포 유지)
+
+RETRAIN_INTERVAL = 3600  # ✅ 재학습 주기 (초)
+VALIDATION_SAMPLES = 500
+REPLAY_RATIO = 1.0  # ✅ 새 샘플 수 대비 예전 샘플 비율
+MIN_NEW_SAMPLES = 1
+FINE_TUNE_EPOCHS = 2
+FINE_TUNE_LEARNING_RATE = 1e-4
+
+
+def _evaluate(model, dataset):
+    """ ✅ 검증 구간 binary cross-entropy (작을수록 좋음) """
+    loss, _ = model.evaluate(dataset.to_tf(), verbose=0)
+    return float(loss)
+
+
+def update_market_data(market, interval, download_candles=True):
+    """ ✅ 새 1분봉 수집 → 저장소 반영 → 특성 파일 갱신 """
+    if download_candles:
+        fetch_all_data(market, interval="1")
+    return FeatureFile(market, interval).update(history_store(market, interval))
+
+
+def split_new_samples(feature_file, time_steps, trained_until, validation_samples, replay_ratio, rng):
+    """
+    ✅ (새 샘플 + replay 샘플, 검증 샘플, 데이터 구간) - 샘플 번호 배열
+    검증: 가장 최근 validation_samples 개, 새 샘플: 지난 학습 이후 ~ 검증 구간 전
+    """
+    indices = feature_file.sample_indices(time_steps)
+    if len(indices) <= validation_samples:
+        return None
+    label_times = feature_file.times[indices + time_steps]
+    trained_until = np.datetime64(trained_until, "ms")
+    validation = indices[-validation_samples:]
+    validation_start = label_times[-validation_samples]
+
+    new = indices[(label_times > trained_until) & (label_times < validation_start)]
+    old = indices[label_times <= trained_until]
+    replay_count = min(len(old), int(len(new) * replay_ratio))
+    replay = rng.choice(old, size=replay_count, replace=False) if replay_count else old[:0]
+
+    data_range = {
+        "train_start": str(label_times[0]),
+        "train_end": str(feature_file.times[new[-1] + time_steps]) if len(new) else str(trained_until),
+        "new_samples": int(len(new)),
+        "replay_samples": int(replay_count),
+        "validation_start": str(validation_start),
+        "validation_end": str(label_times[-1]),
+    }
+    return np.sort(np.concatenate([new, replay])), validation, data_range, len(new)
+
+
+def retrain_once(markets=None, validation_samples=VALIDATION_SAMPLES, replay_ratio=REPLAY_RATIO,
+                 epochs=FINE_TUNE_EPOCHS, learning_rate=FINE_TUNE_LEARNING_RATE, batch_size=128,
+                 min_improvement=0.0, download_candles=True, lite_quantize=None, seed=None, model_dir=MODEL_DIR):
+    """
+    ✅ 증분 재학습 1회
+    :param markets: 재학습할 종목 (None 이면 현재 버전의 학습 종목, scaler 가 없는 종목은 제외)
+    :param min_improvement: 검증 손실이 이 값보다 더 줄어야 배포
+    :return: {"version", "promoted", "current_loss", "candidate_loss", ...} (새 데이터가 없으면 None)
+    """
+    parent = current_version(model_dir)
+    if parent is None:
+        print("❌ 배포된 LSTM 모델 없음 → dayTradingView 로 먼저 전체 학습")
+        return None
+    parent_meta = load_meta(parent, model_dir)
+    scaler_meta = load_scaler_meta(parent, model_dir)
+    interval, time_steps = scaler_meta["interval"], scaler_meta["time_steps"]
+    markets = [market for market in (markets or scaler_meta["markets"]) if market in scaler_meta["markets"]]
+    rng = np.random.default_rng(seed)
+
+    train_sets, validation_sets, data_ranges, new_total = [], [], {}, 0
+    for market in markets:
+        feature_file = update_market_data(market, interval, download_candles)
+        trained_until = parent_meta["markets"].get(market, {}).get("train_end")
+        split = split_new_samples(feature_file, time_steps, trained_until or "1970-01-01", validation_samples,
+                                  replay_ratio, rng)
+        if split is None:
+            continue
+        train_indices, validation_indices, data_range, new_count = split
+        dataset = WindowDataset(feature_file.features, feature_file.target, time_steps, batch_size=batch_size,
+                                scaler=scaler_from_dict(scaler_meta["markets"][market]))
+        if len(train_indices):
+            train_sets.append(dataset.subset(train_indices, shuffle=True))
+        validation_sets.append(dataset.subset(validation_indices, shuffle=False))
+        data_ranges[market] = data_range
+        new_total += new_count
+
+    if new_total < MIN_NEW_SAMPLES:
+        print("ℹ️ 지난 학습 이후 새 캔들 없음 → 재학습 건너뜀")
+        return None
+
+    train_data = train_sets[0] if len(train_sets) == 1 else MultiWindowDataset(train_sets, shuffle=True, seed=seed)
+    validation_data = validation_sets[0] if len(validation_sets) == 1 else MultiWindowDataset(validation_sets)
+
+    # ✅ 현재 모델 성능 (같은 검증 구간) → 현재 모델에서 이어서 학습
+    current_model = tf.keras.models.load_model(os.path.join(version_dir(parent, model_dir), "model.h5"), compile=False)
+    current_model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+    current_loss = _evaluate(current_model, validation_data)
+
+    candidate = tf.keras.models.clone_model(current_model)
+    candidate.set_weights(current_model.get_weights())
+    candidate.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate), loss="binary_crossentropy",
+                      metrics=["accuracy"])
+    started = time.time()
+    candidate.fit(train_data.to_tf(), epochs=epochs, verbose=0)
+    candidate_loss = _evaluate(candidate, validation_data)
+    promoted = candidate_loss < current_loss - min_improvement
+
+    result = {
+        "parent": parent,
+        "mode": "fine_tune",
+        "markets": data_ranges,
+        "epochs": epochs,
+        "learning_rate": learning_rate,
+        "current_loss": current_loss,
+        "candidate_loss": candidate_loss,
+        "train_seconds": round(time.time() - started, 1),
+        "lite_quantize": lite_quantize,
+    }
+
+    # ✅ 배포할 모델은 TFLite 변환/출력 비교를 먼저 통과해야 함 → 통과 여부까지 반영한 status 로 버전 저장
+    with tempfile.TemporaryDirectory() as temp_dir:
+        lite_path = None
+        if promoted:
+            lite_path = os.path.join(temp_dir, "model.tflite")
+            try:
+                export_lite(candidate, lite_path, quantize=lite_quantize, samples=next(validation_data.batches())[0],
+                            representative=train_data)
+            except ValueError as e:
+                print(f"⚠️ TFLite 변환 실패 → 배포하지 않음: {e}")
+                promoted, lite_path = False, None
+                result["rejected_reason"] = str(e)
+        result["status"] = "promoted" if promoted else "rejected"
+        version = save_version(candidate, scaler_meta, result, lite_path=lite_path, model_dir=model_dir)
+    result["version"] = version
+    print(f"🔁 LSTM 재학습 {version}: 검증 손실 {current_loss:.5f} → {candidate_loss:.5f} ({result['status']})")
+
+    if promoted:
+        promote(version, MODEL_PATH, SCALER_PATH, LITE_MODEL_PATH, model_dir)
+    result["promoted"] = promoted
+    return result
+
+
+def run_forever(interval=RETRAIN_INTERVAL, **kwargs):
+    """ ✅ interval 초마다 retrain_once 실행 (오류가 나도 다음 주기에 다시 시도) """
+    configure_threads()
+    while True:
+        started = time.time()
+        try:
+            retrain_once(**kwargs)
+        except Exception as e:
+            print(f"⚠️ LSTM 재학습 실패: {e}")
+        time.sleep(max(0.0, interval - (time.time() - started)))
+
+
+if __name__ == "__main__":
+    # ✅ 실행: python -m trading.lstm_retrain (Django 서버와 별도 프로세스)
+    run_forever()
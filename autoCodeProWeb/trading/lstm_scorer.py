@@ -0,0 +1,190 @@
+# trading/lstm_scorer.py
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from .candle_buffer import CandleStore
+from .upbit_client import upbit_get
+from .aiTrade.history_store import PRICE_COLUMNS
+from .aiTrade.lstm_features import candle_features, scaler_from_dict
+from .aiTrade.lstm_export import load_model
+
+# ✅ LSTM 상승 확률 점수 (dayTrading 으로 학습한 모델)
+#   - 모델/scaler 는 처음 한 번만 로드해 계속 사용 (.tflite 모델이면 tensorflow 없이 tflite_runtime 으로 추론)
+#   - 후보 종목 전체를 한 번의 배치 호출로 계산 (종목별 호출 없음)
+#   - 점수는 캔들이 마감될 때까지 캐시, 새 캔들이 마감되면 백그라운드 쓰레드에서 다시 계산 → 틱은 기다리지 않음
+#   - scaler 가 없는 종목(학습하지 않은 종목)은 점수 없음
+#   - 재학습(lstm_retrain)으로 모델 파일이 교체되면 다음 계산 때 모델/scaler 를 다시 로드 (파일 변경 시각 비교)
+
+
+class LSTMScorer:
+    def __init__(self, model_path, scaler_path, history=200, num_threads=None):
+        """
+        :param model_path: .h5 (Keras) 또는 .tflite (lstm_export 로 변환한 모델)
+        :param history: 종목별로 유지할 캔들 수 (RSI / MACD 계산용, 입력 길이보다 길어야 함)
+        :param num_threads: TFLite 추론 쓰레드 수 (None 이면 기본값)
+        """
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.scaler_path = scaler_path
+        self.history = history
+        self.model = None
+        self.scalers = {}
+        self.interval = None
+        self.time_steps = None
+        self.candles = None
+        self.loaded = None  # ✅ None: 로드 전, True: 사용 가능, False: 사용 불가
+        self.model_mtime = None
+        self.load_lock = threading.Lock()
+        self.scores = {}  # ✅ market → (마감 캔들 시작 시각(ms), 상승 확률)
+        self.checked = {}  # ✅ market → 마지막으로 계산을 시도한 캔들 시각 (데이터 부족 종목 반복 요청 방지)
+        self.refresh_thread = None
+        self.stats = {"batches": 0, "markets_scored": 0, "last_batch_ms": 0.0}
+
+    def _model_mtime(self):
+        try:
+            return os.path.getmtime(self.model_path)
+        except OSError:
+            return None
+
+    def _read(self):
+        """ ✅ 모델 / scaler 파일 읽기 → (모델, scaler 메타, 모델 파일 변경 시각) """
+        mtime = self._model_mtime()
+        with open(self.scaler_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        return load_model(self.model_path, self.num_threads), meta, mtime
+
+    def _apply(self, model, meta, mtime):
+        interval = int(meta["interval"])
+        if self.candles is None or interval != self.interval:
+            self.candles = CandleStore(self.fetch_candles, unit_seconds=interval * 60, capacity=self.history)
+        self.interval = interval
+        self.time_steps = meta["time_steps"]
+        self.scalers = {market: scaler_from_dict(data) for market, data in meta["markets"].items()}
+        self.model = model
+        self.model_mtime = mtime
+        # ✅ 이전 모델 점수는 사용하지 않음 (clear() 대신 새 dict 로 교체 → 다른 쓰레드가 읽는 중인 dict 는 그대로 유지)
+        self.scores = {}
+        self.checked = {}
+
+    def load(self):
+        """ ✅ 모델 / scaler 로드 (한 번만, 실패하면 다시 시도하지 않음) → 사용 가능 여부 """
+        with self.load_lock:
+            if self.loaded is not None:
+                return self.loaded
+            try:
+                loaded = self._read()
+            except (ImportError, OSError, ValueError) as e:
+                print(f"⚠️ LSTM 점수 사용 안 함 (모델 로드 실패: {e})")
+                self.loaded = False
+                return False
+
+            self._apply(*loaded)
+            self.loaded = True
+            print(f"✅ LSTM 모델 로드 완료 ({self.interval}분봉, {len(self.scalers)}개 종목)")
+            return True
+
+    def reload_if_changed(self):
+        """ ✅ 모델 파일이 교체됐으면 다시 로드 (실패하면 기존 모델 계속 사용) → 다시 로드했는지 여부 """
+        mtime = self._model_mtime()
+        if not self.loaded or mtime is None or mtime == self.model_mtime:
+            return False
+        with self.load_lock:
+            try:
+                loaded = self._read()
+            except (ImportError, OSError, ValueError) as e:
+                print(f"⚠️ LSTM 모델 다시 로드 실패 (기존 모델 사용): {e}")
+                self.model_mtime = mtime  # ✅ 같은 파일로 반복 시도하지 않음
+                return False
+            self._apply(*loaded)
+        print(f"🔁 LSTM 모델 교체 감지 → 다시 로드 완료 ({len(self.scalers)}개 종목)")
+        return True
+
+    def fetch_candles(self, market, count):
+        """ ✅ 분봉 원본 응답 (최신 캔들 먼저, 실패 시 None) """
+        try:
+            response = upbit_get(f"/v1/candles/minutes/{self.interval}", params={"market": market, "count": count})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"❌ {market} 분봉 요청 실패: {e}")
+            return None
+
+    def current_candle(self, now=None):
+        """ ✅ 진행 중인 캔들 시작 시각 (epoch ms, 업비트 분봉은 UTC 기준 경계) """
+        unit = self.interval * 60_000
+        now_ms = int((time.time() if now is None else now) * 1000)
+        return now_ms // unit * unit
+
+    def window(self, market, current):
+        """ ✅ 마감된 최근 time_steps 개 캔들 입력 (정규화 완료, float32), 데이터 부족 시 None """
+        self.candles.update(market)
+        timestamps, values = self.candles.buffer(market).view()
+        closed = timestamps < current
+        if closed.sum() <= self.time_steps:
+            return None
+        df = pd.DataFrame(values[:, closed].T, columns=PRICE_COLUMNS)  # ✅ 버퍼 순서 (시가, 고가, 저가, 종가, 거래량)
+        features = candle_features(df)[-self.time_steps:]
+        if np.isnan(features).any():
+            return None
+        return self.scalers[market].transform(features).astype(np.float32)
+
+    def refresh(self, markets, current=None):
+        """ ✅ 종목들의 입력을 모아 한 번의 배치 호출로 점수 계산 (모델이 아직 없으면 먼저 로드) """
+        if not self.load():
+            return
+        self.reload_if_changed()
+        current = current or self.current_candle()
+        windows, scored = [], []
+        for market in markets:
+            if market not in self.scalers:
+                continue
+            self.checked[market] = current
+            window = self.window(market, current)
+            if window is not None:
+                windows.append(window)
+                scored.append(market)
+        if not windows:
+            return
+
+        started = time.perf_counter()
+        probabilities = np.asarray(self.model(np.stack(windows))).ravel()  # ✅ predict() 보다 호출 비용이 작음
+        self.stats["last_batch_ms"] = (time.perf_counter() - started) * 1000
+        self.stats["batches"] += 1
+        self.stats["markets_scored"] += len(scored)
+        for market, probability in zip(scored, probabilities):
+            self.scores[market] = (current, float(probability))
+
+    def score(self, markets, wait=False):
+        """
+        ✅ 종목별 상승 확률 {market: 확률} (scaler 가 있는 종목만)
+        모델 로드와 마감 이후 첫 계산은 백그라운드에서 실행하고, 그 동안은 직전 캔들 점수를 사용 (틱은 기다리지 않음)
+        :param wait: True 이면 로드 / 계산이 끝날 때까지 기다림
+        """
+        if self.loaded is False:
+            return {}
+        if self.loaded:
+            if self._model_mtime() != self.model_mtime:
+                self.checked = {}  # ✅ 모델이 교체됨 → 백그라운드 계산에서 다시 로드
+            current = self.current_candle()
+            stale = [market for market in markets if market in self.scalers and self.checked.get(market) != current]
+        else:
+            stale = list(markets)  # ✅ 로드 전에는 scaler 가 있는 종목을 알 수 없음
+        if stale:
+            if wait:
+                self.refresh(stale)
+            elif self.refresh_thread is None or not self.refresh_thread.is_alive():
+                self.refresh_thread = threading.Thread(target=self.refresh, args=(stale,), daemon=True)
+                self.refresh_thread.start()
+        scores = self.scores  # ✅ 백그라운드 다시 로드로 교체될 수 있으므로 한 번만 읽고, 종목별 값도 한 번만 조회
+        result = {}
+        for market in markets:
+            entry = scores.get(market)
+            if entry is not None:
+                result[market] = entry[1]
+        return result
@@ -0,0 +1,284 @@
+# trading/lstm_search.py
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.metrics import log_loss, roc_auc_score
+
+from .dayTrading import configure_threads, build_lstm_model
+from .aiTrade.resample import history_store
+from .aiTrade.lstm_dataset import WindowDataset, MultiWindowDataset, fold_samples, purged_folds
+from .aiTrade.lstm_features import FEATURE_CACHE_DIR, FEATURES, SCALER_CHUNK_ROWS, FeatureFile, fit_scaler
+from .aiTrade.history_store import interval_name
+
+# ✅ LSTM 하이퍼파라미터 탐색 (시계열 교차 검증)
+#   - 구간(fold): 앞에서부터 학습 구간을 늘려가며 바로 다음 구간으로 검증 (forward chaining)
+#     학습 샘플은 정답 캔들까지 학습 구간 안에 있어야 함 → 검증 윈도우와 겹치는 학습 샘플 제거 (purge)
+#   - 정규화된 특성 배열은 (종목, 구간) 별로 한 번만 만들어 디스크에 저장 → 모든 시도가 메모리 맵으로 공유
+#   - (시도, 구간) 작업을 프로세스 풀로 분산, 프로세스마다 CPU 쓰레드 수 제한 (작업자 수 × 쓰레드 ≈ CPU 수)
+#   - 작업 결과는 (설정, 구간 데이터) 키로 저장 → 중단 후 다시 실행하면 남은 작업만 계산
+
+SEARCH_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aiTrade", "cache", "lstm_search")
+MODEL_PARAMS = ("units", "layers", "dropout", "dense_units", "learning_rate")
+DEFAULT_SPACE = {
+    "time_steps": [30, 60, 120],
+    "batch_size": [64, 128],
+    "units": [16, 32, 64],
+    "layers": [1, 2],
+    "dropout": [0.1, 0.2, 0.3],
+    "dense_units": [0, 25],
+    "learning_rate": [1e-3, 3e-4],
+    "epochs": [5, 10],
+}
+WORKER_THREADS = 2  # ✅ 작업자 프로세스 1개의 CPU 쓰레드 수
+THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TF_NUM_INTRAOP_THREADS")
+SAMPLE_VERSION = 2  # ✅ fold_samples 의 샘플 구성이 바뀌면 올림 → 이전 구성으로 계산한 작업 결과는 다시 계산
+
+_worker_state = {}
+
+
+def _digest(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def scaled_features(feature_file, scale_rows, rows, cache_dir=SEARCH_CACHE_DIR):
+    """
+    ✅ features[:rows] 를 features[:scale_rows] 로 학습한 scaler 로 정규화한 float32 파일 경로 (있으면 재사용)
+    검증 구간 값은 scaler 에 쓰지 않음, 파일은 작업자들이 메모리 맵으로 함께 읽음
+    """
+    key = _digest({"market": feature_file.market, "interval": feature_file.interval,
+                   "source": feature_file.meta["source"], "scale_rows": scale_rows, "rows": rows})
+    directory = os.path.join(cache_dir, "scaled", feature_file.market, interval_name(feature_file.interval))
+    path = os.path.join(directory, f"{key}.f32")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    features = feature_file.features
+    scaler = fit_scaler(features, scale_rows)
+    scale, offset = scaler.scale_.astype(np.float32), scaler.min_.astype(np.float32)
+    with open(f"{path}.tmp", "wb") as f:
+        for start in range(0, rows, SCALER_CHUNK_ROWS):
+            chunk = features[start:min(start + SCALER_CHUNK_ROWS, rows)] * scale
+            chunk += offset
+            f.write(chunk.tobytes())
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def prepare_folds(markets, interval="15", start=None, end=None, n_splits=4, embargo=0,
+                  feature_cache_dir=FEATURE_CACHE_DIR, cache_dir=SEARCH_CACHE_DIR):
+    """
+    ✅ 종목별 특성 파일 갱신 → 구간별 정규화 배열 준비
+    :return: [구간별 [{market, path, rows, fold, ...}]] (종목 순서)
+    """
+    markets = [markets] if isinstance(markets, str) else list(markets)
+    folds = [[] for _ in range(n_splits)]
+    for market in markets:
+        store = history_store(market, interval)
+        if not len(store):
+            print(f"❌ {market} {interval} 저장된 캔들 없음 (fetch_all_data 또는 import_csv 로 먼저 저장)")
+            continue
+        feature_file = FeatureFile(market, interval, feature_cache_dir).update(store)
+        times = feature_file.times
+        first = 0 if start is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(start), "ms")))
+        last = len(feature_file) if end is None else int(np.searchsorted(times, np.datetime64(pd.Timestamp(end), "ms")))
+        last = min(last, len(feature_file) - 1)  # ✅ 마지막 행은 정답(다음 캔들)이 없음
+
+        for k, fold in enumerate(purged_folds(first, last, n_splits, embargo)):
+            rows = fold[3]
+            folds[k].append({
+                "market": market,
+                "interval": str(interval),
+                "feature_cache_dir": feature_cache_dir,
+                "path": scaled_features(feature_file, fold[1], rows, cache_dir),
+                "rows": rows,
+                "fold": fold,
+                "range": [str(times[fold[0]]), str(times[fold[1] - 1]), str(times[fold[2]]), str(times[rows - 1])],
+            })
+    return [fold for fold in folds if fold]
+
+
+def trial_grid(space=None, trials=None, seed=None):
+    """ ✅ 탐색 공간 {이름: 후보 목록} → 시도할 설정 목록 (trials 가 조합 수보다 작으면 무작위 추출) """
+    space = space or DEFAULT_SPACE
+    names = list(space)
+    combos = [dict(zip(names, values)) for values in product(*(space[name] for name in names))]
+    if trials and trials < len(combos):
+        rng = np.random.default_rng(seed)
+        combos = [combos[i] for i in sorted(rng.choice(len(combos), size=trials, replace=False))]
+    return combos
+
+
+def _init_worker(threads):
+    """ ✅ 작업자 프로세스 쓰레드 수 제한 (TensorFlow 연산 전에 호출) """
+    configure_threads(threads, 1)
+
+
+def _open(part):
+    """ ✅ (정규화 배열, 정답 배열) 메모리 맵 (프로세스 안에서 한 번만 열고 재사용) """
+    path = part["path"]
+    if path not in _worker_state:
+        features = np.memmap(path, dtype=np.float32, mode="r", shape=(part["rows"], len(FEATURES)))
+        target = FeatureFile(part["market"], part["interval"], part["feature_cache_dir"]).target
+        _worker_state[path] = (features, target)
+    return _worker_state[path]
+
+
+def run_trial(params, parts, seed=None):
+    """
+    ✅ 설정 1개 × 구간 1개: 학습 구간으로 학습 → 검증 구간 평가
+    :param parts: prepare_folds 결과의 구간 1개 (종목별 정보 목록)
+    :return: {"loss", "auc", "accuracy", "samples", "seconds"}
+    """
+    started = time.time()
+    time_steps, batch_size = params["time_steps"], params["batch_size"]
+    train_sets, validation_sets = [], []
+    for part in parts:
+        features, target = _open(part)
+        train_indices, validation_indices = fold_samples(part["fold"], time_steps)
+        if not len(train_indices) or not len(validation_indices):
+            continue
+        dataset = WindowDataset(features, target, time_steps, batch_size=batch_size, seed=seed)
+        train_sets.append(dataset.subset(train_indices, shuffle=True))
+        validation_sets.append(dataset.subset(validation_indices, shuffle=False))
+    if not train_sets:
+        return None
+    train_data = train_sets[0] if len(train_sets) == 1 else MultiWindowDataset(train_sets, shuffle=True, seed=seed)
+    validation_data = validation_sets[0] if len(validation_sets) == 1 else MultiWindowDataset(validation_sets)
+
+    if seed is not None:
+        tf.keras.utils.set_random_seed(seed)
+    model = build_lstm_model(train_data.input_shape, **{name: params[name] for name in MODEL_PARAMS if name in params})
+    model.fit(train_data.to_tf(), epochs=params.get("epochs", 10), verbose=0)
+    probabilities = np.clip(model.predict(validation_data.to_tf(), verbose=0).ravel(), 1e-7, 1 - 1e-7)
+    labels = validation_data.labels()
+    tf.keras.backend.clear_session()  # ✅ 같은 프로세스에서 다음 시도 모델이 쌓이지 않도록 정리
+
+    return {
+        "loss": float(log_loss(labels, probabilities, labels=[0, 1])),
+        "auc": float(roc_auc_score(labels, probabilities)) if len(np.unique(labels)) > 1 else None,
+        "accuracy": float(np.mean((probabilities > 0.5) == labels)),
+        "samples": int(len(labels)),
+        "seconds": round(time.time() - started, 1),
+    }
+
+
+def _load_cached(cache_dir, key):
+    path = os.path.join(cache_dir, "trials", f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # ✅ 깨진 캐시 파일은 다시 계산
+
+
+def _save_cached(cache_dir, key, result):
+    os.makedirs(os.path.join(cache_dir, "trials"), exist_ok=True)
+    path = os.path.join(cache_dir, "trials", f"{key}.json")
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _summarize(params, fold_results):
+    done = [result for result in fold_results if result]
+    aucs = [result["auc"] for result in done if result["auc"] is not None]
+    return {
+        "params": params,
+        "model_params": {name: params[name] for name in MODEL_PARAMS if name in params},
+        "loss": float(np.mean([result["loss"] for result in done])) if done else None,
+        "loss_std": float(np.std([result["loss"] for result in done])) if done else None,
+        "auc": float(np.mean(aucs)) if aucs else None,
+        "accuracy": float(np.mean([result["accuracy"] for result in done])) if done else None,
+        "folds": fold_results,
+    }
+
+
+def lstm_search(markets="KRW-BTC", interval="15", space=None, trials=None, n_splits=4, embargo=0, start=None,
+                end=None, workers=None, threads=WORKER_THREADS, seed=42, cache_dir=SEARCH_CACHE_DIR):
+    """
+    ✅ LSTM 하이퍼파라미터 탐색 (시계열 교차 검증, 평균 검증 손실이 가장 작은 설정 선택)
+    :param space: {이름: 후보 목록} (time_steps, batch_size, epochs + build_lstm_model 옵션), None 이면 DEFAULT_SPACE
+    :param trials: 시도할 설정 수 (None 이면 모든 조합)
+    :param n_splits: 검증 구간 수
+    :param workers: 작업자 프로세스 수 (None 이면 CPU 수 // threads, 1 이면 현재 프로세스에서 실행)
+    :param threads: 작업자 1개의 CPU 쓰레드 수
+    :return: {"best": 최고 설정 요약, "results": 손실 순 정렬 목록, "cached": 캐시 사용 작업 수, "computed": 계산한 작업 수}
+             best["params"] 의 time_steps / batch_size / epochs, best["model_params"] → dayTradingView 에 그대로 사용
+    """
+    folds = prepare_folds(markets, interval, start, end, n_splits, embargo, cache_dir=cache_dir)
+    if not folds:
+        return None
+    grid = trial_grid(space, trials, seed)
+    fold_keys = [_digest([part["path"] for part in parts]) for parts in folds]
+    tasks = [(i, k) for i in range(len(grid)) for k in range(len(folds))]
+    keys = {(i, k): _digest({"params": grid[i], "fold": fold_keys[k], "seed": seed,
+                                "samples": SAMPLE_VERSION}) for i, k in tasks}
+
+    results = {task: _load_cached(cache_dir, keys[task]) for task in tasks}
+    pending = [task for task in tasks if results[task] is None]
+    cached = len(tasks) - len(pending)
+    print(f"🔎 LSTM 탐색: 설정 {len(grid)}개 × 구간 {len(folds)}개 (캐시 {cached}개, 계산 {len(pending)}개)")
+
+    def finish(task, result):
+        results[task] = result
+        _save_cached(cache_dir, keys[task], result)
+        i, k = task
+        if result:
+            print(f"  {grid[i]} 구간 {k + 1}: 손실 {result['loss']:.5f} ({result['seconds']}초)")
+
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+    if workers == 1 or len(pending) <= 1:
+        _init_worker(threads)
+        for task in pending:
+            finish(task, run_trial(grid[task[0]], folds[task[1]], seed))
+    else:
+        # ✅ 작업자 프로세스의 수치 연산 라이브러리 쓰레드 수 제한 (spawn 으로 새로 시작한 프로세스에만 적용)
+        saved_env = {name: os.environ.get(name) for name in THREAD_ENV}
+        os.environ.update({name: str(threads) for name in THREAD_ENV})
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker, initargs=(threads,)) as executor:
+                futures = {executor.submit(run_trial, grid[i], folds[k], seed): (i, k) for i, k in pending}
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    summaries = [_summarize(params, [results[(i, k)] for k in range(len(folds))]) for i, params in enumerate(grid)]
+    summaries.sort(key=lambda summary: float("inf") if summary["loss"] is None else summary["loss"])
+    report = {
+        "markets": [part["market"] for part in folds[0]],
+        "interval": str(interval),
+        "folds": [[{"market": part["market"], "range": part["range"]} for part in parts] for parts in folds],
+        "best": summaries[0],
+        "results": summaries,
+        "cached": cached,
+        "computed": len(pending),
+    }
+    with open(os.path.join(cache_dir, "latest.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    best = summaries[0]
+    if best["loss"] is not None:
+        print(f"🏆 최적 설정: {best['params']} (평균 검증 손실 {best['loss']:.5f}, AUC {best['auc']})")
+    return report
+
+
+if __name__ == "__main__":
+    # ✅ 실행: python -m trading.lstm_search (작업자 프로세스는 spawn 으로 시작하므로 main 가드 필요)
+    lstm_search()
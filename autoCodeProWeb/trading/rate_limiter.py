@@ -0,0 +1,190 @@
+# trading/rate_limiter.py
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+# ✅ 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_ORDER = 0  # 주문 / 체결 확인
+PRIORITY_TRADING = 1  # 자동매매 루프 시세 조회
+PRIORITY_DASHBOARD = 2  # 대시보드 화면 갱신
+PRIORITY_BACKFILL = 3  # 과거 데이터 수집
+
+# ✅ 업비트 Remaining-Req 그룹별 초당 요청 한도
+#    시세(quotation) API 는 그룹(candles, ticker, ...)마다 10회, 거래소(exchange) API 는 default 그룹 30회, 주문은 8회
+GROUP_LIMITS = {
+    "market": 10,
+    "candles": 10,
+    "ticker": 10,
+    "orderbook": 10,
+    "trades": 10,
+    "default": 30,
+    "order": 8,
+}
+DEFAULT_GROUP_LIMIT = 10
+PENALTY_SECONDS = 1.0  # ✅ 429 응답 시 해당 그룹 요청 중단 시간
+
+_priority_context = threading.local()
+
+
+def get_rate_group(method, path):
+    """ ✅ 요청 경로로 Remaining-Req 그룹 추정 """
+    if path.startswith("/v1/orders") and method == "POST":
+        return "order"
+    for prefix, group in (("/v1/candles", "candles"), ("/v1/ticker", "ticker"), ("/v1/orderbook", "orderbook"),
+                          ("/v1/market", "market"), ("/v1/trades", "trades")):
+        if path.startswith(prefix):
+            return group
+    return "default"
+
+
+def parse_remaining_req(header):
+    """ ✅ 'group=default; min=1800; sec=29' → {"group": "default", "min": 1800, "sec": 29} """
+    result = {}
+    for part in header.split(";"):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        key, value = key.strip(), value.strip()
+        result[key] = int(value) if value.isdigit() else value
+    return result
+
+
+@contextmanager
+def request_priority(priority):
+    """ ✅ with 블록 안에서 호출되는 API 요청의 기본 우선순위 지정 (예: 대시보드 뷰) """
+    previous = getattr(_priority_context, "priority", None)
+    _priority_context.priority = priority
+    try:
+        yield
+    finally:
+        _priority_context.priority = previous
+
+
+def current_priority():
+    priority = getattr(_priority_context, "priority", None)
+    return PRIORITY_TRADING if priority is None else priority
+
+
+class RateLimiter:
+    """ ✅ 그룹별 토큰 버킷 + 우선순위 대기열 기반 요청 스케줄러 """
+
+    def __init__(self, limits=None):
+        self.limits = dict(GROUP_LIMITS if limits is None else limits)
+        self.cond = threading.Condition()
+        self.buckets = {}
+        self.waiters = {}
+        self.routes = {}  # ✅ (method, path) → 응답 헤더로 확인한 서버 그룹 (추정과 다를 때만)
+        self.sequence = itertools.count()
+
+    def group_for(self, method, path):
+        """ ✅ 요청에 사용할 그룹 (서버가 알려준 그룹이 있으면 우선, 없으면 get_rate_group 추정) """
+        return self.routes.get((method, path)) or get_rate_group(method, path)
+
+    def _bucket(self, group):
+        bucket = self.buckets.get(group)
+        if bucket is None:
+            rate = self.limits.get(group, DEFAULT_GROUP_LIMIT)
+            bucket = {"rate": rate, "tokens": float(rate), "updated": time.monotonic(), "blocked_until": 0.0,
+                      "remaining_sec": None, "remaining_min": None, "requests": 0, "waited": 0, "throttled": 0}
+            self.buckets[group] = bucket
+            self.waiters[group] = []
+        return bucket
+
+    @staticmethod
+    def _refill(bucket, now):
+        elapsed = now - bucket["updated"]
+        bucket["tokens"] = min(float(bucket["rate"]), bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+
+    def acquire(self, group, priority=None, timeout=None):
+        """
+        ✅ 요청 1회 분량의 토큰 획득 (우선순위가 높은 요청부터, 같은 우선순위는 먼저 온 순서대로)
+        :return: 토큰을 얻으면 True, timeout 초과 시 False
+        """
+        if priority is None:
+            priority = current_priority()
+        entry = (priority, next(self.sequence))
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self.cond:
+            bucket = self._bucket(group)
+            queue = self.waiters[group]
+            heapq.heappush(queue, entry)
+            waited = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(bucket, now)
+                    if queue[0] == entry and bucket["tokens"] >= 1 and now >= bucket["blocked_until"]:
+                        bucket["tokens"] -= 1
+                        bucket["requests"] += 1
+                        if waited:
+                            bucket["waited"] += 1
+                        return True
+
+                    if deadline is not None and now >= deadline:
+                        return False
+
+                    if queue[0] == entry:
+                        wait_time = max(bucket["blocked_until"] - now, (1 - bucket["tokens"]) / bucket["rate"], 0.001)
+                    else:
+                        wait_time = 0.05  # ✅ 앞선 요청이 처리되면 notify 로 깨어남
+                    if deadline is not None:
+                        wait_time = min(wait_time, deadline - now)
+                    waited = True
+                    self.cond.wait(wait_time)
+            finally:
+                queue.remove(entry)
+                heapq.heapify(queue)
+                self.cond.notify_all()
+
+    def update(self, group, response, route=None):
+        """
+        ✅ 응답의 Remaining-Req 헤더/상태 코드로 남은 한도 갱신
+        :param group: 토큰을 가져간 그룹
+        :param route: (method, path) - 서버 그룹이 다르면 이후 이 요청은 서버 그룹 버킷에서 토큰을 가져감
+        """
+        header = response.headers.get("Remaining-Req")
+        with self.cond:
+            if header:
+                remaining = parse_remaining_req(header)
+                server_group = remaining.get("group", group)
+                if server_group != group and route is not None:
+                    self.routes[route] = server_group
+                    print(f"ℹ️ 요청 그룹 보정: {route[0]} {route[1]} → {server_group} (추정: {group})")
+                bucket = self._bucket(server_group)
+                self._refill(bucket, time.monotonic())
+                if isinstance(remaining.get("sec"), int):
+                    bucket["remaining_sec"] = remaining["sec"]
+                    bucket["tokens"] = min(bucket["tokens"], float(remaining["sec"]))  # ✅ 서버 기준 남은 한도로 보정
+                if isinstance(remaining.get("min"), int):
+                    bucket["remaining_min"] = remaining["min"]
+            else:
+                bucket = self._bucket(group)
+
+            if response.status_code == 429:
+                bucket["tokens"] = 0.0
+                bucket["blocked_until"] = time.monotonic() + PENALTY_SECONDS
+                bucket["throttled"] += 1
+            self.cond.notify_all()
+
+    def get_stats(self):
+        """ ✅ 그룹별 요청/대기/429 횟수 및 남은 한도 """
+        with self.cond:
+            return {
+                group: {
+                    "tokens": round(bucket["tokens"], 2),
+                    "remaining_sec": bucket["remaining_sec"],
+                    "remaining_min": bucket["remaining_min"],
+                    "requests": bucket["requests"],
+                    "waited": bucket["waited"],
+                    "throttled": bucket["throttled"],
+                    "waiting": len(self.waiters[group]),
+                }
+                for group, bucket in self.buckets.items()
+            }
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,78 @@
+# trading/streamTrade/order_stream.py
+import json
+import threading
+import uuid
+
+from .upbit_stream import UpbitStream, UPBIT_PRIVATE_WS_URL
+
+
+class OrderStream(UpbitStream):
+    """ ✅ 업비트 개인 웹소켓 myOrder / myAsset 채널 구독 (주문 체결·잔고 변경 실시간 수신) """
+
+    name = "myOrder"
+
+    def __init__(self, token_factory, url=UPBIT_PRIVATE_WS_URL, on_order=None, on_asset=None,
+                 reconnect_delay=1, max_reconnect_delay=30):
+        """
+        :param token_factory: 연결할 때마다 새 JWT 를 만들어 주는 함수 (예: utils.get_upbit_token)
+        :param on_order: 주문 이벤트 콜백 (인자: {"uuid", "market", "side", "state", ...})
+        :param on_asset: 잔고 이벤트 콜백 (인자: {currency: {"balance", "locked"}})
+        """
+        super().__init__(url, reconnect_delay, max_reconnect_delay)
+        self.token_factory = token_factory
+        self.on_order = on_order
+        self.on_asset = on_asset
+        self.lock = threading.Lock()
+        self.orders = {}  # ✅ uuid → 최신 주문 상태
+        self.balances = {}  # ✅ currency → {"balance", "locked"}
+
+    def connect_headers(self):
+        return [f"Authorization: Bearer {self.token_factory()}"]
+
+    def subscribe_message(self):
+        """ ✅ myOrder / myAsset 구독 요청 메시지 """
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "myOrder"},
+            {"type": "myAsset"},
+            {"format": "DEFAULT"},
+        ])
+
+    def handle_message(self, data):
+        message_type = data.get("type")
+        if message_type == "myOrder":
+            order = {
+                "uuid": data.get("uuid"),
+                "market": data.get("code"),
+                "side": (data.get("ask_bid") or "").lower(),
+                "state": data.get("state"),
+                "executed_volume": float(data.get("executed_volume") or 0),
+                "remaining_volume": float(data.get("remaining_volume") or 0),
+                "avg_price": float(data.get("avg_price") or 0),
+            }
+            with self.lock:
+                self.orders[order["uuid"]] = order
+            if self.on_order:
+                self.on_order(order)
+
+        elif message_type == "myAsset":
+            with self.lock:
+                for asset in data.get("assets", []):
+                    self.balances[asset["currency"]] = {
+                        "balance": float(asset.get("balance") or 0),
+                        "locked": float(asset.get("locked") or 0),
+                    }
+                balances = dict(self.balances)
+            if self.on_asset:
+                self.on_asset(balances)
+
+    def get_order_states(self, order_uuids):
+        """ ✅ 스트림으로 수신한 주문 상태 조회 (수신 이력이 없는 주문은 제외) """
+        with self.lock:
+            return {u: self.orders[u] for u in order_uuids if u in self.orders}
+
+    def seed_orders(self, order_states):
+        """ ✅ REST 로 조회한 주문 상태 등록 (이미 스트림으로 받은 주문은 유지) """
+        with self.lock:
+            for order_uuid, state in order_states.items():
+                self.orders.setdefault(order_uuid, state)
@@ -0,0 +1,250 @@
+# trading/streamTrade/stub_server.py
+"""
+✅ 테스트용 로컬 업비트 웹소켓 스텁 서버 (표준 라이브러리만 사용)
+
+사용 예:
+    server = StubUpbitServer()
+    server.start()
+    stream = TickerStream(["KRW-BTC"], url=server.url)
+    stream.start()
+    server.push(ticker_message("KRW-BTC", 50000000))
+
+    # 개인 채널: OrderStream(token_factory, url=server.url) 연결 후
+    # server.push(my_order_message("KRW-BTC", order_uuid)) / server.push(my_asset_message({"KRW": 10000}))
+    # 인증 헤더는 server.handshakes 에서 확인
+"""
+import base64
+import hashlib
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def ticker_message(market, trade_price, signed_change_rate=0.0, acc_trade_price_24h=0.0, **fields):
+    """ ✅ 업비트 ticker(DEFAULT 포맷) 형식의 메시지 생성 """
+    message = {
+        "type": "ticker",
+        "code": market,
+        "trade_price": trade_price,
+        "high_price": fields.pop("high_price", trade_price),
+        "low_price": fields.pop("low_price", trade_price),
+        "trade_volume": fields.pop("trade_volume", 0.0),
+        "signed_change_rate": signed_change_rate,
+        "acc_trade_price_24h": acc_trade_price_24h,
+        "acc_trade_volume_24h": fields.pop("acc_trade_volume_24h", 0.0),
+        "timestamp": int(time.time() * 1000),
+        "stream_type": "REALTIME",
+    }
+    message.update(fields)
+    return message
+
+
+def my_order_message(market, order_uuid, state="done", ask_bid="ASK", executed_volume=0.0, **fields):
+    """ ✅ 업비트 myOrder(DEFAULT 포맷) 형식의 메시지 생성 """
+    message = {
+        "type": "myOrder",
+        "code": market,
+        "uuid": order_uuid,
+        "ask_bid": ask_bid,
+        "state": state,
+        "executed_volume": executed_volume,
+        "remaining_volume": fields.pop("remaining_volume", 0.0),
+        "avg_price": fields.pop("avg_price", 0.0),
+        "timestamp": int(time.time() * 1000),
+        "stream_type": "REALTIME",
+    }
+    message.update(fields)
+    return message
+
+
+def my_asset_message(balances):
+    """ ✅ 업비트 myAsset 형식의 메시지 생성 (balances: {currency: balance}) """
+    return {
+        "type": "myAsset",
+        "assets": [{"currency": currency, "balance": balance, "locked": 0.0} for currency, balance in balances.items()],
+        "asset_timestamp": int(time.time() * 1000),
+        "timestamp": int(time.time() * 1000),
+        "stream_type": "REALTIME",
+    }
+
+
+def read_frame(sock):
+    """ ✅ 웹소켓 프레임 하나 읽기 → (opcode, payload) """
+    header = _recv_exact(sock, 2)
+    opcode = header[0] & 0x0F
+    masked = header[1] & 0x80
+    length = header[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", _recv_exact(sock, 8))[0]
+    mask = _recv_exact(sock, 4) if masked else b""
+    payload = _recv_exact(sock, length)
+    if masked:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def write_frame(sock, payload, opcode=OPCODE_BINARY):
+    """ ✅ 웹소켓 프레임 쓰기 (서버 → 클라이언트는 마스킹하지 않음) """
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    sock.sendall(header + payload)
+
+
+def _recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+class _StubHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server.stub
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.request.recv(1024)
+            if not chunk:
+                return
+            request += chunk
+
+        header_lines = request.decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        self.request.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+
+        server.handshakes.append({"path": header_lines[0].split(" ")[1], "headers": headers})
+        with server.lock:
+            server.clients.append(self.request)
+
+        try:
+            while True:
+                opcode, payload = read_frame(self.request)
+                if opcode == OPCODE_CLOSE:
+                    write_frame(self.request, payload, OPCODE_CLOSE)
+                    break
+                if opcode == OPCODE_PING:
+                    write_frame(self.request, payload, OPCODE_PONG)
+                    continue
+                if opcode in (OPCODE_TEXT, OPCODE_BINARY):
+                    subscription = json.loads(payload.decode("utf-8"))
+                    server.subscriptions.append(subscription)
+                    for message in server.on_subscribe(subscription):
+                        write_frame(self.request, json.dumps(message).encode("utf-8"))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with server.lock:
+                if self.request in server.clients:
+                    server.clients.remove(self.request)
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StubUpbitServer:
+    """ ✅ 구독 요청을 기록하고 push() 한 메시지를 모든 클라이언트에 전송하는 스텁 서버 """
+
+    def __init__(self, host="127.0.0.1", port=0, on_subscribe=None):
+        """
+        :param port: 0 이면 빈 포트 자동 할당
+        :param on_subscribe: 구독 요청 수신 시 즉시 보낼 메시지 리스트를 반환하는 함수
+        """
+        self.server = _ThreadingServer((host, port), _StubHandler)
+        self.server.stub = self
+        self.host, self.port = self.server.server_address
+        self.lock = threading.Lock()
+        self.clients = []
+        self.subscriptions = []
+        self.handshakes = []
+        self.on_subscribe = on_subscribe or (lambda subscription: [])
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/websocket/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.drop_clients()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def push(self, message):
+        """ ✅ 연결된 모든 클라이언트에 메시지 전송 (바이너리 프레임, 업비트와 동일) """
+        payload = json.dumps(message).encode("utf-8")
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                write_frame(client, payload)
+            except OSError:
+                pass
+
+    def drop_clients(self):
+        """ ✅ 모든 연결 강제 종료 (재연결 로직 확인용) """
+        with self.lock:
+            clients, self.clients = self.clients, []
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    # ✅ 단독 실행 시 구독한 마켓의 랜덤 시세를 1초에 10번 전송
+    prices = {}
+
+    def subscribe_all(subscription):
+        for item in subscription:
+            for market in item.get("codes", []):
+                prices.setdefault(market, 10000.0)
+        return []
+
+    stub = StubUpbitServer(port=8765, on_subscribe=subscribe_all).start()
+    print(f"📡 스텁 서버 실행 중: {stub.url}")
+    while True:
+        for market in list(prices):
+            prices[market] *= 1 + random.uniform(-0.001, 0.001)
+            stub.push(ticker_message(market, round(prices[market], 2), acc_trade_price_24h=1e9))
+        time.sleep(0.1)
@@ -0,0 +1,131 @@
+# trading/streamTrade/ticker_stream.py
+import json
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .upbit_stream import UpbitStream, UPBIT_WS_URL
+
+# ✅ 메모리 테이블 컬럼 (get_krw_market_coin_info() 의 필드와 동일)
+TICKER_FIELDS = (
+    "trade_price",
+    "high_price",
+    "low_price",
+    "trade_volume",
+    "signed_change_rate",
+    "acc_trade_price_24h",
+    "acc_trade_volume_24h",
+)
+FIELD_INDEX = {field: i for i, field in enumerate(TICKER_FIELDS)}
+
+
+class TickerStore:
+    """ ✅ 마켓별 최신 시세를 NumPy 배열에 보관하는 메모리 테이블 (네트워크 I/O 없이 조회) """
+
+    def __init__(self, markets=()):
+        self.lock = threading.Lock()
+        self.markets = []
+        self.index = {}
+        self.values = np.full((0, len(TICKER_FIELDS)), np.nan)
+        self.updated_at = np.zeros(0)
+        self.set_markets(markets)
+
+    def set_markets(self, markets):
+        """ ✅ 마켓 목록 변경 (기존 마켓의 시세는 유지) """
+        markets = list(markets)
+        values = np.full((len(markets), len(TICKER_FIELDS)), np.nan)
+        updated_at = np.zeros(len(markets))
+        with self.lock:
+            for i, market in enumerate(markets):
+                old = self.index.get(market)
+                if old is not None:
+                    values[i] = self.values[old]
+                    updated_at[i] = self.updated_at[old]
+            self.markets = markets
+            self.index = {market: i for i, market in enumerate(markets)}
+            self.values = values
+            self.updated_at = updated_at
+
+    def update(self, market, ticker):
+        """ ✅ 시세 한 건 반영 (알 수 없는 마켓이면 False) """
+        i = self.index.get(market)
+        if i is None:
+            return False
+        row = [ticker.get(field, np.nan) for field in TICKER_FIELDS]
+        with self.lock:
+            self.values[i] = row
+            self.updated_at[i] = time.time()
+        return True
+
+    def get(self, market, field="trade_price"):
+        """ ✅ 특정 마켓의 필드 값 조회 (데이터 없으면 None) """
+        i = self.index.get(market)
+        if i is None:
+            return None
+        value = self.values[i, FIELD_INDEX[field]]
+        return None if np.isnan(value) else float(value)
+
+    def last_update(self):
+        """ ✅ 가장 최근 시세 수신 시각 (epoch 초) """
+        with self.lock:
+            return float(self.updated_at.max()) if len(self.updated_at) else 0.0
+
+    def snapshot(self):
+        """ ✅ get_krw_market_coin_info() 와 같은 형식의 리스트 반환 (24시간 거래대금 내림차순) """
+        with self.lock:
+            markets = self.markets
+            values = self.values.copy()
+            received = self.updated_at > 0
+
+        rows = np.flatnonzero(received)
+        order = rows[np.argsort(-values[rows, FIELD_INDEX["acc_trade_price_24h"]], kind="stable")]
+        return [
+            dict(market=markets[i], **{field: float(values[i, j]) for j, field in enumerate(TICKER_FIELDS)})
+            for i in order
+        ]
+
+
+class TickerStream(UpbitStream):
+    """ ✅ 업비트 공개 웹소켓 ticker 채널 구독 (자동 재연결/재구독) """
+
+    name = "ticker"
+
+    def __init__(self, markets, url=UPBIT_WS_URL, on_update=None, reconnect_delay=1, max_reconnect_delay=30):
+        """
+        :param markets: 구독할 마켓 코드 리스트 (예: ["KRW-BTC", "KRW-ETH"])
+        :param url: 웹소켓 주소 (테스트 시 로컬 스텁 서버 주소 사용)
+        :param on_update: 시세 수신 시 호출할 콜백 (인자: market)
+        """
+        super().__init__(url, reconnect_delay, max_reconnect_delay)
+        self.store = TickerStore(markets)
+        self.on_update = on_update
+
+    def resubscribe(self, markets):
+        """ ✅ 구독 마켓 변경 (연결 중이면 같은 연결로 새 구독 요청, 아니면 재연결 시 반영) """
+        if list(markets) == self.store.markets:
+            return
+        self.store.set_markets(markets)
+        if self.ws and self.is_connected:
+            self.ws.send(self.subscribe_message())
+
+    def is_fresh(self, max_age=5):
+        """ ✅ 연결되어 있고 최근 max_age 초 이내에 시세를 받았는지 확인 """
+        return self.is_connected and time.time() - self.store.last_update() <= max_age
+
+    def subscribe_message(self):
+        """ ✅ 업비트 ticker 구독 요청 메시지 """
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "ticker", "codes": self.store.markets},
+            {"format": "DEFAULT"},
+        ])
+
+    def handle_message(self, data):
+        if data.get("type") != "ticker":
+            return  # ✅ {"status": "UP"} 등 상태 메시지 무시
+
+        market = data.get("code")
+        if self.store.update(market, data) and self.on_update:
+            self.on_update(market)
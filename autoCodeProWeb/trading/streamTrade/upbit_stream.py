@@ -0,0 +1,104 @@
+# trading/streamTrade/upbit_stream.py
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+
+try:
+    import websocket  # ✅ websocket-client (스트리밍 모드에서만 필요)
+except ImportError:
+    websocket = None
+
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+UPBIT_PRIVATE_WS_URL = "wss://api.upbit.com/websocket/v1/private"
+
+
+class UpbitStream(ABC):
+    """ ✅ 업비트 웹소켓 공통 연결 관리 (구독 메시지 전송, 지수 백오프 재연결) """
+
+    name = "upbit"
+
+    def __init__(self, url, reconnect_delay=1, max_reconnect_delay=30):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.is_running = False
+        self.is_connected = False
+        self.reconnect_count = 0
+        self.ws = None
+        self.thread = None
+
+    def start(self):
+        """ ✅ 스트림 시작 (백그라운드 쓰레드) """
+        if websocket is None:
+            raise RuntimeError("websocket-client 패키지가 설치되어 있지 않습니다. (pip install websocket-client)")
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """ ✅ 스트림 중지 """
+        self.is_running = False
+        ws = self.ws
+        if ws:
+            ws.keep_running = False
+            if ws.sock:
+                # ✅ close() 는 수신 쓰레드와 종료 응답을 두고 경합해 최대 수 초 멈출 수 있음 → 소켓을 바로 끊어 수신 대기 해제
+                ws.sock.abort()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+
+    def connect_headers(self):
+        """ ✅ 연결 시 보낼 HTTP 헤더 (재연결마다 새로 생성) """
+        return None
+
+    @abstractmethod
+    def subscribe_message(self):
+        """ ✅ 연결 직후 보낼 구독 요청 메시지 (JSON 문자열) """
+
+    @abstractmethod
+    def handle_message(self, data):
+        """ ✅ 수신 메시지 처리 (data: JSON 디코딩한 dict) """
+
+    def _run(self):
+        """ ✅ 연결 유지 루프 (끊기면 지수 백오프로 재연결) """
+        delay = self.reconnect_delay
+        while self.is_running:
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                header=self.connect_headers(),
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            started = time.time()
+            self.ws.run_forever(ping_interval=60, ping_timeout=10)
+            self.is_connected = False
+            if not self.is_running:
+                break
+
+            if time.time() - started > self.max_reconnect_delay:
+                delay = self.reconnect_delay  # ✅ 충분히 오래 연결되어 있었다면 대기 시간 초기화
+            self.reconnect_count += 1
+            print(f"🔄 {self.name} 웹소켓 재연결 대기 ({delay}초)")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _on_open(self, ws):
+        ws.send(self.subscribe_message())
+        self.is_connected = True
+        print(f"📡 {self.name} 웹소켓 구독 시작")
+
+    def _on_message(self, ws, message):
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+        self.handle_message(json.loads(message))
+
+    def _on_error(self, ws, error):
+        print(f"⚠️ {self.name} 웹소켓 오류: {error}")
+
+    def _on_close(self, ws, status_code, message):
+        self.is_connected = False
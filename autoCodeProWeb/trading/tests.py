@@ -1,3 +1,791 @@
-from django.test import TestCase
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from . import upbit_client
+from .candle_buffer import CandleRingBuffer, CandleStore, parse_candle_time
+from .aiTrade.downloader import UTC_FORMAT, CandleDownloader, _to_frame
+from .aiTrade.history_store import HistoryStore, import_downloaded
+from .aiTrade.lstm_dataset import MultiWindowDataset, WindowDataset, fold_samples, purged_folds
+from .aiTrade.lstm_features import FeatureFile, time_split
+from .aiTrade.lstm_registry import load_meta, load_scaler_meta, save_version
+from .aiTrade.resample import history_frame, resample_frame, resampled
+from .aiTrade.walk_forward import candle_slots, fold_key, make_folds
+from .indicatorTrade.streaming import IndicatorEngine
+from .indicatorTrade import indicators
+from .lstm_scorer import LSTMScorer
+from .rate_limiter import RateLimiter
+from .streamTrade.order_stream import OrderStream
+from .streamTrade.stub_server import StubUpbitServer, my_asset_message, my_order_message, ticker_message
+from .streamTrade.ticker_stream import TickerStore, TickerStream
+from .streamTrade.upbit_stream import UpbitStream
+
+
+def wait_until(condition, timeout=5.0, interval=0.02):
+    """ ✅ condition() 이 참이 될 때까지 대기 (시간 초과 시 False) """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return bool(condition())
+
+
+def subscribed_codes(subscription):
+    """ ✅ 구독 요청 메시지에서 ticker 마켓 목록 추출 """
+    return next((item["codes"] for item in subscription if item.get("type") == "ticker"), None)
+
+
+class StubServerTestCase(SimpleTestCase):
+    """ ✅ 로컬 스텁 웹소켓 서버를 테스트마다 새로 실행 """
+
+    def setUp(self):
+        self.server = StubUpbitServer().start()
+        self.addCleanup(self.server.stop)
+
+    def start_stream(self, stream):
+        stream.start()
+        self.addCleanup(stream.stop)
+        self.assertTrue(wait_until(lambda: stream.is_connected and self.server.clients), "웹소켓 연결 실패")
+        return stream
+
+
+class UpbitStreamTests(SimpleTestCase):
+    def test_hooks_are_abstract(self):
+        with self.assertRaises(TypeError):
+            UpbitStream("ws://127.0.0.1:1")
+
+
+class TickerStoreTests(SimpleTestCase):
+    def test_unknown_market_is_ignored(self):
+        store = TickerStore(["KRW-BTC"])
+        self.assertFalse(store.update("KRW-XRP", ticker_message("KRW-XRP", 1000)))
+        self.assertIsNone(store.get("KRW-BTC"))
+
+    def test_set_markets_keeps_existing_prices(self):
+        store = TickerStore(["KRW-BTC", "KRW-ETH"])
+        store.update("KRW-ETH", ticker_message("KRW-ETH", 3000000))
+        store.set_markets(["KRW-ETH", "KRW-XRP"])
+        self.assertEqual(store.get("KRW-ETH"), 3000000)
+        self.assertIsNone(store.get("KRW-XRP"))
+        self.assertIsNone(store.get("KRW-BTC"))
+
+    def test_snapshot_sorted_by_trade_value(self):
+        store = TickerStore(["KRW-BTC", "KRW-ETH", "KRW-XRP"])
+        store.update("KRW-BTC", ticker_message("KRW-BTC", 50000000, acc_trade_price_24h=1e9))
+        store.update("KRW-ETH", ticker_message("KRW-ETH", 3000000, acc_trade_price_24h=5e9))
+        snapshot = store.snapshot()
+        self.assertEqual([coin["market"] for coin in snapshot], ["KRW-ETH", "KRW-BTC"])  # ✅ 미수신 종목 제외
+        self.assertEqual(snapshot[1]["trade_price"], 50000000)
+
+
+class TickerStreamTests(StubServerTestCase):
+    def test_subscribe_and_push(self):
+        updates = []
+        stream = self.start_stream(TickerStream(["KRW-BTC", "KRW-ETH"], url=self.server.url,
+                                                on_update=updates.append))
+        self.assertTrue(wait_until(lambda: self.server.subscriptions))
+        self.assertEqual(subscribed_codes(self.server.subscriptions[0]), ["KRW-BTC", "KRW-ETH"])
+
+        self.server.push(ticker_message("KRW-BTC", 50000000, acc_trade_price_24h=1e9))
+        self.server.push({"status": "UP"})  # ✅ 상태 메시지는 무시
+        self.assertTrue(wait_until(lambda: stream.store.get("KRW-BTC") == 50000000))
+        self.assertEqual(updates, ["KRW-BTC"])
+        self.assertTrue(stream.is_fresh(max_age=5))
+
+    def test_resubscribe_on_live_connection(self):
+        stream = self.start_stream(TickerStream(["KRW-BTC"], url=self.server.url))
+        self.assertTrue(wait_until(lambda: len(self.server.subscriptions) == 1))
+
+        stream.resubscribe(["KRW-BTC", "KRW-NEW"])
+        self.assertTrue(wait_until(lambda: len(self.server.subscriptions) == 2))
+        self.assertEqual(subscribed_codes(self.server.subscriptions[1]), ["KRW-BTC", "KRW-NEW"])
+        self.assertEqual(len(self.server.handshakes), 1)  # ✅ 재연결 없이 같은 연결로 구독 변경
+        self.assertEqual(stream.reconnect_count, 0)
+
+        self.server.push(ticker_message("KRW-NEW", 1234))
+        self.assertTrue(wait_until(lambda: stream.store.get("KRW-NEW") == 1234))
+
+        stream.resubscribe(["KRW-BTC", "KRW-NEW"])  # ✅ 목록이 같으면 요청하지 않음
+        time.sleep(0.1)
+        self.assertEqual(len(self.server.subscriptions), 2)
+
+    def test_reconnect_after_drop(self):
+        stream = self.start_stream(TickerStream(["KRW-BTC"], url=self.server.url, reconnect_delay=0.05))
+        self.assertTrue(wait_until(lambda: len(self.server.subscriptions) == 1))
+
+        self.server.drop_clients()
+        self.assertTrue(wait_until(lambda: len(self.server.handshakes) == 2 and len(self.server.subscriptions) == 2))
+        self.assertEqual(subscribed_codes(self.server.subscriptions[1]), ["KRW-BTC"])
+        self.assertEqual(stream.reconnect_count, 1)
+
+        self.assertTrue(wait_until(lambda: stream.is_connected and self.server.clients))
+        self.server.push(ticker_message("KRW-BTC", 51000000))
+        self.assertTrue(wait_until(lambda: stream.store.get("KRW-BTC") == 51000000))
+
+
+class OrderStreamTests(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tokens = iter(f"token-{i}" for i in range(1, 100))
+        self.orders = []
+        self.balances = []
+        self.stream = OrderStream(lambda: next(self.tokens), url=self.server.url, on_order=self.orders.append,
+                                  on_asset=self.balances.append, reconnect_delay=0.05)
+
+    def test_auth_header_per_connection(self):
+        self.start_stream(self.stream)
+        self.assertEqual(self.server.handshakes[0]["headers"]["authorization"], "Bearer token-1")
+        self.assertTrue(wait_until(lambda: self.server.subscriptions))
+        types = [item.get("type") for item in self.server.subscriptions[0] if "type" in item]
+        self.assertEqual(types, ["myOrder", "myAsset"])
+
+        self.server.drop_clients()
+        self.assertTrue(wait_until(lambda: len(self.server.handshakes) == 2))
+        self.assertEqual(self.server.handshakes[1]["headers"]["authorization"], "Bearer token-2")  # ✅ 재연결 시 새 JWT
+
+    def test_my_order_event(self):
+        self.start_stream(self.stream)
+        self.server.push(my_order_message("KRW-BTC", "order-1", state="done", ask_bid="ASK", executed_volume=0.5))
+        self.assertTrue(wait_until(lambda: self.orders))
+        self.assertEqual(self.orders[0]["side"], "ask")
+        self.assertEqual(self.orders[0]["market"], "KRW-BTC")
+        self.assertEqual(self.stream.get_order_states(["order-1", "order-2"]), {"order-1": self.orders[0]})
+
+        # ✅ REST 결과는 스트림으로 받은 상태를 덮어쓰지 않음
+        self.stream.seed_orders({"order-1": {"state": "wait"}, "order-2": {"state": "wait"}})
+        states = self.stream.get_order_states(["order-1", "order-2"])
+        self.assertEqual(states["order-1"]["state"], "done")
+        self.assertEqual(states["order-2"]["state"], "wait")
+
+    def test_my_asset_event(self):
+        self.start_stream(self.stream)
+        self.server.push(my_asset_message({"KRW": 100000.0, "BTC": 0.1}))
+        self.assertTrue(wait_until(lambda: self.balances))
+        self.server.push(my_asset_message({"KRW": 50000.0}))
+        self.assertTrue(wait_until(lambda: len(self.balances) == 2))
+        self.assertEqual(self.balances[1], {"KRW": {"balance": 50000.0, "locked": 0.0},
+                                            "BTC": {"balance": 0.1, "locked": 0.0}})
+
+
+class _ErrorHandler(BaseHTTPRequestHandler):
+    """ ✅ 항상 server.status (기본 500) 응답, 받은 요청 수 / Authorization 헤더 기록 """
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("Authorization"))
+        body = b'{"error": {"name": "server_error"}}'
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UpbitClientRetryTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ErrorHandler)
+        self.server.requests = []
+        self.server.status = 500
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        for patcher in (mock.patch.object(upbit_client, "UPBIT_API_URL", url),
+                        mock.patch.object(upbit_client, "rate_limiter", RateLimiter()),
+                        mock.patch("trading.rate_limiter.PENALTY_SECONDS", 0.01)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_public_request_retries_server_errors(self):
+        response = upbit_client.upbit_get("/v1/ticker", params={"markets": "KRW-BTC"})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(self.server.requests), 4)  # ✅ 1회 + 재시도 3회
+
+    def test_signed_request_is_not_resent(self):
+        response = upbit_client.upbit_get("/v1/accounts", headers={"Authorization": "Bearer token"})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.server.requests, ["Bearer token"])  # ✅ 같은 nonce 로 다시 보내지 않음
+
+    def test_throttled_signed_request_with_fixed_headers(self):
+        self.server.status = 429
+        response = upbit_client.upbit_get("/v1/accounts", headers={"Authorization": "Bearer token"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.server.requests, ["Bearer token"])
+
+    def test_throttled_signed_request_is_resigned(self):
+        self.server.status = 429
+        tokens = iter(f"Bearer token-{i}" for i in range(1, 10))
+        response = upbit_client.upbit_get("/v1/accounts", headers=lambda: {"Authorization": next(tokens)})
+        self.assertEqual(response.status_code, 429)
+        # ✅ 1회 + 429 재시도 3회, 매번 새 토큰
+        self.assertEqual(self.server.requests, [f"Bearer token-{i}" for i in range(1, 5)])
+
+
+class _Response:
+    def __init__(self, status_code=200, remaining=None):
+        self.status_code = status_code
+        self.headers = {"Remaining-Req": remaining} if remaining else {}
+
+
+class RateLimiterTests(SimpleTestCase):
+    def test_server_group_replaces_guess(self):
+        limiter = RateLimiter()
+        route = ("GET", "/v1/orders/uuids")
+        group = limiter.group_for(*route)
+        self.assertEqual(group, "default")
+        limiter.acquire(group)
+        limiter.update(group, _Response(remaining="group=order-query; min=1800; sec=0"), route)
+
+        # ✅ 이후 같은 요청은 서버가 알려준 그룹 버킷에서 토큰을 가져감 (남은 한도 0 → 대기)
+        self.assertEqual(limiter.group_for(*route), "order-query")
+        self.assertFalse(limiter.acquire(limiter.group_for(*route), timeout=0.02))
+        self.assertTrue(limiter.acquire("default", timeout=0.02))
+
+    def test_throttled_group_blocks(self):
+        limiter = RateLimiter()
+        limiter.update("ticker", _Response(429, "group=ticker; min=600; sec=0"), ("GET", "/v1/ticker"))
+        self.assertFalse(limiter.acquire("ticker", timeout=0.05))
+        self.assertEqual(limiter.get_stats()["ticker"]["throttled"], 1)
+
+
+class OrderStateCacheTests(SimpleTestCase):
+    def setUp(self):
+        from . import utils
+        self.utils = utils
+        patcher = mock.patch.dict(utils.order_state_cache, {"data": {}, "requested": set(), "timestamp": 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_batch_is_not_cached(self):
+        failed = mock.Mock(status_code=500, json=lambda: {"error": {"name": "server_error"}})
+        done = mock.Mock(status_code=200, json=lambda: [{"uuid": "a", "state": "done", "side": "bid",
+                                                         "executed_volume": "1.0", "remaining_volume": "0"}])
+        with mock.patch.object(self.utils, "upbit_get", side_effect=[failed, done]) as upbit_get:
+            self.assertEqual(self.utils.get_order_states(["a"], max_age=60), {})
+            states = self.utils.get_order_states(["a"], max_age=60)  # ✅ 실패한 주문은 캐시 없이 다시 조회
+        self.assertEqual(upbit_get.call_count, 2)
+        self.assertEqual(states["a"]["state"], "done")
+
+
+class MarketSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        from . import utils
+        self.utils = utils
+        self.notified = []
+        for patcher in (mock.patch.dict(utils.market_snapshot_cache, {"data": None, "timestamp": 0}),
+                        mock.patch.object(utils, "price_listeners", [self.notified.append]),
+                        mock.patch.object(utils, "ticker_stream", None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, price, notify):
+        coin_data = [{"market": "KRW-BTC", "trade_price": price}]
+        with mock.patch.object(self.utils, "get_krw_market_coin_info", return_value=coin_data):
+            return self.utils.get_market_snapshot(max_age=0, notify=notify)
+
+    def test_notify_price_changes(self):
+        self.fetch(100, notify=True)
+        self.fetch(100, notify=True)  # ✅ 가격이 같으면 알리지 않음
+        self.assertEqual(self.notified, ["KRW-BTC"])
+
+    def test_notify_false_skips_listeners(self):
+        self.fetch(100, notify=False)
+        self.fetch(200, notify=False)
+        self.assertEqual(self.notified, [])
+        self.fetch(200, notify=True)  # ✅ 조용히 갱신한 가격 기준으로 비교
+        self.assertEqual(self.notified, [])
+
+
+class IndicatorEngineRankTests(SimpleTestCase):
+    def test_rank_matches_batch_indicators(self):
+        rng = np.random.default_rng(7)
+        prices = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (20, 80)), axis=1))
+        markets = [f"KRW-C{i}" for i in range(len(prices))]
+        engine = IndicatorEngine()
+        for column in prices.T:  # ✅ 틱마다 전체 종목 현재가 1열씩 반영
+            for market, price in zip(markets, column):
+                engine.update(market, price)
+
+        expected = []
+        for row in prices:  # ✅ indicators.py 배치 함수로 같은 점수 계산
+            series = pd.Series(row)
+            rsi = indicators.calculate_rsi(series)
+            macd, signal = indicators.calculate_macd(series)
+            expected.append((macd - signal) / row[-1] if macd > signal and rsi < 70 else np.nan)
+        self.assertTrue(np.isfinite(expected).any())
+        np.testing.assert_allclose(engine.rank(markets), expected, rtol=1e-9)
+
+    def test_values_match_batch_indicators(self):
+        rng = np.random.default_rng(3)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, 120)))
+        high, low = close * 1.002, close * 0.998
+        engine = IndicatorEngine()
+        engine.warm_up("KRW-BTC", close, high, low)
+        values = engine.get("KRW-BTC")
+
+        close_s, high_s, low_s = pd.Series(close), pd.Series(high), pd.Series(low)
+        self.assertAlmostEqual(values["rsi"], indicators.calculate_rsi(close_s), places=9)
+        self.assertAlmostEqual(values["macd"], indicators.calculate_macd(close_s)[0], places=9)
+        self.assertAlmostEqual(values["stochastic_k"], indicators.calculate_stochastic(close_s, high_s, low_s)[0], places=9)
+        self.assertAlmostEqual(values["stochastic_d"], indicators.calculate_stochastic(close_s, high_s, low_s)[1], places=9)
+        self.assertAlmostEqual(values["ema"][20], indicators.calculate_ema(close_s, 20), places=9)
+        self.assertAlmostEqual(values["bollinger_upper"], indicators.calculate_bollinger_bands(close_s)[0], places=9)
+        self.assertAlmostEqual(values["atr"], indicators.calculate_atr(high_s, low_s, close_s), places=9)
+
+    def test_rank_requires_history(self):
+        engine = IndicatorEngine()
+        for price in range(100, 110):
+            engine.update("KRW-BTC", float(price))
+        self.assertEqual(engine.count("KRW-BTC"), 10)
+        self.assertTrue(np.isnan(engine.rank(["KRW-BTC", "KRW-ETH"], min_count=35)).all())
+
+
+class WalkForwardFoldTests(SimpleTestCase):
+    def setUp(self):
+        self.times = pd.date_range("2026-01-01 09:00", periods=600, freq="min").to_numpy()
+        self.prices = np.linspace(100.0, 200.0, len(self.times))
+
+    def fold_ranges(self, offset, count=400):
+        times, prices = self.times[offset:offset + count], self.prices[offset:offset + count]
+        folds = make_folds(len(prices), 100, 50, slots=candle_slots(times, "1"))
+        return {fold_key("KRW-BTC", "1", times, prices, fold, {}): (times[fold[0]], times[fold[1]], times[fold[2] - 1])
+                for fold in folds}
+
+    def test_folds_stable_when_window_slides(self):
+        before, after = self.fold_ranges(0), self.fold_ranges(77)  # ✅ 최근 400개 창이 77분 밀림
+        last_time = self.times[399]
+        new = {key for key, times in after.items() if times[2] > last_time}
+        self.assertEqual(len(new), 1)  # ✅ 새로 생긴 마지막 구간만 다시 계산
+        self.assertGreaterEqual(len(after), 4)
+        self.assertLessEqual(set(after) - new, set(before))
+
+    def test_boundaries_on_epoch_grid(self):
+        slots = candle_slots(self.times, "1")
+        for start, train_end, end in make_folds(len(slots), 100, 50, slots=slots):
+            self.assertEqual(slots[train_end] % 50, 0)
+            self.assertEqual(end - train_end, 50)
+            self.assertEqual(train_end - start, 100)
+
+    def test_missing_candles_keep_grid(self):
+        slots = candle_slots(np.delete(self.times, [120, 121, 250]), "1")  # ✅ 거래 없는 분은 캔들 없음
+        folds = make_folds(len(slots), 100, 50, slots=slots)
+        self.assertTrue(all(slots[train_end] % 50 == 0 for _, train_end, _ in folds))
+        self.assertTrue(all(slots[end - 1] - slots[train_end] < 50 for _, train_end, end in folds))
+
+
+class _ReloadOnRead(dict):
+    """ ✅ 처음 읽을 때 모델 다시 로드(_apply)를 끼워 넣는 점수 dict (백그라운드 쓰레드 교체 재현) """
+
+    def __init__(self, data, reload):
+        super().__init__(data)
+        self.reload = reload
+
+    def _read(self):
+        reload, self.reload = self.reload, None
+        if reload:
+            reload()
+
+    def get(self, key, default=None):
+        self._read()
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._read()
+        return super().__contains__(key)
+
+
+class LSTMScorerTests(SimpleTestCase):
+    def test_score_survives_reload_while_reading(self):
+        scorer = LSTMScorer("missing_model.h5", "missing_scaler.json")
+        scorer.loaded, scorer.interval = True, 1
+        reload = lambda: scorer._apply(None, {"interval": 1, "time_steps": 60, "markets": {}}, None)
+        scorer.scores = _ReloadOnRead({"KRW-BTC": (0, 0.7), "KRW-ETH": (0, 0.4)}, reload)
+
+        self.assertEqual(scorer.score(["KRW-BTC", "KRW-ETH"]), {"KRW-BTC": 0.7, "KRW-ETH": 0.4})
+        self.assertEqual(scorer.scores, {})  # ✅ 다시 로드 후에는 새 dict 사용
+
+    def test_unscored_markets_with_scaler_are_held_back(self):
+        from . import auto_trade
+
+        scorer = LSTMScorer("missing_model.h5", "missing_scaler.json")
+        scorer.scalers = {"KRW-BTC": None, "KRW-ETH": None, "KRW-XRP": None}
+        coins = [{"market": market} for market in ("KRW-BTC", "KRW-ETH", "KRW-XRP", "KRW-DOGE")]
+        with mock.patch.object(auto_trade, "lstm_scorer", scorer), \
+                mock.patch.object(scorer, "score", return_value={"KRW-BTC": 0.7, "KRW-ETH": 0.3}), \
+                mock.patch.object(auto_trade, "LSTM_MIN_PROBABILITY", 0.5):
+            candidates = auto_trade.filter_lstm_candidates(coins)
+        # ✅ KRW-XRP: 아직 점수 없음 → 제외, KRW-DOGE: 학습하지 않은 종목 → 통과
+        self.assertEqual([coin["market"] for coin in candidates], ["KRW-BTC", "KRW-DOGE"])
+
+
+@unittest.skipUnless(importlib.util.find_spec("tensorflow"), "tensorflow 미설치")
+class LiteExportTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .dayTrading import build_lstm_model
+
+        cls.time_steps, cls.feature_count = 10, 4
+        rng = np.random.default_rng(0)
+        features = rng.random((200, cls.feature_count), dtype=np.float32)
+        cls.dataset = WindowDataset(features, rng.integers(0, 2, 200), time_steps=cls.time_steps, batch_size=16)
+        cls.samples = cls.dataset.batch(0)[0]
+        cls.model = build_lstm_model((cls.time_steps, cls.feature_count), units=8, layers=1, dense_units=4)
+
+    def export(self, quantize):
+        from .aiTrade.lstm_export import export_lite
+
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, f"model_{quantize or 'float32'}.tflite")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        self.addCleanup(os.rmdir, directory)
+        representative = self.dataset if quantize == "int8" else None
+        parity = export_lite(self.model, path, quantize=quantize, samples=self.samples, representative=representative)
+        return path, parity
+
+    def test_export_passes_parity(self):
+        for quantize in (None, "float16", "int8"):
+            with self.subTest(quantize=quantize):
+                path, parity = self.export(quantize)
+                self.assertTrue(parity["passed"], parity)
+                self.assertTrue(os.path.exists(path))
+                self.assertFalse(os.path.exists(f"{path}.tmp"))
+
+    def test_lite_model_batch_sizes(self):
+        from .aiTrade.lstm_export import LiteModel
+
+        path, _ = self.export(None)
+        lite = LiteModel(path)
+        expected = self.model(self.samples, training=False).numpy()
+        for size in (1, len(self.samples), 1):  # ✅ 배치 크기 변경 후 다시 1 로
+            with self.subTest(size=size):
+                output = lite(self.samples[:size])
+                self.assertEqual(output.shape, (size, 1))
+                np.testing.assert_allclose(output, expected[:size], atol=1e-4)
+
+
+class PurgedFoldTests(SimpleTestCase):
+    def test_labels_stay_inside_fold(self):
+        time_steps = 10
+        for fold in purged_folds(0, 500, n_splits=4, embargo=3):
+            train_start, train_end, validation_start, validation_end = fold
+            train, validation = fold_samples(fold, time_steps)
+            # ✅ 샘플 i 의 정답은 i + time_steps + 1 번째 캔들 종가까지 사용
+            self.assertLess(train[-1] + time_steps + 1, train_end)
+            self.assertLess(validation[-1] + time_steps + 1, validation_end)
+            self.assertEqual(train[-1] + time_steps + 1, train_end - 1)
+            self.assertGreaterEqual(validation[0], validation_start)
+
+
+def candle(utc, close, volume=1.0):
+    """ ✅ 업비트 캔들 응답 1개 (시가=고가=저가=종가) """
+    return {"candle_date_time_utc": utc, "opening_price": close, "high_price": close, "low_price": close,
+            "trade_price": close, "candle_acc_trade_volume": volume}
+
+
+class CandleRingBufferTests(SimpleTestCase):
+    def test_wrap_around_keeps_latest_contiguous(self):
+        buffer = CandleRingBuffer(capacity=4)
+        for i in range(7):
+            self.assertTrue(buffer.append(i * 1000, (i, i, i, i, 1.0)))
+        timestamps, values = buffer.view()
+        self.assertEqual(timestamps.tolist(), [3000, 4000, 5000, 6000])  # ✅ 가장 오래된 3개는 밀려남
+        self.assertEqual(buffer.columns(2)["close"].tolist(), [5.0, 6.0])
+        self.assertFalse(values.flags.writeable)
+
+    def test_in_progress_candle_is_overwritten(self):
+        buffer = CandleRingBuffer(capacity=4)
+        buffer.append(1000, (1, 1, 1, 1, 1.0))
+        buffer.append(2000, (2, 2, 2, 2, 1.0))
+        self.assertTrue(buffer.append(2000, (2, 3, 2, 2.5, 4.0)))  # ✅ 같은 시각 → 마지막 캔들 갱신
+        timestamps, _ = buffer.view()
+        self.assertEqual(timestamps.tolist(), [1000, 2000])
+        self.assertEqual(buffer.columns()["close"].tolist(), [1.0, 2.5])
+        self.assertEqual(buffer.columns()["volume"].tolist(), [1.0, 4.0])
+
+    def test_out_of_order_candle_is_rejected(self):
+        buffer = CandleRingBuffer(capacity=4)
+        buffer.append(2000, (2, 2, 2, 2, 1.0))
+        self.assertFalse(buffer.append(1000, (1, 1, 1, 1, 1.0)))
+        self.assertEqual(buffer.view()[0].tolist(), [2000])
+
+
+class CandleStoreTests(SimpleTestCase):
+    def test_incremental_update(self):
+        responses = [
+            [candle("2026-01-01T00:00:02", 12), candle("2026-01-01T00:00:01", 11), candle("2026-01-01T00:00:00", 10)],
+            [candle("2026-01-01T00:00:03", 13), candle("2026-01-01T00:00:02", 12.5)],  # ✅ 진행 중이던 캔들 갱신 포함
+        ]
+        requested = []
+
+        def fetch(market, count):
+            requested.append(count)
+            return responses.pop(0)
+
+        store = CandleStore(fetch, unit_seconds=1, capacity=5)
+        self.assertEqual(store.update("KRW-BTC"), 3)
+        self.assertEqual(requested, [5])  # ✅ 처음에는 버퍼 크기만큼
+        with mock.patch("trading.candle_buffer.time.time", return_value=parse_candle_time("2026-01-01T00:00:03") / 1000):
+            self.assertEqual(store.update("KRW-BTC"), 2)
+        self.assertEqual(requested[1], 2)  # ✅ 마지막 캔들부터 현재까지만
+        self.assertEqual(store.get("KRW-BTC", refresh=False)["close"].tolist(), [10, 11, 12.5, 13])
+
+    def test_failed_fetch(self):
+        store = CandleStore(lambda market, count: None, capacity=5)
+        self.assertIsNone(store.update("KRW-BTC"))
+        self.assertEqual(store.stats["requests"], 0)
+
+
+class CandleDataTests(SimpleTestCase):
+    def test_frame_is_not_a_buffer_view(self):
+        from . import utils
+
+        store = CandleStore(lambda market, count: [], capacity=3)
+        for i in range(3):
+            store.buffer("KRW-BTC").append(i * 1000, (i, i, i, i, 1.0))
+        with mock.patch.object(utils, "candle_store", store):
+            frame = utils.get_candle_data("KRW-BTC", count=3)
+            store.buffer("KRW-BTC").append(3000, (9, 9, 9, 9, 1.0))  # ✅ 링 버퍼가 한 바퀴 돌며 덮어씀
+        self.assertEqual(frame["close"].tolist(), [0.0, 1.0, 2.0])
+
+
+def upbit_candle(utc, close):
+    """ ✅ 업비트 분봉 API 응답 형식 캔들 1개 """
+    kst = (pd.Timestamp(utc) + pd.Timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%S")
+    return {"candle_date_time_utc": utc, "candle_date_time_kst": kst, "opening_price": close, "high_price": close,
+            "low_price": close, "trade_price": close, "candle_acc_trade_volume": 1.0}
+
+
+class CandleDownloaderTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_corrupt_checkpoint_is_rescanned(self):
+        downloader = CandleDownloader("KRW-BTC", "1", self.directory.name)
+        downloader._save_part(_to_frame([upbit_candle("2026-01-01T00:00:00", 1),
+                                         upbit_candle("2026-01-01T00:01:00", 2)]), "back")
+        with open(downloader.checkpoint_path, "w", encoding="utf-8") as f:
+            f.write('{"oldest": "2026-')  # ✅ 저장 중 중단된 파일
+
+        checkpoint = CandleDownloader("KRW-BTC", "1", self.directory.name).checkpoint
+        self.assertEqual(checkpoint["oldest"], "2026-01-01T00:00:00")
+        self.assertEqual(checkpoint["newest"], "2026-01-01T00:01:00")
+        self.assertFalse(checkpoint["backfill_done"])
+
+    def test_resume_and_update_newest(self):
+        start = pd.Timestamp("2026-01-01T00:00:00")
+        candles = [upbit_candle((start + pd.Timedelta(minutes=i)).strftime(UTC_FORMAT), i) for i in range(450)]
+        now = [start + pd.Timedelta(minutes=450)]
+
+        def fetch(market, interval, to_time):
+            to = to_time.strftime(UTC_FORMAT)
+            return [c for c in reversed(candles) if c["candle_date_time_utc"] < to][:200]
+
+        with mock.patch("trading.aiTrade.downloader.fetch_page", side_effect=fetch), \
+                mock.patch("trading.aiTrade.downloader.utc_now", side_effect=lambda: now[0].to_pydatetime()):
+            downloader = CandleDownloader("KRW-BTC", "1", self.directory.name, page_workers=2, batch_pages=2)
+            self.assertEqual(downloader.run(), (0, 450))
+            self.assertTrue(downloader.checkpoint["backfill_done"])
+
+            candles.extend(upbit_candle((start + pd.Timedelta(minutes=i)).strftime(UTC_FORMAT), i) for i in range(450, 460))
+            now[0] += pd.Timedelta(minutes=10)
+            self.assertEqual(CandleDownloader("KRW-BTC", "1", self.directory.name).run(), (10, 0))
+
+        df = downloader.load()
+        self.assertEqual(df["trade_price"].tolist(), list(range(460)))
+
+
+class HistoryStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    @staticmethod
+    def frame(times, prices):
+        return pd.DataFrame({"time": pd.to_datetime(times), "opening_price": prices, "high_price": prices,
+                             "low_price": prices, "trade_price": prices, "candle_acc_trade_volume": 1.0})
+
+    def test_write_across_months(self):
+        store = HistoryStore("KRW-BTC", "1", self.directory.name)
+        store.write(self.frame(["2026-02-01 00:00", "2026-01-31 23:59"], [3, 2]))
+        self.assertEqual(store.write(self.frame(["2026-01-31 23:58", "2026-02-01 00:00"], [1, 4])), 3)
+        self.assertEqual(store.months, ["2026-01", "2026-02"])
+
+        store = HistoryStore("KRW-BTC", "1", self.directory.name)  # ✅ 디스크에서 다시 열기
+        self.assertEqual(store.frame()["trade_price"].tolist(), [1, 2, 4])  # ✅ 같은 시각은 새 값으로 덮어씀
+        self.assertEqual(store.frame("2026-01-31 23:59", "2026-02-01 00:00")["trade_price"].tolist(), [2])
+        self.assertEqual(store.tail(2)["trade_price"].tolist(), [2, 4])
+        self.assertEqual(store.tail(5, end="2026-02-01")["trade_price"].tolist(), [1, 2])
+        self.assertEqual(store.first_time(), pd.Timestamp("2026-01-31 23:58"))
+        self.assertEqual(store.last_time(), pd.Timestamp("2026-02-01 00:00"))
+
+    def test_import_downloaded_reads_new_parts_only(self):
+        downloader = CandleDownloader("KRW-BTC", "1", self.directory.name)
+        downloader._save_part(_to_frame([upbit_candle("2026-01-01T00:01:00", 1), upbit_candle("2026-01-01T00:02:00", 2)]), "back")
+        import_downloaded(downloader, store_dir=self.directory.name)
+
+        downloader._save_part(_to_frame([upbit_candle("2026-01-01T00:00:00", 0)]), "back")
+        downloader._save_part(_to_frame([upbit_candle("2026-01-01T00:02:00", 2.5),
+                                         upbit_candle("2026-01-01T00:03:00", 3)]), "new")
+        with mock.patch("trading.aiTrade.downloader.pd.read_csv", wraps=pd.read_csv) as read_csv:
+            store = import_downloaded(downloader, store_dir=self.directory.name)
+        self.assertEqual(read_csv.call_count, 2)  # ✅ 이미 기록한 part 는 다시 읽지 않음
+        self.assertEqual(store.frame()["trade_price"].tolist(), [0, 1, 2.5, 3])
+        self.assertEqual(store.frame()["time"].tolist(), downloader.load()["time"].tolist())
+
+
+class ResampleTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        times = pd.date_range("2026-01-01 08:57", periods=40, freq="min")  # ✅ KST (UTC 23:57 부터)
+        prices = np.arange(40, dtype=float)
+        self.df = pd.DataFrame({"time": times, "opening_price": prices, "high_price": prices + 1,
+                                "low_price": prices - 1, "trade_price": prices + 0.5, "candle_acc_trade_volume": 1.0})
+
+    def test_buckets_on_utc_boundaries(self):
+        df = resample_frame(self.df.iloc[:8], 5)
+        self.assertEqual(df["time"].tolist(), [pd.Timestamp("2026-01-01 08:55"), pd.Timestamp("2026-01-01 09:00")])
+        self.assertEqual(df["opening_price"].tolist(), [0, 3])
+        self.assertEqual(df["high_price"].tolist(), [3, 8])
+        self.assertEqual(df["low_price"].tolist(), [-1, 2])
+        self.assertEqual(df["trade_price"].tolist(), [2.5, 7.5])
+        self.assertEqual(df["candle_acc_trade_volume"].tolist(), [3, 5])
+
+    def test_incremental_equals_full(self):
+        base = HistoryStore("KRW-BTC", "1", self.directory.name)
+        base.write(self.df.iloc[:17])
+        resampled("KRW-BTC", 5, store_dir=self.directory.name)
+        base.write(self.df.iloc[17:])  # ✅ 진행 중이던 마지막 구간 이후 캔들 추가
+        with mock.patch.object(HistoryStore, "clear", side_effect=AssertionError("full rebuild")):
+            incremental = history_frame("KRW-BTC", "5", store_dir=self.directory.name)
+        pd.testing.assert_frame_equal(incremental, resample_frame(self.df, 5))
+
+    def test_backfill_rebuilds(self):
+        base = HistoryStore("KRW-BTC", "1", self.directory.name)
+        base.write(self.df.iloc[20:])
+        resampled("KRW-BTC", 5, store_dir=self.directory.name)
+        base.write(self.df.iloc[:20])  # ✅ 과거 캔들 추가 → 전체 다시 계산
+        pd.testing.assert_frame_equal(history_frame("KRW-BTC", "5", store_dir=self.directory.name),
+                                      resample_frame(self.df, 5))
+
+
+class WindowDatasetTests(SimpleTestCase):
+    def setUp(self):
+        self.features = np.arange(60, dtype=np.float32).reshape(20, 3)
+        self.target = np.arange(20, dtype=np.float32)
+
+    def test_windows_match_copied_slices(self):
+        dataset = WindowDataset(self.features, self.target, time_steps=4, batch_size=5)
+        self.assertEqual(len(dataset), 4)  # ✅ 샘플 16개 / 배치 5개
+        inputs = np.concatenate([dataset.batch(i)[0] for i in range(len(dataset))])
+        labels = np.concatenate([dataset.batch(i)[1] for i in range(len(dataset))])
+        np.testing.assert_array_equal(inputs, np.stack([self.features[i:i + 4] for i in range(16)]))
+        np.testing.assert_array_equal(labels, self.target[4:])
+        np.testing.assert_array_equal(dataset.labels(), self.target[4:])
+        self.assertTrue(np.shares_memory(dataset.features, self.features))  # ✅ float32 입력은 복사하지 않음
+
+    def test_scaler_applied_per_batch(self):
+        from sklearn.preprocessing import MinMaxScaler
+
+        scaler = MinMaxScaler().fit(self.features)
+        dataset = WindowDataset(self.features, self.target, time_steps=4, batch_size=8, scaler=scaler)
+        inputs, _ = dataset.batch(0)
+        expected = np.stack([scaler.transform(self.features[i:i + 4]) for i in range(8)])
+        np.testing.assert_allclose(inputs, expected, rtol=1e-6)
+        self.assertEqual(self.features[0, 0], 0)  # ✅ 원본 배열은 그대로
+        np.testing.assert_allclose(dataset.batch(0)[0], expected, rtol=1e-6)  # ✅ 두 번 꺼내도 같은 값
+
+    def test_shuffle_and_subset(self):
+        dataset = WindowDataset(self.features, self.target, time_steps=4, batch_size=3, shuffle=True, seed=1)
+        labels = np.concatenate([y for _, y in dataset.batches()])
+        self.assertEqual(sorted(labels.tolist()), self.target[4:].tolist())  # ✅ 모든 샘플을 한 번씩
+
+        subset = dataset.subset(np.arange(10, 16), shuffle=False)
+        self.assertTrue(np.shares_memory(subset.features, dataset.features))
+        np.testing.assert_array_equal(np.concatenate([y for _, y in subset.batches()]), self.target[14:])
+
+    def test_multi_dataset_keeps_market_boundaries(self):
+        first = WindowDataset(self.features, self.target, time_steps=4, batch_size=4)
+        second = WindowDataset(self.features[:10] + 100, self.target[:10] + 100, time_steps=4, batch_size=4)
+        dataset = MultiWindowDataset([first, second], shuffle=True, seed=0)
+        self.assertEqual(len(dataset), 4 + 2)
+        batches = list(dataset.batches())
+        self.assertEqual(len(batches), 6)
+        for inputs, labels in batches:
+            self.assertTrue((inputs < 100).all() or (inputs >= 100).all())  # ✅ 종목이 섞인 배치/윈도우 없음
+        self.assertEqual(sum(len(labels) for _, labels in batches), 16 + 6)
+
+
+class FeatureFileTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.normal(0, 1, 300))
+        self.df = pd.DataFrame({"time": pd.date_range("2026-01-30 12:00", periods=300, freq="15min"),  # ✅ 월 경계 포함
+                                "opening_price": close, "high_price": close + 1, "low_price": close - 1,
+                                "trade_price": close, "candle_acc_trade_volume": rng.uniform(1, 2, 300)})
+
+    def feature_file(self, name, *frames):
+        store = HistoryStore("KRW-BTC", "15", os.path.join(self.directory.name, name, "store"))
+        feature_file = FeatureFile("KRW-BTC", "15", os.path.join(self.directory.name, name, "features"))
+        for frame in frames:
+            store.write(frame)
+            feature_file.update(store)
+        return feature_file
+
+    def test_incremental_equals_full(self):
+        changed = self.df.iloc[199:].copy()
+        changed.iloc[0, changed.columns.get_loc("trade_price")] += 0.5  # ✅ 진행 중이던 마지막 캔들 갱신
+        full = self.feature_file("full", pd.concat([self.df.iloc[:199], changed]))
+        incremental = self.feature_file("incremental", self.df.iloc[:200], changed)
+
+        self.assertEqual(len(incremental), len(full))
+        np.testing.assert_array_equal(incremental.times, full.times)
+        np.testing.assert_allclose(incremental.features, full.features, rtol=1e-6)
+        np.testing.assert_array_equal(incremental.target, full.target)
+        self.assertEqual(full.target[-1], 0)
+
+    def test_time_split_purges_boundary(self):
+        feature_file = self.feature_file("split", self.df)
+        train, validation, _ = time_split(feature_file, time_steps=10, validation_split=0.25)
+        # ✅ 마지막 학습 샘플의 정답 캔들(i + time_steps + 1)이 검증 샘플 입력보다 앞
+        self.assertLess(train.indices[-1] + 10 + 1, validation.indices[0])
+        self.assertEqual(len(train.indices) + 10 + 1 + len(validation.indices),
+                         len(feature_file.sample_indices(10)))
+
+
+class _SavedModel:
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(b"model")
+
+
+class LSTMRegistryTests(SimpleTestCase):
+    def test_save_and_load_version(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            lite_path = os.path.join(model_dir, "candidate.tflite")
+            with open(lite_path, "wb") as f:
+                f.write(b"lite")
+            scaler_meta = {"interval": "15", "time_steps": 60, "markets": {"KRW-BTC": {"data_min": [0], "data_max": [1]}}}
+            version = save_version(_SavedModel(), scaler_meta, {"version": "v1", "status": "rejected"}, lite_path=lite_path,
+                                   model_dir=model_dir)
+
+            self.assertEqual(load_scaler_meta(version, model_dir), dict(scaler_meta, version="v1"))
+            self.assertEqual(load_meta(version, model_dir)["status"], "rejected")
+            self.assertTrue(os.path.exists(os.path.join(model_dir, version, "model.tflite")))
+            self.assertIsNone(load_scaler_meta("missing", model_dir))
@@ -0,0 +1,64 @@
+# trading/tick_scheduler.py
+import time
+
+
+class TickScheduler:
+    """ ✅ 고정 주기 스케줄러 (실행 시간만큼 대기 시간을 줄여 주기가 밀리지 않도록 보정, 지연 통계 기록) """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.next_tick = time.monotonic()
+        self.ticks = 0
+        self.overruns = 0  # ✅ 실행 시간이 주기를 넘긴 횟수
+        self.skipped = 0  # ✅ 밀려서 건너뛴 틱 수
+        self.max_lag = 0.0  # ✅ 예정 시각 대비 최대 지연 (초)
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration = 0.0
+
+    def time_until_next(self):
+        """ ✅ 다음 틱까지 남은 시간 (초) """
+        return max(0.0, self.next_tick - time.monotonic())
+
+    def is_due(self):
+        return time.monotonic() >= self.next_tick
+
+    def wait(self):
+        """ ✅ 다음 틱 예정 시각까지 대기 """
+        remaining = self.time_until_next()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def run(self, func):
+        """ ✅ 틱 1회 실행 후 다음 예정 시각 계산 (밀린 틱은 몰아서 실행하지 않고 건너뜀) """
+        started = time.monotonic()
+        self.max_lag = max(self.max_lag, started - self.next_tick)
+        try:
+            return func()
+        finally:
+            finished = time.monotonic()
+            duration = finished - started
+            self.ticks += 1
+            self.total_duration += duration
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration, duration)
+
+            self.next_tick += self.interval
+            if finished > self.next_tick:
+                self.overruns += 1
+                missed = int((finished - self.next_tick) // self.interval) + 1
+                self.skipped += missed - 1
+                self.next_tick += missed * self.interval
+
+    def get_stats(self):
+        """ ✅ 틱 실행/지연 통계 """
+        return {
+            "interval": self.interval,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "max_lag": round(self.max_lag, 4),
+            "avg_duration": round(self.total_duration / self.ticks, 4) if self.ticks else 0.0,
+            "max_duration": round(self.max_duration, 4),
+            "last_duration": round(self.last_duration, 4),
+        }
@@ -0,0 +1,151 @@
+# trading/upbit_client.py
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from .rate_limiter import rate_limiter
+
+UPBIT_API_URL = "https://api.upbit.com"
+
+# ✅ 엔드포인트별 타임아웃 (연결, 읽기) 초 - 접두사가 가장 긴 항목 우선 적용
+ENDPOINT_TIMEOUTS = {
+    "/v1/orders": (2, 5),
+    "/v1/order": (2, 5),
+    "/v1/accounts": (2, 5),
+    "/v1/ticker": (2, 5),
+    "/v1/orderbook": (2, 5),
+    "/v1/candles": (3, 10),
+    "/v1/market/all": (3, 10),
+}
+DEFAULT_TIMEOUT = (3, 10)
+
+MAX_THROTTLE_RETRIES = 3  # ✅ 429 응답 시 스케줄러를 거쳐 다시 시도하는 횟수
+POOL_MAXSIZE = 20  # ✅ 자동매매 쓰레드 + 대시보드 요청 + 백필 작업 동시 사용 고려
+
+connection_stats = {"requests": 0, "new_connections": 0}
+stats_lock = threading.Lock()
+
+
+def _count_new_connection():
+    with stats_lock:
+        connection_stats["new_connections"] += 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count_new_connection()  # ✅ 새 TCP+TLS 핸드셰이크 발생
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """ ✅ 새 연결 생성 횟수를 집계하는 커넥션 풀 어댑터 """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def create_session(signed=False):
+    """
+    ✅ keep-alive 커넥션 풀 + 재시도(지수 백오프) 세션 생성
+    :param signed: True 이면 연결 실패만 재시도 (서명 요청은 같은 JWT nonce 로 다시 보낼 수 없음)
+    """
+    if signed:
+        # ✅ 연결 단계 실패는 요청이 서버에 전달되지 않았으므로 nonce 가 소비되지 않음 → 그 외(5xx, 읽기 오류)는 재시도 안 함
+        retry = Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.2, raise_on_status=False)
+    else:
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=2,
+            status=3,
+            backoff_factor=0.2,
+            status_forcelist=(500, 502, 503, 504),  # ✅ 429 는 rate_limiter 가 처리
+            allowed_methods=frozenset({"GET", "DELETE"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+    adapter = PooledAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+    new_session = requests.Session()
+    new_session.mount("https://", adapter)
+    new_session.mount("http://", adapter)
+    new_session.headers.update({"Accept": "application/json"})
+    return new_session
+
+
+session = create_session()  # ✅ 공개 API (시세, 호가, 캔들)
+signed_session = create_session(signed=True)  # ✅ 인증 헤더가 있는 요청 (계좌, 주문)
+
+
+def get_timeout(path):
+    """ ✅ 경로에 맞는 타임아웃 반환 """
+    matches = [prefix for prefix in ENDPOINT_TIMEOUTS if path.startswith(prefix)]
+    if not matches:
+        return DEFAULT_TIMEOUT
+    return ENDPOINT_TIMEOUTS[max(matches, key=len)]
+
+
+def upbit_request(method, path, params=None, json=None, headers=None, timeout=None, priority=None):
+    """
+    ✅ 공유 세션으로 업비트 API 호출 (Remaining-Req 기반 요청 스케줄링)
+    :param path: API 경로 (예: "/v1/ticker")
+    :param headers: 헤더 dict 또는 헤더를 만드는 함수 (서명 요청은 함수로 주면 429 재시도 때마다 새 JWT 로 서명)
+    :param timeout: None 이면 ENDPOINT_TIMEOUTS 기준 적용
+    :param priority: rate_limiter.PRIORITY_* (None 이면 현재 컨텍스트의 우선순위)
+    :return: requests.Response
+    """
+    if timeout is None:
+        timeout = get_timeout(path)
+    group = rate_limiter.group_for(method, path)
+    header_factory = headers if callable(headers) else None
+
+    for _ in range(MAX_THROTTLE_RETRIES + 1):
+        request_headers = header_factory() if header_factory else headers
+        signed = bool(request_headers and "Authorization" in request_headers)
+        rate_limiter.acquire(group, priority)
+        with stats_lock:
+            connection_stats["requests"] += 1
+
+        response = (signed_session if signed else session).request(method, UPBIT_API_URL + path, params=params,
+                                                                   json=json, headers=request_headers, timeout=timeout)
+        rate_limiter.update(group, response, (method, path))
+        if response.status_code != 429:
+            break
+        if signed and not header_factory:
+            break  # ✅ 고정 서명 헤더는 nonce 재사용 불가 → 429 응답 그대로 반환
+        print(f"⚠️ 요청 한도 초과 (429): {path} → 재시도 대기")
+
+    return response
+
+
+def upbit_get(path, params=None, headers=None, timeout=None, priority=None):
+    return upbit_request("GET", path, params=params, headers=headers, timeout=timeout, priority=priority)
+
+
+def upbit_post(path, json=None, headers=None, timeout=None, priority=None):
+    return upbit_request("POST", path, json=json, headers=headers, timeout=timeout, priority=priority)
+
+
+def get_connection_stats():
+    """ ✅ 요청 수 / 새 연결 수 / 재사용 연결 수 집계 """
+    with stats_lock:
+        requests_count = connection_stats["requests"]
+        new_connections = connection_stats["new_connections"]
+    return {
+        "requests": requests_count,
+        "new_connections": new_connections,
+        "reused_connections": max(requests_count - new_connections, 0),
+    }
@@ -2,7 +2,8 @@
 from django.urls import path
 from .views import (main_view, start_auto_trading,
                     stop_auto_trading, fetch_account_data, fetch_coin_data, check_auto_trading,
-                    fetch_trade_logs , get_market_volume , recentTradeLog ,recentProfitLog , startVolumeCheck)
+                    fetch_trade_logs , get_market_volume , recentTradeLog ,recentProfitLog , startVolumeCheck,
+                    connection_stats, engine_stats)
 
 urlpatterns = [
     path('', main_view, name='main-page'),
@@ -16,4 +17,6 @@ urlpatterns = [
     path('api/getRecntTradeLog/', recentTradeLog, name='recentTradeLog'),
     path('api/recentProfitLog/', recentProfitLog, name='recentProfitLog'),
     path('api/startVolumeCheck/', startVolumeCheck, name='startVolumeCheck'),
+    path('api/connection_stats/', connection_stats, name='connection_stats'),
+    path('api/engine_stats/', engine_stats, name='engine_stats'),
     ]
\ No newline at end of file
@@ -8,7 +8,14 @@ import uuid
 from urllib.parse import urlencode, unquote
 from django.conf import settings
 from .models import FailedMarket,MarketVolumeRecord,AskRecrod
+from .streamTrade.ticker_stream import TickerStream, UPBIT_WS_URL
+from .streamTrade.order_stream import OrderStream, UPBIT_PRIVATE_WS_URL
+from .upbit_client import upbit_get, upbit_post
+from .rate_limiter import PRIORITY_ORDER
+from .candle_buffer import CandleStore
 import pandas as pd
+import threading
+import time
 
 
 market_volume_cur = None # 현재 장상황
@@ -16,6 +23,30 @@ getRecntTradeLogCur = None #최근 거래내역
 failed_markets = set(FailedMarket.objects.values_list('market', flat=True))
 krw_balance = None
 
+# ✅ 시장 스냅샷 캐시 (한 틱 동안 전체 시세를 한 번만 조회)
+MARKET_SNAPSHOT_TTL = getattr(settings, "MARKET_SNAPSHOT_TTL", 1.0)  # 초 단위 유효 시간
+market_snapshot_cache = {"data": None, "timestamp": 0}
+market_snapshot_lock = threading.Lock()
+
+# ✅ 원화 마켓 목록 캐시 (상장 목록은 주 1회 수준으로만 변경됨)
+MARKET_LIST_REFRESH_INTERVAL = getattr(settings, "MARKET_LIST_REFRESH_INTERVAL", 3600)  # 초 단위 갱신 주기
+krw_market_cache = {"markets": [], "query": "", "timestamp": 0}
+krw_market_lock = threading.Lock()
+
+# ✅ 웹소켓 실시간 시세 스트림 (USE_TICKER_STREAM 설정 시에만 사용)
+USE_TICKER_STREAM = getattr(settings, "USE_TICKER_STREAM", False)
+TICKER_STREAM_MAX_AGE = getattr(settings, "TICKER_STREAM_MAX_AGE", 5)  # 이 시간 이상 수신이 없으면 REST 로 대체
+ticker_stream = None
+price_listeners = []  # ✅ 시세 변경 알림을 받을 함수 목록 (인자: market)
+
+# ✅ 주문 상태 일괄 조회 캐시 (틱 단위)
+ORDER_STATE_TTL = getattr(settings, "ORDER_STATE_TTL", 1.0)
+order_state_cache = {"data": {}, "requested": set(), "timestamp": 0}
+
+# ✅ 개인 웹소켓 주문/잔고 스트림 (USE_ORDER_STREAM 설정 시에만 사용)
+USE_ORDER_STREAM = getattr(settings, "USE_ORDER_STREAM", False)
+order_stream = None
+
 def get_account_info():
     """ ✅ 업비트 전체 계좌 조회 API 호출 """
     access_key = settings.UPBIT_ACCESS_KEY
@@ -29,51 +60,137 @@ def get_account_info():
     jwt_token = jwt.encode(payload, secret_key, algorithm='HS256')
     headers = {"Authorization": f"Bearer {jwt_token}"}
 
-    url = "https://api.upbit.com/v1/accounts"
-    response = requests.get(url, headers=headers)
+    response = upbit_get("/v1/accounts", headers=headers)
     arrJson = response.json()
     global krw_balance
     krw_balance = arrJson[0]["balance"]
 
     return arrJson if response.status_code == 200 else {"error": arrJson}
 
-UPBIT_CANDLE_URL = "https://api.upbit.com/v1/candles/seconds"
+UPBIT_CANDLE_PATH = "/v1/candles/seconds"
+
+def fetch_candles(market, count):
+    """ ✅ 업비트 캔들 원본 응답 조회 (최신 캔들 먼저, 실패 시 None) """
+    try:
+        response = upbit_get(UPBIT_CANDLE_PATH, params={"market": market, "count": count})
+        response.raise_for_status()  # 요청 오류가 있으면 예외 발생
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ {market} 캔들 데이터 요청 실패: {e}")
+        return None
+
+# ✅ 종목별 1초봉 링 버퍼 (마지막 캔들 이후 것만 요청)
+candle_store = CandleStore(fetch_candles, unit_seconds=1, capacity=getattr(settings, "CANDLE_BUFFER_SIZE", 200))
+
+def get_candle_arrays(market, count=30):
+    """
+    ✅ 최근 캔들 컬럼을 복사 없이 조회 (지표 계산용)
+    :return: {"open", "high", "low", "close", "volume"} → NumPy view (오래된 캔들 → 최신 캔들)
+    """
+    return candle_store.get(market, count)
 
 def get_candle_data(market, count=30):
     """
-    ✅ 업비트 API에서 특정 종목의 1분봉 데이터를 가져오는 함수
+    ✅ 특정 종목의 1초봉 데이터 조회 (캔들 링 버퍼 사용, 새 캔들만 요청)
     :param market: 조회할 코인의 종목 코드 (예: "KRW-BTC")
     :param count: 가져올 캔들 개수 (기본값: 30)
-    :return: DataFrame (고가, 저가, 종가 데이터 포함)
+    :return: DataFrame (고가, 저가, 종가 데이터 포함, 오래된 캔들 → 최신 캔들), 실패 시 None
+             버퍼 view 가 아닌 복사본 (다음 갱신에 값이 바뀌지 않음, 최대 capacity 행)
     """
-    try:
-        response = requests.get(UPBIT_CANDLE_URL, params={"market": market, "count": count})
-        response.raise_for_status()  # 요청 오류가 있으면 예외 발생
-        data = response.json()  # JSON 응답을 파이썬 리스트로 변환
-
-        # DataFrame 변환 및 필요한 컬럼 추출
-        df = pd.DataFrame(data)
-        df = df[["trade_price", "high_price", "low_price"]]  # 종가, 고가, 저가 추출
-        df.columns = ["close", "high", "low"]  # 컬럼명 변경 (지표 계산 함수와 일치시키기)
-        df = df.iloc[::-1]  # 최신 데이터가 위쪽에 있으므로 역순 정렬
-
-        return df
+    if candle_store.update(market) is None and candle_store.buffer(market).last_timestamp is None:
+        return None
+    columns = candle_store.buffer(market).columns(count)
+    return pd.DataFrame({"close": columns["close"], "high": columns["high"], "low": columns["low"]}, copy=True)
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ {market} 캔들 데이터 요청 실패: {e}")
+def load_krw_markets(force=False):
+    """
+    ✅ 원화(KRW) 마켓 목록 캐시 로드 (상장 목록은 자주 바뀌지 않으므로 캐시 사용)
+    :param force: True 이면 캐시를 무시하고 다시 조회
+    :return: KRW 마켓 코드 리스트 (조회 실패 시 기존 캐시 유지)
+    """
+    with krw_market_lock:
+        if krw_market_cache["markets"] and not force:
+            return krw_market_cache["markets"]
+
+        try:
+            markets_response = upbit_get("/v1/market/all")
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ 마켓 목록 조회 실패: {e}")
+            return krw_market_cache["markets"]
+
+        if markets_response.status_code != 200:
+            print(f"⚠️ 마켓 목록 조회 실패 (HTTP {markets_response.status_code})")
+            return krw_market_cache["markets"]
+
+        krw_markets = [m["market"] for m in markets_response.json() if m["market"].startswith("KRW-")]
+        krw_market_cache["markets"] = krw_markets
+        krw_market_cache["query"] = ",".join(krw_markets)  # ✅ 시세 조회용 쿼리 문자열 미리 생성
+        krw_market_cache["timestamp"] = time.time()
+        return krw_markets
+
+def start_market_list_refresh(interval=None):
+    """ ✅ 서버 시작 시 마켓 목록을 불러오고 주기적으로 갱신 (백그라운드 스레드에서 실행) """
+    if interval is None:
+        interval = MARKET_LIST_REFRESH_INTERVAL
+    load_krw_markets(force=True)
+    while True:
+        time.sleep(interval)
+        markets = load_krw_markets(force=True)
+        if ticker_stream is not None and markets:
+            ticker_stream.resubscribe(markets)  # ✅ 신규 상장/상장 폐지 반영
+
+def add_price_listener(listener):
+    """ ✅ 시세 변경 알림 등록 (웹소켓 수신 또는 REST 스냅샷 갱신 시 호출) """
+    if listener not in price_listeners:
+        price_listeners.append(listener)
+
+def remove_price_listener(listener):
+    if listener in price_listeners:
+        price_listeners.remove(listener)
+
+def notify_price_update(market):
+    for listener in list(price_listeners):
+        listener(market)
+
+def get_live_price(market):
+    """ ✅ 네트워크 요청 없이 가장 최신 현재가 조회 (웹소켓 → 최근 스냅샷 순) """
+    if ticker_stream is not None and ticker_stream.is_fresh(TICKER_STREAM_MAX_AGE):
+        price = ticker_stream.store.get(market)
+        if price is not None:
+            return price
+    coin_data = market_snapshot_cache["data"] or []
+    return next((coin["trade_price"] for coin in coin_data if coin["market"] == market), None)
+
+def start_ticker_stream(on_update=None):
+    """ ✅ 원화 마켓 전체에 대한 웹소켓 ticker 스트림 시작 (이미 실행 중이면 기존 스트림 반환) """
+    global ticker_stream
+    if ticker_stream is not None:
+        return ticker_stream
+
+    markets = load_krw_markets()
+    if not markets:
+        print("⚠️ 마켓 목록이 없어 ticker 스트림을 시작하지 못했습니다.")
         return None
 
+    ticker_stream = TickerStream(markets, url=getattr(settings, "UPBIT_WS_URL", UPBIT_WS_URL),
+                                 on_update=on_update or notify_price_update)
+    ticker_stream.start()
+    return ticker_stream
+
 def get_krw_market_coin_info():
-    """ ✅ 원화(KRW) 시장의 모든 코인 정보 조회 """
-    markets_url = "https://api.upbit.com/v1/market/all"
-    ticker_url = "https://api.upbit.com/v1/ticker"
+    """ ✅ 원화(KRW) 시장의 모든 코인 정보 조회 (마켓 목록은 캐시 사용) """
+    if not krw_market_cache["query"]:
+        load_krw_markets()
+    if not krw_market_cache["query"]:
+        return {"error": "KRW 마켓 목록을 불러오지 못했습니다."}
 
-    markets_response = requests.get(markets_url)
-    if markets_response.status_code != 200:
-        return {"error": markets_response.json()}
+    ticker_response = upbit_get("/v1/ticker", params={"markets": krw_market_cache["query"]})
 
-    krw_markets = [m["market"] for m in markets_response.json() if m["market"].startswith("KRW-")]
-    ticker_response = requests.get(ticker_url, params={"markets": ",".join(krw_markets)})
+    # ✅ 상장 폐지 등으로 알 수 없는 마켓이 포함된 경우 목록을 갱신 후 한 번 재시도
+    if ticker_response.status_code == 404:
+        print("⚠️ 알 수 없는 마켓 포함 → 마켓 목록 갱신 후 재시도")
+        load_krw_markets(force=True)
+        ticker_response = upbit_get("/v1/ticker", params={"markets": krw_market_cache["query"]})
 
     if ticker_response.status_code != 200:
         return {"error": ticker_response.json()}
@@ -91,6 +208,67 @@ def get_krw_market_coin_info():
         } for ticker in ticker_response.json()
     ], key=lambda x: x["acc_trade_price_24h"], reverse=True)
 
+def start_order_stream(on_order=None, on_asset=None):
+    """ ✅ myOrder/myAsset 스트림 시작 (이미 실행 중이면 콜백만 교체) """
+    global order_stream
+
+    def handle_asset(balances):
+        global krw_balance
+        if "KRW" in balances:
+            krw_balance = balances["KRW"]["balance"]  # ✅ 주문 금액 검증용 KRW 잔고 즉시 갱신
+        if on_asset:
+            on_asset(balances)
+
+    if order_stream is not None:
+        order_stream.on_order = on_order
+        order_stream.on_asset = handle_asset
+        return order_stream
+
+    order_stream = OrderStream(
+        get_upbit_token,
+        url=getattr(settings, "UPBIT_PRIVATE_WS_URL", UPBIT_PRIVATE_WS_URL),
+        on_order=on_order,
+        on_asset=handle_asset,
+    )
+    order_stream.start()
+    return order_stream
+
+def get_market_snapshot(max_age=None, notify=True):
+    """
+    ✅ 원화 시장 전체 시세 스냅샷 조회 (TTL 동안 캐시된 데이터를 공유)
+    :param max_age: 허용할 최대 캐시 나이(초), None 이면 MARKET_SNAPSHOT_TTL 사용
+    :param notify: False 이면 가격이 바뀐 종목을 price_listeners 에 알리지 않음 (호출한 쪽에서 전체 종목을 직접 점검할 때)
+    :return: get_krw_market_coin_info() 와 같은 형식의 리스트 (실패 시 {"error": ...})
+    """
+    if max_age is None:
+        max_age = MARKET_SNAPSHOT_TTL
+
+    # ✅ 스트리밍 모드: 메모리 테이블에서 바로 조회 (네트워크 I/O 없음)
+    if ticker_stream is not None and ticker_stream.is_fresh(TICKER_STREAM_MAX_AGE):
+        coin_data = ticker_stream.store.snapshot()
+        if coin_data:
+            return coin_data
+
+    with market_snapshot_lock:
+        now = time.time()
+        cached = market_snapshot_cache["data"]
+        if cached is not None and now - market_snapshot_cache["timestamp"] <= max_age:
+            return cached
+
+        previous = market_snapshot_cache["data"]
+        coin_data = get_krw_market_coin_info()
+        if isinstance(coin_data, list):  # ✅ 오류 응답은 캐시하지 않음
+            market_snapshot_cache["data"] = coin_data
+            market_snapshot_cache["timestamp"] = time.time()
+
+    # ✅ REST 폴링으로 가격이 바뀐 종목 알림 (이벤트 모드 자동매매용)
+    if notify and price_listeners and isinstance(coin_data, list):
+        previous_prices = {coin["market"]: coin["trade_price"] for coin in previous or []}
+        for coin in coin_data:
+            if previous_prices.get(coin["market"]) != coin["trade_price"]:
+                notify_price_update(coin["market"])
+    return coin_data
+
 def upbit_order(market, side, volume=None, price=None, ord_type="limit", time_in_force=None):
     """ ✅ 업비트 주문 요청 (실패 시 재시도 방지 및 실패 시장 추적) """
 
@@ -119,10 +297,6 @@ def upbit_order(market, side, volume=None, price=None, ord_type="limit", time_in
 
 
 
-    access_key = settings.UPBIT_ACCESS_KEY
-    secret_key = settings.UPBIT_SECRET_KEY
-    server_url = "https://api.upbit.com"
-
     params = {
         'market': market,
         'side': side,
@@ -139,23 +313,11 @@ def upbit_order(market, side, volume=None, price=None, ord_type="limit", time_in
     if time_in_force:
         params['time_in_force'] = time_in_force
 
-    query_string = unquote(urlencode(params, doseq=True)).encode("utf-8")
-    m = hashlib.sha512()
-    m.update(query_string)
-    query_hash = m.hexdigest()
-
-    payload = {
-        'access_key': access_key,
-        'nonce': str(uuid.uuid4()),
-        'query_hash': query_hash,
-        'query_hash_alg': 'SHA512',
-    }
-
-    jwt_token = jwt.encode(payload, secret_key, algorithm='HS256')
-    authorization = f'Bearer {jwt_token}'
-    headers = {'Authorization': authorization}
-
-    response = requests.post(f"{server_url}/v1/orders", json=params, headers=headers)
+    # ✅ 429 재시도 때마다 새 nonce 로 서명하도록 헤더 생성 함수 전달
+    response = upbit_post("/v1/orders", json=params, headers=lambda: get_auth_headers(params), priority=PRIORITY_ORDER)
+    if response.status_code == 429:
+        print(f"⚠️ 주문 요청 한도 초과 (429): {market} → 실패 시장으로 기록하지 않음")
+        return {"error": response.json()}
     if response.status_code != 201:
         print(f"⚠️ 주문 요청 실패: {response.json()}")
         FailedMarket.objects.get_or_create(market=market)  # DB에 실패 시장 추가
@@ -188,7 +350,6 @@ def check_order_filled(order_uuid):
     """ ✅ 주문이 체결되었는지 확인 """
     access_key = settings.UPBIT_ACCESS_KEY
     secret_key = settings.UPBIT_SECRET_KEY
-    server_url = "https://api.upbit.com"
 
     params = {"uuid": order_uuid}
     query_string = unquote(urlencode(params, doseq=True)).encode("utf-8")
@@ -207,8 +368,7 @@ def check_order_filled(order_uuid):
     jwt_token = jwt.encode(payload, secret_key, algorithm='HS256')
     headers = {"Authorization": f"Bearer {jwt_token}"}
 
-    url = f"{server_url}/v1/order"
-    response = requests.get(url, headers=headers, params=params)
+    response = upbit_get("/v1/order", headers=headers, params=params, priority=PRIORITY_ORDER)
 
     if response.status_code != 200:
         print(f"⚠️ 주문 체결 확인 실패: {response.json()}")
@@ -217,15 +377,86 @@ def check_order_filled(order_uuid):
     order_data = response.json()
     return order_data.get("state") == "done"  # ✅ 체결 완료 상태인지 확인
 
+def get_auth_headers(params=None):
+    """ ✅ 업비트 인증 헤더 생성 (파라미터가 있으면 query_hash 포함) """
+    payload = {
+        'access_key': settings.UPBIT_ACCESS_KEY,
+        'nonce': str(uuid.uuid4()),
+    }
+    if params:
+        query_string = unquote(urlencode(params, doseq=True)).encode("utf-8")
+        payload['query_hash'] = hashlib.sha512(query_string).hexdigest()
+        payload['query_hash_alg'] = 'SHA512'
+
+    jwt_token = jwt.encode(payload, settings.UPBIT_SECRET_KEY, algorithm='HS256')
+    return {"Authorization": f"Bearer {jwt_token}"}
+
+def get_order_states(order_uuids, max_age=None):
+    """
+    ✅ 여러 주문의 상태를 한 번의 요청으로 조회 (/v1/orders/uuids, 최대 100개씩)
+    :param order_uuids: 조회할 주문 UUID 목록
+    :param max_age: 허용할 최대 캐시 나이(초), None 이면 ORDER_STATE_TTL 사용
+    :return: {uuid: {"state", "side", "executed_volume", "remaining_volume"}} (조회 실패한 주문은 제외)
+    """
+    if max_age is None:
+        max_age = ORDER_STATE_TTL
+
+    uuids = [u for u in dict.fromkeys(order_uuids) if u]
+    if not uuids:
+        return {}
+
+    # ✅ 개인 웹소켓 연결 중이면 수신한 상태 사용 (수신 이력이 없는 주문만 REST 조회)
+    streamed = {}
+    if order_stream is not None and order_stream.is_connected:
+        streamed = order_stream.get_order_states(uuids)
+        uuids = [u for u in uuids if u not in streamed]
+        if not uuids:
+            return streamed
+
+    # ✅ 같은 틱 안에서는 캐시된 결과 재사용
+    if time.time() - order_state_cache["timestamp"] <= max_age and set(uuids) <= order_state_cache["requested"]:
+        streamed.update({u: order_state_cache["data"][u] for u in uuids if u in order_state_cache["data"]})
+        return streamed
+
+    order_states = {}
+    requested = set()  # ✅ 조회에 성공한 묶음의 주문만 기록 (실패한 묶음은 다음 호출에서 다시 조회)
+    for start in range(0, len(uuids), 100):
+        batch = uuids[start:start + 100]
+        params = {"uuids[]": batch}
+        response = upbit_get("/v1/orders/uuids", params=params, headers=lambda: get_auth_headers(params),
+                             priority=PRIORITY_ORDER)
+
+        if response.status_code != 200:
+            print(f"⚠️ 주문 상태 일괄 조회 실패: {response.json()}")
+            continue
+
+        requested.update(batch)
+
+        for order in response.json():
+            order_states[order["uuid"]] = {
+                "state": order.get("state"),
+                "side": order.get("side"),
+                "executed_volume": float(order.get("executed_volume") or 0),
+                "remaining_volume": float(order.get("remaining_volume") or 0),
+            }
+
+    order_state_cache["data"] = order_states
+    order_state_cache["requested"] = requested
+    order_state_cache["timestamp"] = time.time()
+    if order_stream is not None:
+        order_stream.seed_orders(order_states)
+
+    streamed.update(order_states)
+    return streamed
+
 
 
 def get_orderbook(markets):
     """ ✅ 여러 코인의 호가 데이터를 한 번에 가져옴 (429 방지) """
-    url = "https://api.upbit.com/v1/orderbook"
     params = {"markets": ",".join(markets)}
 
     try:
-        response = requests.get(url, params=params, timeout=5)
+        response = upbit_get("/v1/orderbook", params=params)
         if response.status_code != 200:
             print(f"⚠️ 호가 데이터 요청 실패 (HTTP {response.status_code})")
             return {}
@@ -251,8 +482,7 @@ def get_open_orders():
     jwt_token = jwt.encode(payload, secret_key, algorithm='HS256')
     headers = {"Authorization": f"Bearer {jwt_token}"}
 
-    url = "https://api.upbit.com/v1/orders?state=open"
-    response = requests.get(url, headers=headers)
+    response = upbit_get("/v1/orders?state=open", headers=headers)
 
     if response.status_code == 200:
         return response.json()  # ✅ 미체결 주문 리스트 반환
@@ -260,9 +490,12 @@ def get_open_orders():
         print(f"⚠️ 미체결 주문 조회 실패: {response.status_code}, {response.json()}")
         return []
 
-def get_market_trend():
+def get_market_trend(coin_data=None):
     """ ✅ BTC & ETH 변동성을 기반으로 시장 강도를 분석 """
-    coin_data = get_krw_market_coin_info()
+    if coin_data is None:
+        coin_data = get_market_snapshot()
+    if not isinstance(coin_data, list):
+        return "neutral"  # API 오류 시 보합장으로 처리
 
     btc = next((coin for coin in coin_data if coin["market"] == "KRW-BTC"), None)
     eth = next((coin for coin in coin_data if coin["market"] == "KRW-ETH"), None)
@@ -281,9 +514,12 @@ def get_market_trend():
     else:
         return "neutral"  # 그 외에는 보합장
 
-def get_market_trend_by_volume():
+def get_market_trend_by_volume(coin_data=None):
     """ ✅ 전체 시장 거래량 변화를 기반으로 시장 강도를 분석 """
-    coin_data = get_krw_market_coin_info()
+    if coin_data is None:
+        coin_data = get_market_snapshot()
+    if not isinstance(coin_data, list):
+        return "neutral"
     total_volume = sum(coin["acc_trade_price_24h"] for coin in coin_data)  # 현재 거래량
     previous_volume = get_previous_market_volume()  # 🔹 과거 거래량 (DB에서 가져옴)
 
@@ -300,9 +536,12 @@ def get_market_trend_by_volume():
         return "neutral"  # 변동성이 낮으면 보합장
 
 
-def get_market_trend_by_ratio():
+def get_market_trend_by_ratio(coin_data=None):
     """ ✅ 상승/하락 코인 비율을 활용한 시장 강도 분석 """
-    coin_data = get_krw_market_coin_info()
+    if coin_data is None:
+        coin_data = get_market_snapshot()
+    if not isinstance(coin_data, list) or not coin_data:
+        return "neutral"
 
     rising_coins = sum(1 for coin in coin_data if coin["signed_change_rate"] > 0)
     falling_coins = sum(1 for coin in coin_data if coin["signed_change_rate"] < 0)
@@ -318,12 +557,14 @@ def get_market_trend_by_ratio():
     else:
         return "neutral"  # 상승/하락 균형이면 보합장
 
-def get_combined_market_trend():
-    """ ✅ 여러 지표를 결합하여 시장 강도 분석 """
+def get_combined_market_trend(coin_data=None):
+    """ ✅ 여러 지표를 결합하여 시장 강도 분석 (하나의 시장 스냅샷을 공유) """
     global market_volume_cur
-    trend_by_btc_eth = get_market_trend()  # BTC/ETH 변동률 기준
-    trend_by_volume = get_market_trend_by_volume()  # 전체 거래량 변화 기준
-    trend_by_ratio = get_market_trend_by_ratio()  # 상승/하락 비율 기준
+    if coin_data is None:
+        coin_data = get_market_snapshot()
+    trend_by_btc_eth = get_market_trend(coin_data)  # BTC/ETH 변동률 기준
+    trend_by_volume = get_market_trend_by_volume(coin_data)  # 전체 거래량 변화 기준
+    trend_by_ratio = get_market_trend_by_ratio(coin_data)  # 상승/하락 비율 기준
 
     trends = [trend_by_btc_eth, trend_by_volume, trend_by_ratio]
 
@@ -344,7 +585,10 @@ def get_previous_market_volume():
 
 def record_market_volume():
     """ ✅ 현재 시장의 전체 거래량을 DB에 저장 """
-    coin_data = get_krw_market_coin_info()
+    coin_data = get_market_snapshot()
+    if not isinstance(coin_data, list):
+        print(f"⚠️ 시장 거래량 기록 실패: {coin_data}")
+        return
     total_volume = sum(coin["acc_trade_price_24h"] for coin in coin_data)  # 전체 거래량 계산
 
     # ✅ 새 거래량 데이터 저장
@@ -2,6 +2,8 @@
 from django.shortcuts import render
 from django.http import JsonResponse
 from .utils import get_account_info , get_market_volume_cur
+from .upbit_client import get_connection_stats
+from .rate_limiter import rate_limiter, request_priority, PRIORITY_DASHBOARD
 from .auto_trade import AutoTrader, trade_logs, get_best_trade_coin , getRecntTradeLog , listProfit
 import threading
 import time
@@ -16,20 +18,25 @@ trader = None  # ✅ 자동매매 객체
 
 def main_view(request):
     """ ✅ 메인 페이지 """
-    _, top_coins = get_best_trade_coin()  # ✅ UI에 표시할 상위 5개 코인 가져오기
+    with request_priority(PRIORITY_DASHBOARD):  # ✅ 대시보드 요청은 주문/자동매매보다 나중에 처리
+        _, top_coins = get_best_trade_coin()  # ✅ UI에 표시할 상위 5개 코인 가져오기
+        account_info = get_account_info()
 
     return render(request, "main.html", {
-        "account_info": get_account_info(),
+        "account_info": account_info,
         "top_coins": top_coins
     })
 
 def fetch_account_data(request):
     """ ✅ AJAX 요청을 받아 전체 계좌 정보를 반환 """
-    return JsonResponse({"account_info": get_account_info()})
+    with request_priority(PRIORITY_DASHBOARD):
+        account_info = get_account_info()
+    return JsonResponse({"account_info": account_info})
 
 def fetch_coin_data(request):
     """ ✅ AJAX 요청을 받아 상위 5개 코인 정보를 반환 """
-    _, top_coins = get_best_trade_coin()
+    with request_priority(PRIORITY_DASHBOARD):
+        _, top_coins = get_best_trade_coin()
 
     return JsonResponse({"top_coins": top_coins})
 
@@ -82,4 +89,12 @@ def recentTradeLog(request):  # ✅ 함수 호출해서 데이터를 가져오
 def recentProfitLog(request) :
     return JsonResponse({"listProfit": listProfit})
 
+def engine_stats(request):
+    """ ✅ 자동매매 루프 통계 (틱 초과/지연, 이벤트 반응 시간) 반환 """
+    return JsonResponse({"engine_stats": trader.get_engine_stats() if trader else {}})
+
+def connection_stats(request):
+    """ ✅ 업비트 API 연결 재사용 통계 및 그룹별 요청 한도 현황 반환 """
+    return JsonResponse({"connection_stats": get_connection_stats(), "rate_limits": rate_limiter.get_stats()})
+
 